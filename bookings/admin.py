@@ -1,12 +1,13 @@
 from django import forms
 from django.contrib import admin
-from django.http import HttpResponse
 from django.utils import timezone
 from django.core.exceptions import ValidationError
-import csv
 
 from bookings.models.booking_model import Booking
-from middleware.admin_administration_helpers import check_role_permission
+from bookings.services.booking_export import streaming_export_response
+from bookings.services.bulk_status import APPLIED, REJECTED, SKIPPED, bulk_transition, summarize
+from eventslotbooking_project.admin_filters import related_list_filter
+from middleware.admin_administration_helpers import check_request_permission
 
 
 # ==========================
@@ -49,8 +50,8 @@ class BookingAdmin(admin.ModelAdmin):
 
     list_filter = [
         'booking_status',
-        'event',
-        'slot',
+        ('event', related_list_filter('venue')),
+        ('slot', related_list_filter('event')),
         'user',
         ('slot__start_time', admin.DateFieldListFilter),
         'created_at',
@@ -59,6 +60,10 @@ class BookingAdmin(admin.ModelAdmin):
 
     ordering = ['-created_at']
     list_per_page = 10
+    # user/event/slot columns and their __str__ (Event -> Venue, Slot -> Event)
+    list_select_related = ['user', 'event__venue', 'slot__event']
+    # Skip the second, unfiltered COUNT(*) of the whole table
+    show_full_result_count = False
 
     readonly_fields = ['created_at', 'updated_at', 'deleted_at']
 
@@ -94,27 +99,27 @@ class BookingAdmin(admin.ModelAdmin):
 
     # Permissions
     def has_module_permission(self, request):
-        return check_role_permission(request.user, 'Bookings', 'read')
+        return check_request_permission(request, 'Bookings', 'read')
 
     def has_view_permission(self, request, obj=None):
-        return check_role_permission(request.user, 'Bookings', 'read')
+        return check_request_permission(request, 'Bookings', 'read')
 
     def has_add_permission(self, request):
-        return check_role_permission(request.user, 'Bookings', 'create')
+        return check_request_permission(request, 'Bookings', 'create')
 
     def has_change_permission(self, request, obj=None):
-        return check_role_permission(request.user, 'Bookings', 'update')
+        return check_request_permission(request, 'Bookings', 'update')
 
     def has_delete_permission(self, request, obj=None):
-        return check_role_permission(request.user, 'Bookings', 'delete')
+        return check_request_permission(request, 'Bookings', 'delete')
 
     def get_model_perms(self, request):
         module = 'Bookings'
         return {
-            'add': check_role_permission(request.user, module, 'create'),
-            'change': check_role_permission(request.user, module, 'update'),
-            'delete': check_role_permission(request.user, module, 'delete'),
-            'view': check_role_permission(request.user, module, 'read'),
+            'add': check_request_permission(request, module, 'create'),
+            'change': check_request_permission(request, module, 'update'),
+            'delete': check_request_permission(request, module, 'delete'),
+            'view': check_request_permission(request, module, 'read'),
         }
 
     # Queryset
@@ -144,74 +149,67 @@ class BookingAdmin(admin.ModelAdmin):
 
     # Soft delete
     def soft_delete_bookings(self, request, queryset):
-        if not check_role_permission(request.user, 'Bookings', 'delete'):
+        if not check_request_permission(request, 'Bookings', 'delete'):
             self.message_user(request, "❌ You do not have permission to delete bookings.", level='error')
             return
 
-        updated = queryset.update(deleted_at=timezone.now())
+        updated = queryset.update_with_counters(deleted_at=timezone.now())
         self.message_user(request, f"🗑️ {updated} booking(s) soft deleted.")
 
     soft_delete_bookings.short_description = "🗑️ Soft delete selected bookings"
 
     # Restore
     def restore_bookings(self, request, queryset):
-        if not check_role_permission(request.user, 'Bookings', 'update'):
+        if not check_request_permission(request, 'Bookings', 'update'):
             self.message_user(request, "❌ You do not have permission to update bookings.", level='error')
             return
 
-        updated = queryset.update(deleted_at=None)
+        try:
+            updated = queryset.update_with_counters(deleted_at=None)
+        except ValidationError as e:
+            self.message_user(request, f"❌ {e}", level='error')
+            return
         self.message_user(request, f"♻️ {updated} booking(s) restored.")
 
     restore_bookings.short_description = "♻️ Restore selected bookings"
 
     # Approve
     def approve_selected_bookings(self, request, queryset):
-        if not check_role_permission(request.user, 'Bookings', 'update'):
+        if not check_request_permission(request, 'Bookings', 'update'):
             self.message_user(request, "❌ You do not have permission to approve bookings.", level='error')
             return
 
-        for booking in queryset:
-            try:
-                booking.approve()
-            except ValidationError as e:
-                self.message_user(request, f"❌ Booking {booking.id}: {e}", level='error')
-
-        self.message_user(request, "✅ Selected bookings approved.")
+        outcomes = bulk_transition(queryset, Booking.Status.APPROVED)
+        self._report_bulk_outcomes(request, outcomes, "approved")
 
     approve_selected_bookings.short_description = "✅ Approve selected bookings"
 
     # Cancel
     def cancel_selected_bookings(self, request, queryset):
-        if not check_role_permission(request.user, 'Bookings', 'update'):
+        if not check_request_permission(request, 'Bookings', 'update'):
             self.message_user(request, "❌ You do not have permission to cancel bookings.", level='error')
             return
 
-        for booking in queryset:
-            if booking.booking_status != Booking.Status.CANCELLED:
-                booking.cancel()
-
-        self.message_user(request, "⚠️ Selected bookings cancelled.")
+        outcomes = bulk_transition(queryset, Booking.Status.CANCELLED)
+        self._report_bulk_outcomes(request, outcomes, "cancelled")
 
     cancel_selected_bookings.short_description = "⚠️ Cancel selected bookings"
 
-    # CSV Export
+    def _report_bulk_outcomes(self, request, outcomes, verb):
+        counts = summarize(outcomes)
+        self.message_user(
+            request,
+            f"✅ {counts.get(APPLIED, 0)} booking(s) {verb}, {counts.get(SKIPPED, 0)} skipped, "
+            f"{counts.get(REJECTED, 0)} rejected."
+        )
+        rejected = [(pk, reason) for pk, (outcome, reason) in sorted(outcomes.items()) if outcome == REJECTED]
+        for pk, reason in rejected[:20]:
+            self.message_user(request, f"❌ Booking {pk}: {reason}", level='error')
+        if len(rejected) > 20:
+            self.message_user(request, f"❌ ...and {len(rejected) - 20} more rejected.", level='error')
+
+    # CSV Export (streamed in keyset chunks, so memory stays flat)
     def export_attendees_csv(self, request, queryset):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename=\"bookings.csv\"'
-
-        writer = csv.writer(response)
-        writer.writerow(['Booking ID', 'User', 'Event', 'Slot Start', 'Status', 'Attendees'])
-
-        for booking in queryset.select_related('event', 'slot', 'user'):
-            writer.writerow([
-                booking.id,
-                booking.user.username,
-                booking.event.name,
-                booking.slot.start_time,
-                booking.booking_status,
-                booking.attendees_count
-            ])
-
-        return response
+        return streaming_export_response(queryset, 'csv')
 
     export_attendees_csv.short_description = "⬇️ Export attendees CSV"
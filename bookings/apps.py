@@ -5,4 +5,5 @@ class BookingsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "bookings"
     def ready(self):
-        import bookings.admin  # Ensure admin gets loaded
\ No newline at end of file
+        import bookings.admin  # Ensure admin gets loaded
+        import bookings.signals  # noqa: F401  Slot counter upkeep on hard deletes, response cache invalidation, waitlist promotion
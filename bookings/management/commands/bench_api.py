@@ -0,0 +1,449 @@
+import json
+import math
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLResolver, get_resolver, resolve
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from bookings.models.booking_model import Booking
+from bookings.models.waitlist_model import WaitlistEntry
+from bookings.services import waitlist
+from events.models.event_model import Event
+from slots.models.slot_model import Slot
+from users.models import RolePermission, User, UserRole
+from venues.models import Venue
+
+BENCH_MODULES = ['Venues', 'Events', 'Slots', 'Bookings']
+BENCH_PASSWORD = 'bench-Passw0rd!'
+# Fixture slots two hours apart on one venue (see Command._setup())
+FIXTURE_SLOTS = 30
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive every API endpoint through the Django test client against the current "
+        "database and report p50/p95/p99 latency, queries per request and response size. "
+        "Reads run uncached (--cached adds cached timings); writes commit against throwaway "
+        "fixtures that are removed afterwards. --save writes a JSON baseline; --compare "
+        "diffs a run against one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help="Timed requests per endpoint.")
+        parser.add_argument('--warmup', type=int, default=2, help="Untimed requests per endpoint.")
+        parser.add_argument('--only', action='append', help="Only run endpoints whose label contains this text.")
+        parser.add_argument(
+            '--cached',
+            action='store_true',
+            help="Also time every GET with the response cache on, reported as '<label> (cached)'.",
+        )
+        parser.add_argument('--save', metavar='PATH', help="Write the results to a JSON baseline.")
+        parser.add_argument('--compare', metavar='PATH', help="Diff the results against a saved baseline.")
+        parser.add_argument(
+            '--max-regression',
+            type=float,
+            metavar='PCT',
+            help="With --compare, exit non-zero if any p95 grew by more than PCT percent "
+                 "or any endpoint runs more queries than in the baseline.",
+        )
+
+    def handle(self, *args, **options):
+        rows = self._row_counts()
+        fixture = self._setup()
+        try:
+            context = self._context(fixture)
+            scenarios = self.scenarios(context)
+            if options['only']:
+                scenarios = [s for s in scenarios if any(text in s['label'] for text in options['only'])]
+            else:
+                self._check_coverage(scenarios)
+
+            results = {}
+            hosts = [*settings.ALLOWED_HOSTS, 'testserver']
+            # Reads are timed against the endpoints themselves, not cache hits
+            with override_settings(ALLOWED_HOSTS=hosts, RESPONSE_CACHE_ENABLED=False):
+                for scenario in scenarios:
+                    results[scenario['label']] = self._run(scenario, context, options['warmup'], options['repeat'])
+                    self._print_row(scenario['label'], results[scenario['label']])
+            if options['cached']:
+                with override_settings(ALLOWED_HOSTS=hosts, RESPONSE_CACHE_ENABLED=True):
+                    for scenario in scenarios:
+                        if scenario['method'] == 'GET':
+                            label = f"{scenario['label']} (cached)"
+                            results[label] = self._run(scenario, context, options['warmup'], options['repeat'])
+                            self._print_row(label, results[label])
+        finally:
+            self._teardown(fixture)
+
+        report = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'vendor': connection.vendor,
+                'repeat': options['repeat'],
+                'rows': rows,
+            },
+            'results': results,
+        }
+        if options['save']:
+            with open(options['save'], 'w') as handle:
+                json.dump(report, handle, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['save']}"))
+        if options['compare']:
+            with open(options['compare']) as handle:
+                baseline = json.load(handle)
+            regressions = self._compare(baseline, report, options['max_regression'])
+            if regressions:
+                raise CommandError(f"Regressions: {', '.join(regressions)}")
+
+    # ---------------- FIXTURES ----------------
+    def _setup(self):
+        """
+        Throwaway role, users, venue, event, slots and bookings for the
+        write scenarios, committed like real data (so on_commit work runs)
+        and removed by _teardown(). Real rows are only ever read.
+        """
+        tag = f'bench-{uuid.uuid4().hex[:8]}'
+        role = UserRole.objects.create(name=tag)
+        RolePermission.objects.bulk_create(
+            RolePermission(role=role, module_name=module, is_read=True, is_create=True, is_update=True,
+                           is_delete=True)
+            for module in BENCH_MODULES
+        )
+        staff = User.objects.create_user(username=f'{tag}-staff', email=f'{tag}-staff@example.com',
+                                         password=BENCH_PASSWORD, role=role, is_staff=True)
+        member = User.objects.create_user(username=f'{tag}-member', email=f'{tag}-member@example.com', role=role)
+        holder = User.objects.create_user(username=f'{tag}-holder', email=f'{tag}-holder@example.com', role=role)
+        fixture = {'tag': tag, 'role': role, 'users': [staff, member, holder], 'venue': None}
+
+        try:
+            today = timezone.localdate()
+            fixture['venue'] = venue = Venue.objects.create(
+                name=f'{tag} venue', address='1 Bench Road', city='Pune', state='MH', pincode='411001', capacity=100
+            )
+            event = Event.objects.create(name=f'{tag} event', venue=venue, start_date=today,
+                                         end_date=today + timedelta(days=30))
+            first = (timezone.now() + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+            # Two hours apart, so one user may book any of them. The first is
+            # full (waitlist), the member has pending bookings on the next
+            # five, the holder pending bookings from the eleventh on (bulk-status)
+            slots = [
+                Slot.objects.create(event=event, start_time=first + timedelta(hours=2 * i),
+                                    end_time=first + timedelta(hours=2 * i + 1), capacity=2 if i == 0 else 50)
+                for i in range(FIXTURE_SLOTS)
+            ]
+            Booking.objects.create(user=holder, event=event, slot=slots[0], attendees_count=2,
+                                   booking_status=Booking.Status.APPROVED)
+            member_bookings = [
+                Booking.objects.create(user=member, event=event, slot=slot, attendees_count=1) for slot in slots[1:6]
+            ]
+            pending = [
+                Booking.objects.create(user=holder, event=event, slot=slot, attendees_count=1) for slot in slots[10:]
+            ]
+        except Exception:
+            self._teardown(fixture)
+            raise
+        fixture.update({
+            'staff': staff, 'member': member, 'event': event, 'slots': slots,
+            'member_bookings': [booking.pk for booking in member_bookings],
+            'pending_ids': [booking.pk for booking in pending],
+        })
+        return fixture
+
+    def _teardown(self, fixture):
+        tag = fixture['tag']
+        if fixture['venue'] is not None:
+            # Bookings first, so their counter releases find the slots
+            Booking.objects.filter(slot__event__venue=fixture['venue']).delete()
+            Venue.objects.filter(Q(pk=fixture['venue'].pk) | Q(name=f'{tag} new')).delete()
+        User.objects.filter(username__startswith=f'{tag}-').delete()
+        fixture['role'].delete()
+
+    def _context(self, fixture):
+        """JWT per actor, the fixture ids the writes use and representative ids of the real data for the reads."""
+        slots = Slot.objects.filter(deleted_at__isnull=True, is_blocked=False).exclude(event=fixture['event'])
+        hot_slot = slots.order_by('-approved_attendees', 'pk').first()
+        if hot_slot is None:
+            raise CommandError("No slots to benchmark; run seed_perf_data first.")
+        venue = Venue.objects.filter(deleted_at__isnull=True).exclude(pk=fixture['venue'].pk).order_by('pk').first()
+        fixture_slots = [slot.pk for slot in fixture['slots']]
+        return {
+            'tag': fixture['tag'],
+            'tokens': {
+                'staff': str(RefreshToken.for_user(fixture['staff']).access_token),
+                'member': str(RefreshToken.for_user(fixture['member']).access_token),
+            },
+            'member': fixture['member'],
+            # Read scenarios
+            'venue': venue.pk,
+            'venue_name': venue.name,
+            'event': hot_slot.event_id,
+            'hot_slot': hot_slot.pk,
+            # Halfway through the staff booking_list, where OFFSET gets expensive
+            'deep_page': max(Booking.objects.filter(deleted_at__isnull=True).count() // 20, 1),
+            # Write scenarios (and the member's own bookings)
+            'fixture_venue': fixture['venue'].pk,
+            'fixture_event': fixture['event'].pk,
+            'fixture_slots': fixture_slots,
+            'full_slot': fixture_slots[0],
+            'open_slot': fixture_slots[6],
+            'batch_slots': fixture_slots[6:10],
+            'new_slot_start': fixture['slots'][-1].end_time + timedelta(minutes=15),
+            'member_bookings': fixture['member_bookings'],
+            'booking': fixture['member_bookings'][0],
+            'pending_ids': fixture['pending_ids'],
+        }
+
+    def scenarios(self, ctx):
+        """
+        One entry per endpoint and method (plus the common query variants).
+        Writes go to the fixtures and commit; 'setup' and 'undo' run
+        untimed before and after each request, so every run of a scenario
+        starts from the same state.
+        """
+        start = ctx['new_slot_start']
+        today = timezone.now().date()
+        staff, member = 'staff', 'member'
+        tag = ctx['tag']
+        venue, event, full_slot = ctx['fixture_venue'], ctx['fixture_event'], ctx['full_slot']
+
+        def restore(model, pk):
+            return lambda: model.objects.filter(pk=pk).update_and_sync(deleted_at=None)
+
+        def drop_new_slots():
+            Slot.objects.filter(event_id=event).exclude(pk__in=ctx['fixture_slots']).delete()
+
+        def drop_new_bookings():
+            Booking.objects.filter(user=ctx['member']).exclude(pk__in=ctx['member_bookings']).delete()
+
+        def reopen(*pks):
+            return lambda: Booking.objects.filter(pk__in=pks).update_with_counters(
+                booking_status=Booking.Status.PENDING
+            )
+
+        def clear_waitlist():
+            WaitlistEntry.objects.filter(slot_id=full_slot).delete()
+
+        def join_waitlist():
+            waitlist.join(ctx['member'], Slot.objects.get(pk=full_slot), 1)
+
+        return [
+            {'label': 'POST auth/login', 'method': 'POST', 'path': '/api/auth/login/', 'actor': None,
+             'body': {'username': f'{tag}-staff', 'password': BENCH_PASSWORD}},
+            {'label': 'POST auth/register', 'method': 'POST', 'path': '/api/auth/register/', 'actor': None,
+             'body': {'username': f'{tag}-register', 'first_name': 'Bench', 'last_name': 'Register',
+                      'email': f'{tag}-register@example.com', 'role': tag, 'password': BENCH_PASSWORD},
+             'undo': lambda: User.objects.filter(username=f'{tag}-register').delete()},
+
+            {'label': 'GET venues', 'method': 'GET', 'path': '/api/venues/', 'actor': member},
+            {'label': 'GET venues ?search', 'method': 'GET', 'path': f"/api/venues/?search={ctx['venue_name'][:8]}",
+             'actor': member},
+            {'label': 'POST venues', 'method': 'POST', 'path': '/api/venues/', 'actor': staff,
+             'body': {'name': f'{tag} new', 'address': '1 Bench Road', 'city': 'Pune', 'state': 'MH',
+                      'pincode': '411001', 'capacity': 100},
+             'undo': lambda: Venue.objects.filter(name=f'{tag} new').delete()},
+            {'label': 'GET venue', 'method': 'GET', 'path': f"/api/venues/{ctx['venue']}/", 'actor': member},
+            {'label': 'GET venue free-windows', 'method': 'GET',
+             'path': f"/api/venues/{ctx['venue']}/free-windows/?to={today + timedelta(days=6)}", 'actor': member},
+            {'label': 'PATCH venue', 'method': 'PATCH', 'path': f"/api/venues/{venue}/", 'actor': staff,
+             'body': {'city': 'Mumbai'}},
+            {'label': 'DELETE venue', 'method': 'DELETE', 'path': f"/api/venues/{venue}/", 'actor': staff,
+             'undo': restore(Venue, venue)},
+
+            {'label': 'GET events', 'method': 'GET', 'path': '/api/events/', 'actor': member},
+            {'label': 'POST events', 'method': 'POST', 'path': '/api/events/', 'actor': staff,
+             'body': {'name': f'{tag} new', 'venue': venue, 'start_date': str(today),
+                      'end_date': str(today + timedelta(days=30))},
+             'undo': lambda: Event.objects.filter(venue_id=venue).exclude(pk=event).delete()},
+            {'label': 'GET event', 'method': 'GET', 'path': f"/api/events/{ctx['event']}/", 'actor': member},
+            {'label': 'GET event availability', 'method': 'GET',
+             'path': f"/api/events/{ctx['event']}/availability/", 'actor': member},
+            {'label': 'GET event availability ?granularity=hour', 'method': 'GET',
+             'path': f"/api/events/{ctx['event']}/availability/?granularity=hour", 'actor': member},
+            {'label': 'POST event slots/generate dry_run', 'method': 'POST',
+             'path': f"/api/events/{event}/slots/generate/", 'actor': staff,
+             'body': {'weekdays': [0, 1, 2, 3, 4], 'day_start': '09:00', 'day_end': '17:00', 'slot_minutes': 30,
+                      'capacity': 10, 'dry_run': True}},
+            {'label': 'POST event slots/generate', 'method': 'POST',
+             'path': f"/api/events/{event}/slots/generate/", 'actor': staff,
+             'body': {'weekdays': [0, 1, 2, 3, 4], 'day_start': '09:00', 'day_end': '17:00', 'slot_minutes': 30,
+                      'capacity': 10, 'skip_conflicts': True},
+             'undo': drop_new_slots},
+            {'label': 'PATCH event', 'method': 'PATCH', 'path': f"/api/events/{event}/", 'actor': staff,
+             'body': {'description': 'Benchmarked'}},
+            {'label': 'DELETE event', 'method': 'DELETE', 'path': f"/api/events/{event}/", 'actor': staff,
+             'undo': restore(Event, event)},
+
+            {'label': 'GET slots', 'method': 'GET', 'path': '/api/slots/', 'actor': member},
+            {'label': 'GET slots ?page_size=100', 'method': 'GET', 'path': '/api/slots/?page_size=100', 'actor': member},
+            {'label': 'GET slots ?event', 'method': 'GET', 'path': f"/api/slots/?event={ctx['event']}", 'actor': member},
+            {'label': 'GET slots ?search', 'method': 'GET', 'path': f"/api/slots/?search={ctx['venue_name'][:8]}",
+             'actor': member},
+            {'label': 'GET slots ?cursor', 'method': 'GET', 'path': '/api/slots/?cursor=', 'actor': member},
+            {'label': 'POST slots', 'method': 'POST', 'path': '/api/slots/', 'actor': staff,
+             'body': {'event': event, 'start_time': start.isoformat(),
+                      'end_time': (start + timedelta(minutes=45)).isoformat(), 'capacity': 50},
+             'undo': drop_new_slots},
+            {'label': 'GET slot', 'method': 'GET', 'path': f"/api/slots/{ctx['hot_slot']}/", 'actor': member},
+            {'label': 'PATCH slot', 'method': 'PATCH', 'path': f"/api/slots/{full_slot}/", 'actor': staff,
+             'body': {'is_blocked': False}},
+            {'label': 'POST slot waitlist', 'method': 'POST', 'path': f"/api/slots/{full_slot}/waitlist/",
+             'actor': member, 'body': {'attendees_count': 1}, 'undo': clear_waitlist},
+            {'label': 'DELETE slot waitlist', 'method': 'DELETE', 'path': f"/api/slots/{full_slot}/waitlist/",
+             'actor': member, 'setup': join_waitlist, 'undo': clear_waitlist},
+            {'label': 'DELETE slot', 'method': 'DELETE', 'path': f"/api/slots/{full_slot}/", 'actor': staff,
+             'undo': restore(Slot, full_slot)},
+
+            {'label': 'GET bookings (member)', 'method': 'GET', 'path': '/api/bookings/', 'actor': member},
+            {'label': 'GET bookings (staff)', 'method': 'GET', 'path': '/api/bookings/', 'actor': staff},
+            {'label': 'GET bookings (staff) ?status', 'method': 'GET', 'path': '/api/bookings/?status=approved',
+             'actor': staff},
+            {'label': 'GET bookings (staff) deep page', 'method': 'GET',
+             'path': f"/api/bookings/?page={ctx['deep_page']}", 'actor': staff},
+            {'label': 'GET bookings (staff) ?cursor', 'method': 'GET', 'path': '/api/bookings/?cursor=',
+             'actor': staff},
+            {'label': 'POST bookings', 'method': 'POST', 'path': '/api/bookings/', 'actor': member,
+             'body': {'slot': ctx['open_slot'], 'event': event, 'attendees_count': 1},
+             'undo': drop_new_bookings},
+            {'label': 'POST bookings batch', 'method': 'POST', 'path': '/api/bookings/batch/', 'actor': member,
+             'body': {'items': [{'slot': slot, 'attendees_count': 1} for slot in ctx['batch_slots']]},
+             'undo': drop_new_bookings},
+            {'label': 'GET booking', 'method': 'GET', 'path': f"/api/bookings/{ctx['booking']}/", 'actor': member},
+            {'label': 'PATCH booking', 'method': 'PATCH', 'path': f"/api/bookings/{ctx['booking']}/", 'actor': staff,
+             'body': {'booking_status': Booking.Status.CANCELLED}, 'undo': reopen(ctx['booking'])},
+            {'label': 'POST booking cancel', 'method': 'POST', 'path': f"/api/bookings/{ctx['booking']}/cancel/",
+             'actor': member, 'undo': reopen(ctx['booking'])},
+            {'label': 'GET bookings export csv', 'method': 'GET', 'path': '/api/bookings/export/?export_format=csv',
+             'actor': member},
+            {'label': 'GET bookings export ndjson', 'method': 'GET',
+             'path': '/api/bookings/export/?export_format=ndjson', 'actor': member},
+            {'label': 'POST bookings bulk-status', 'method': 'POST', 'path': '/api/bookings/bulk-status/',
+             'actor': staff, 'body': {'ids': ctx['pending_ids'], 'booking_status': Booking.Status.APPROVED},
+             'undo': reopen(*ctx['pending_ids'])},
+
+            # Bypassed by RoleAccessMiddleware, so DRF reads a regular "Bearer" header
+            {'label': 'GET _debug/queries', 'method': 'GET', 'path': '/api/_debug/queries/', 'actor': staff,
+             'bearer': True},
+        ]
+
+    def _check_coverage(self, scenarios):
+        """Warn about API routes no scenario exercises."""
+        def walk(patterns, prefix=''):
+            for pattern in patterns:
+                route = prefix + str(pattern.pattern)
+                if isinstance(pattern, URLResolver):
+                    yield from walk(pattern.url_patterns, route)
+                elif route.startswith('api/'):
+                    yield route
+
+        covered = {resolve(s['path'].split('?')[0]).route for s in scenarios}
+        missing = sorted(set(walk(get_resolver().url_patterns)) - covered)
+        if missing:
+            self.stdout.write(self.style.WARNING(f"No benchmark scenario for: {', '.join(missing)}"))
+
+    # ---------------- MEASUREMENT ----------------
+    def _request(self, scenario, context):
+        client = Client(raise_request_exception=False)
+        headers = {}
+        if scenario['actor']:
+            token = context['tokens'][scenario['actor']]
+            headers['HTTP_AUTHORIZATION'] = f'Bearer {token}' if scenario.get('bearer') else token
+        body = json.dumps(scenario.get('body', {})) if scenario['method'] != 'GET' else None
+
+        if 'setup' in scenario:
+            scenario['setup']()
+        # Writes commit as in production, so their on_commit work is timed too
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            if scenario['method'] == 'GET':
+                response = client.get(scenario['path'], **headers)
+            else:
+                response = client.generic(
+                    scenario['method'], scenario['path'], body, content_type='application/json', **headers
+                )
+            size = self._consume(response)
+            elapsed = time.perf_counter() - started
+        if 'undo' in scenario:
+            scenario['undo']()
+        return response.status_code, elapsed, len(queries), size
+
+    @staticmethod
+    def _consume(response):
+        if response.streaming:
+            return sum(len(chunk) for chunk in response.streaming_content)
+        return len(response.content)
+
+    def _run(self, scenario, context, warmup, repeat):
+        for _ in range(warmup):
+            self._request(scenario, context)
+        timings, query_counts, sizes, statuses = [], [], [], set()
+        for _ in range(max(repeat, 1)):
+            status_code, elapsed, query_count, size = self._request(scenario, context)
+            timings.append(elapsed * 1000)
+            query_counts.append(query_count)
+            sizes.append(size)
+            statuses.add(status_code)
+        return {
+            'status': sorted(statuses),
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'p99_ms': round(percentile(timings, 99), 2),
+            'queries': round(sum(query_counts) / len(query_counts), 2),
+            'bytes': round(sum(sizes) / len(sizes)),
+        }
+
+    def _row_counts(self):
+        return {
+            model.__name__.lower(): model.objects.count()
+            for model in (Venue, Event, Slot, User, Booking)
+        }
+
+    # ---------------- REPORTING ----------------
+    def _print_row(self, label, result):
+        status = '/'.join(str(code) for code in result['status'])
+        self.stdout.write(
+            f"{label:<36} {status:>7}  p50 {result['p50_ms']:>8.2f}ms  p95 {result['p95_ms']:>8.2f}ms  "
+            f"p99 {result['p99_ms']:>8.2f}ms  {result['queries']:>6.1f} q  {result['bytes']:>9} B"
+        )
+
+    def _compare(self, baseline, report, max_regression):
+        if baseline['meta'].get('rows') != report['meta']['rows']:
+            self.stdout.write(self.style.WARNING(
+                "Row counts differ from the baseline; latencies are not directly comparable."
+            ))
+        self.stdout.write(self.style.MIGRATE_HEADING("== Compared with baseline"))
+        regressions = []
+        for label, result in report['results'].items():
+            before = baseline['results'].get(label)
+            if before is None:
+                self.stdout.write(f"{label:<36} (new)")
+                continue
+
+            def change(key):
+                return (result[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+
+            p95_change = change('p95_ms')
+            query_change = result['queries'] - before['queries']
+            line = (
+                f"{label:<36} p50 {change('p50_ms'):+7.1f}%  p95 {p95_change:+7.1f}%  "
+                f"queries {query_change:+6.1f}  bytes {change('bytes'):+7.1f}%"
+            )
+            regressed = max_regression is not None and (p95_change > max_regression or query_change > 0)
+            if regressed:
+                regressions.append(label)
+            self.stdout.write(self.style.ERROR(line) if regressed else line)
+        return regressions
@@ -0,0 +1,175 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import F, sql
+from django.utils import timezone
+
+from bookings.models.booking_model import Booking
+from bookings.services.perf_seed import PerfDataSeeder
+from events.models.event_model import Event
+from slots.models.slot_model import Slot
+from slots.services import venue_schedule
+from venues.models import Venue
+
+
+class RollbackSeed(Exception):
+    """Raised to discard the throwaway --seed dataset."""
+
+
+class Command(BaseCommand):
+    help = (
+        "Print EXPLAIN for the canonical hot queries (booking_list, the slot counter "
+        "update, overlap checks, slot/event/venue lists) and flag any that scan a whole table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help="Seed roughly this many bookings (plus venues/events/slots/users) in a "
+                 "transaction that is rolled back afterwards.",
+        )
+        parser.add_argument(
+            '--strict',
+            action='store_true',
+            help="Exit non-zero if any query plan contains a full table scan.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                if options['seed']:
+                    self._seed(options['seed'])
+                full_scans = self._explain_all()
+                if options['seed']:
+                    raise RollbackSeed
+        except RollbackSeed:
+            pass
+
+        if full_scans:
+            message = f"Full table scan in: {', '.join(full_scans)}"
+            if options['strict']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS("Every hot query uses an index."))
+
+    # ---------------- CANONICAL QUERIES ----------------
+    def canonical_queries(self):
+        """
+        (label, query) pairs mirroring the queries of the hot paths: a
+        queryset, or the (sql, params) of an UPDATE.
+        """
+        booking = Booking.objects.filter(deleted_at__isnull=True).order_by('?').first()
+        slot = Slot.objects.filter(deleted_at__isnull=True).select_related('event').order_by('?').first()
+        user_id = booking.user_id if booking else 0
+        event_id = slot.event_id if slot else 0
+        venue_id = slot.event.venue_id if slot else 0
+        slot_id = slot.pk if slot else 0
+        start = slot.start_time if slot else timezone.now()
+        end = slot.end_time if slot else start + timedelta(hours=1)
+
+        return [
+            ("booking_list (user)", Booking.objects.filter(
+                deleted_at__isnull=True, user_id=user_id
+            ).order_by('-created_at', 'id')[:10]),
+            ("booking_list (user + status)", Booking.objects.filter(
+                deleted_at__isnull=True, user_id=user_id, booking_status=Booking.Status.APPROVED
+            ).order_by('-created_at', 'id')[:10]),
+            ("booking_list (staff)", Booking.objects.filter(
+                deleted_at__isnull=True
+            ).order_by('-created_at', 'id')[:10]),
+            ("Slot.apply_attendee_deltas() admission", self._update(
+                Slot.objects.filter(pk=slot_id, capacity__gte=F('approved_attendees') + F('held_attendees') + 1),
+                approved_attendees=F('approved_attendees') + 1,
+            )),
+            ("Booking.clean() user overlap", Booking.overlapping(start, end).filter(
+                user_id=user_id
+            ).values('pk')[:1]),
+            ("slot_list (event)", Slot.objects.filter(
+                deleted_at__isnull=True, event_id=event_id
+            ).order_by('start_time', 'id')[:10]),
+            ("slot_list", Slot.objects.filter(
+                deleted_at__isnull=True
+            ).order_by('start_time', 'id')[:10]),
+            ("venue_schedule.overlapping_slot()", venue_schedule.overlapping_slots(
+                venue_id, start, end, exclude_slot_id=slot_id
+            )[:1]),
+            ("event_list", Event.objects.filter(
+                deleted_at__isnull=True
+            ).order_by('start_date', 'id')[:10]),
+            ("venue_list", Venue.objects.filter(
+                deleted_at__isnull=True
+            ).order_by('name', 'id')[:10]),
+        ]
+
+    @staticmethod
+    def _update(queryset, **values):
+        """(sql, params) of queryset.update(**values), without running it."""
+        query = queryset.query.chain(sql.UpdateQuery)
+        query.add_update_values(values)
+        return query.get_compiler(queryset.db).as_sql()
+
+    def _explain(self, query):
+        """(sql, plan), with the plan rows flattened as QuerySet.explain() does."""
+        if not isinstance(query, tuple):
+            return str(query.query), query.explain()
+        statement, params = query
+        with connection.cursor() as cursor:
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {statement}", params)
+            rows = cursor.fetchall()
+        return statement % tuple(params), "\n".join(" ".join(map(str, row)) for row in rows)
+
+    def _explain_all(self):
+        full_scans = []
+        for label, query in self.canonical_queries():
+            statement, plan = self._explain(query)
+            scans = self._full_scans(plan)
+            self.stdout.write(self.style.MIGRATE_HEADING(f"== {label}"))
+            self.stdout.write(statement)
+            self.stdout.write(plan)
+            if scans:
+                full_scans.append(label)
+                self.stdout.write(self.style.WARNING(f"-> full scan of {', '.join(scans)}"))
+            self.stdout.write("")
+        return full_scans
+
+    def _full_scans(self, plan):
+        """Tables the plan reads without an index (SQLite and MySQL plan formats)."""
+        scans = []
+        for line in plan.splitlines():
+            if connection.vendor == 'sqlite':
+                # "<id> <parent> <notused> <detail>", detail "SCAN booking" vs
+                # "SEARCH booking USING INDEX ..." / "SCAN booking USING INDEX ..."
+                text = line.split(maxsplit=3)[-1].strip(' -|`')
+                if text.startswith('SCAN ') and 'USING' not in text:
+                    scans.append(text.split()[1])
+            elif connection.vendor == 'mysql':
+                # tabular EXPLAIN: id, select_type, table, partitions, type, ...
+                columns = line.split()
+                if len(columns) > 4 and columns[4] == 'ALL':
+                    scans.append(columns[2])
+        return scans
+
+    # ---------------- THROWAWAY DATASET ----------------
+    def _seed(self, bookings):
+        slots_count = max(bookings // 20, 1)
+        events_count = max(slots_count // 10, 1)
+        # Enough venues that SQLite's planner, after ANALYZE, still reads
+        # the venue table through its index rather than scanning a few rows
+        venues_count = max(events_count // 5, 25)
+        PerfDataSeeder(
+            venues=venues_count,
+            events_per_venue=max(events_count // venues_count, 1),
+            slots_per_event=10,
+            users=max(bookings // 5, 1),
+            bookings=bookings,
+            tag='explain-seed',
+        ).run()
+
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+        self.stdout.write(f"Seeded {bookings} bookings (rolled back afterwards).\n")
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from bookings.models.idempotency_model import IdempotencyKey
+from bookings.services.idempotency import expired_before
+
+
+class Command(BaseCommand):
+    help = "Delete Idempotency-Key records older than IDEMPOTENCY_KEY_TTL (run from cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Rows deleted per statement, to keep each delete's locks short.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = expired_before()
+        expired = IdempotencyKey.objects.filter(created_at__lt=cutoff)
+        deleted = 0
+        while True:
+            ids = list(expired.order_by('created_at').values_list('pk', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            deleted += IdempotencyKey.objects.filter(pk__in=ids).delete()[0]
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired idempotency key(s)."))
@@ -0,0 +1,301 @@
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.models import Sum
+from django.test import Client
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from bookings.management.commands.bench_api import percentile
+from bookings.models.booking_model import Booking
+from events.models.event_model import Event
+from slots.models.slot_model import Slot
+from users.models import RolePermission, User, UserRole
+from venues.models import Venue
+
+# Statements that take (and may wait for) a write lock
+LOCKING_PREFIXES = ('BEGIN IMMEDIATE', 'BEGIN EXCLUSIVE', 'UPDATE "slots_slot"', 'UPDATE `slots_slot`')
+
+
+class LockTimer:
+    """connection.execute_wrapper() hook timing lock-taking statements."""
+
+    def __init__(self):
+        self.durations = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            if sql.lstrip().upper().startswith(LOCKING_PREFIXES) or 'FOR UPDATE' in sql.upper():
+                self.durations.append(time.perf_counter() - start)
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent POST /api/bookings/ and staff approvals at one hot slot (plus an "
+        "overlapping slot) from many threads, then verify capacity and overlap invariants "
+        "and report throughput, error mix and lock-wait time. Writes to the configured "
+        "database; use DJANGO_DB_ENGINE=sqlite or a local MySQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help="Concurrent threads.")
+        parser.add_argument('--users', type=int, default=200, help="Users racing for the slot.")
+        parser.add_argument('--capacity', type=int, default=50, help="Capacity of the hot slot.")
+        parser.add_argument('--max-attendees', type=int, default=3)
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument('--keep', action='store_true', help="Keep the generated rows for inspection.")
+        parser.add_argument('--json', action='store_true', help="Print the report as JSON.")
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db() and options['workers'] > 1:
+            raise CommandError("Concurrent writers need a file-based SQLite database (DJANGO_DB_ENGINE=sqlite).")
+
+        rng = random.Random(options['seed'])
+        fixture = self._setup(options['users'], options['capacity'])
+        # Every user books the hot slot and, from another task, the slot that
+        # overlaps it; at most one of the two may stay active
+        tasks = [
+            (user_token, slot_id, event_id, rng.randint(1, options['max_attendees']))
+            for user_token in fixture['user_tokens']
+            for slot_id, event_id in fixture['slots']
+        ]
+        rng.shuffle(tasks)
+
+        results = []
+        lock_timers = []
+        barrier = threading.Barrier(options['workers'])
+        queue_lock = threading.Lock()
+
+        def worker():
+            timer = LockTimer()
+            with queue_lock:
+                lock_timers.append(timer)
+            barrier.wait()
+            try:
+                with connection.execute_wrapper(timer):
+                    staff = Client(raise_request_exception=False, HTTP_AUTHORIZATION=fixture['staff_token'])
+                    while True:
+                        with queue_lock:
+                            if not tasks:
+                                return
+                            task = tasks.pop()
+                        results.append(self._book_and_approve(staff, *task))
+            finally:
+                connections.close_all()
+
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+                for future in [executor.submit(worker) for _ in range(options['workers'])]:
+                    future.result()
+            elapsed = time.perf_counter() - started
+
+        try:
+            violations = self._check_invariants(fixture)
+            report = self._report(results, lock_timers, elapsed, fixture, violations, options)
+        finally:
+            if not options['keep']:
+                self._teardown(fixture)
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self._print(report)
+        if violations:
+            raise CommandError(f"{len(violations)} invariant violation(s)")
+
+    # ---------------- FIXTURE ----------------
+    def _setup(self, users_count, capacity):
+        tag = f'race-{uuid.uuid4().hex[:8]}'
+        role = UserRole.objects.create(name=tag)
+        RolePermission.objects.create(
+            role=role, module_name='Bookings', is_read=True, is_create=True, is_update=True
+        )
+        staff = User.objects.create_user(username=f'{tag}-staff', email=f'{tag}-staff@example.com',
+                                         role=role, is_staff=True)
+        User.objects.bulk_create([
+            User(username=f'{tag}-{i}', email=f'{tag}-{i}@example.com', role=role)
+            for i in range(users_count)
+        ])
+        users = list(User.objects.filter(username__startswith=f'{tag}-', is_staff=False))
+
+        today = timezone.now().date()
+        start = timezone.now() + timedelta(days=1)
+        # Overlapping slots need venues of their own
+        venues = []
+        slots = []
+        for name, slot_start in [('hot', start), ('overlap', start + timedelta(minutes=30))]:
+            venue = Venue.objects.create(name=f'{tag} {name}', address='Race Road', city='Pune', state='MH',
+                                         pincode='411001', capacity=capacity * 2)
+            venues.append(venue)
+            event = Event.objects.create(name=f'{tag} {name}', venue=venue, start_date=today,
+                                         end_date=today + timedelta(days=2))
+            slot = Slot.objects.create(event=event, start_time=slot_start,
+                                       end_time=slot_start + timedelta(hours=1), capacity=capacity)
+            slots.append((slot.pk, event.pk))
+        return {
+            'tag': tag,
+            'role': role,
+            'venues': venues,
+            'slots': slots,
+            'user_ids': [user.pk for user in users] + [staff.pk],
+            'staff_token': str(RefreshToken.for_user(staff).access_token),
+            'user_tokens': [str(RefreshToken.for_user(user).access_token) for user in users],
+        }
+
+    def _teardown(self, fixture):
+        Booking.objects.filter(slot_id__in=[slot_id for slot_id, _ in fixture['slots']]).delete()
+        for venue in fixture['venues']:
+            venue.delete()  # cascades to events and slots
+        User.objects.filter(pk__in=fixture['user_ids']).delete()
+        fixture['role'].delete()
+
+    # ---------------- WORKLOAD ----------------
+    def _book_and_approve(self, staff, user_token, slot_id, event_id, attendees):
+        client = Client(raise_request_exception=False, HTTP_AUTHORIZATION=user_token)
+        outcome = {'slot': slot_id}
+
+        started = time.perf_counter()
+        response = client.post(
+            '/api/bookings/',
+            json.dumps({'slot': slot_id, 'event': event_id, 'attendees_count': attendees}),
+            content_type='application/json',
+        )
+        outcome['book'] = (response.status_code, self._error(response), time.perf_counter() - started)
+        if response.status_code != 201:
+            return outcome
+
+        booking_id = response.json()['data']['id']
+        started = time.perf_counter()
+        response = staff.patch(
+            f'/api/bookings/{booking_id}/',
+            json.dumps({'booking_status': Booking.Status.APPROVED}),
+            content_type='application/json',
+        )
+        outcome['approve'] = (response.status_code, self._error(response), time.perf_counter() - started)
+        return outcome
+
+    @staticmethod
+    def _error(response):
+        if response.status_code < 400:
+            return None
+        if getattr(response, 'exc_info', None):
+            exception = response.exc_info[1]
+            return f'{type(exception).__name__}: {exception}'[:80]
+        try:
+            errors = response.json().get('errors') or response.json()
+        except ValueError:
+            return f'HTTP {response.status_code}'
+        if isinstance(errors, dict):
+            field, messages = next(iter(errors.items()))
+            message = messages[0] if isinstance(messages, list) else messages
+            return f'{field}: {message}'
+        return str(errors)[:80]
+
+    # ---------------- INVARIANTS ----------------
+    def _check_invariants(self, fixture):
+        violations = []
+        slot_ids = [slot_id for slot_id, _ in fixture['slots']]
+        for slot in Slot.objects.filter(pk__in=slot_ids):
+            approved = Booking.objects.filter(
+                slot=slot, booking_status=Booking.Status.APPROVED, deleted_at__isnull=True
+            ).aggregate(total=Sum('attendees_count'))['total'] or 0
+            if approved > slot.capacity:
+                violations.append(f"slot {slot.pk}: {approved} approved attendees > capacity {slot.capacity}")
+            counted = slot.counted_attendees()
+            for field in Slot.COUNTER_FIELDS:
+                if getattr(slot, field) != counted[field]:
+                    violations.append(f"slot {slot.pk}: {field} counter {getattr(slot, field)} != {counted[field]}")
+
+        windows = defaultdict(list)
+        for user_id, start, end in Booking.objects.filter(
+            slot_id__in=slot_ids, booking_status__in=Booking.ACTIVE_STATUSES, deleted_at__isnull=True
+        ).values_list('user_id', 'slot__start_time', 'slot__end_time'):
+            windows[user_id].append((start, end))
+        for user_id, user_windows in windows.items():
+            user_windows.sort()
+            if any(later[0] < earlier[1] for earlier, later in zip(user_windows, user_windows[1:])):
+                violations.append(f"user {user_id} holds overlapping active bookings")
+        return violations
+
+    # ---------------- REPORT ----------------
+    def _report(self, results, lock_timers, elapsed, fixture, violations, options):
+        errors = Counter()
+        timings = defaultdict(list)
+        succeeded = Counter()
+        for outcome in results:
+            for step in ('book', 'approve'):
+                if step not in outcome:
+                    continue
+                status_code, error, duration = outcome[step]
+                timings[step].append(duration * 1000)
+                if error:
+                    errors[f'{step} {status_code} {error}'] += 1
+                else:
+                    succeeded[step] += 1
+
+        lock_waits = [duration * 1000 for timer in lock_timers for duration in timer.durations]
+        hot_slot = Slot.objects.get(pk=fixture['slots'][0][0])
+        return {
+            'database': connection.vendor,
+            'workers': options['workers'],
+            'users': options['users'],
+            'elapsed_s': round(elapsed, 3),
+            'requests': sum(len(timings[step]) for step in timings),
+            'requests_per_s': round(sum(len(timings[step]) for step in timings) / elapsed, 1),
+            'bookings_created': succeeded['book'],
+            'bookings_approved': succeeded['approve'],
+            'approvals_per_s': round(succeeded['approve'] / elapsed, 1),
+            'hot_slot': {'capacity': hot_slot.capacity, 'approved_attendees': hot_slot.approved_attendees},
+            'latency_ms': {
+                step: {'p50': round(percentile(values, 50), 2), 'p95': round(percentile(values, 95), 2)}
+                for step, values in timings.items()
+            },
+            'lock_wait_ms': {
+                'statements': len(lock_waits),
+                'total': round(sum(lock_waits), 2),
+                'p95': round(percentile(lock_waits, 95), 2) if lock_waits else 0,
+                'max': round(max(lock_waits), 2) if lock_waits else 0,
+            },
+            'errors': dict(errors.most_common()),
+            'violations': violations,
+        }
+
+    def _print(self, report):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"== {report['workers']} workers, {report['users']} users on {report['database']}"
+        ))
+        self.stdout.write(
+            f"{report['requests']} requests in {report['elapsed_s']}s ({report['requests_per_s']} req/s); "
+            f"{report['bookings_created']} bookings created, {report['bookings_approved']} approved "
+            f"({report['approvals_per_s']} approvals/s)"
+        )
+        hot = report['hot_slot']
+        self.stdout.write(f"hot slot: {hot['approved_attendees']}/{hot['capacity']} attendees approved")
+        for step, latency in report['latency_ms'].items():
+            self.stdout.write(f"{step:<8} p50 {latency['p50']:.2f}ms  p95 {latency['p95']:.2f}ms")
+        lock = report['lock_wait_ms']
+        self.stdout.write(
+            f"lock-taking statements: {lock['statements']}, {lock['total']:.2f}ms total, "
+            f"p95 {lock['p95']:.2f}ms, max {lock['max']:.2f}ms"
+        )
+        for error, count in report['errors'].items():
+            self.stdout.write(f"  {count:>5} x {error}")
+        if report['violations']:
+            for violation in report['violations']:
+                self.stdout.write(self.style.ERROR(violation))
+        else:
+            self.stdout.write(self.style.SUCCESS("Capacity and overlap invariants hold."))
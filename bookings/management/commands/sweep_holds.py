@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from bookings.services.holds import SWEEP_BATCH_SIZE, sweep_holds
+from bookings.services.waitlist import promote_all
+
+
+class Command(BaseCommand):
+    help = (
+        "Expire HELD bookings past their held_until, release their seats and promote waitlisted "
+        "users into free seats (once, or every --interval seconds)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=SWEEP_BATCH_SIZE,
+            help="Holds expired per transaction.",
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help="Keep sweeping until interrupted (run as a worker process).",
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help="Seconds between sweeps with --loop.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            expired = sweep_holds(options['batch_size'])
+            # Catches up on promotion passes that failed after their commit
+            promoted = promote_all()
+            if expired or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(f"Expired {expired} hold(s)."))
+            if promoted:
+                self.stdout.write(self.style.SUCCESS(f"Promoted {promoted} waitlist entry(ies)."))
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_alter_booking_options_alter_booking_booking_status_and_more'),
+        ('events', '0003_event_deleted_start_idx'),
+        ('slots', '0004_slot_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['user', 'deleted_at', '-created_at'], name='booking_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['user', 'booking_status', 'deleted_at'], name='booking_user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['slot', 'booking_status', 'deleted_at'], name='booking_slot_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['deleted_at', '-created_at'], name='booking_deleted_created_idx'),
+        ),
+    ]
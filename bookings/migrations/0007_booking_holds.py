@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0006_idempotency_key'),
+        ('events', '0003_event_deleted_start_idx'),
+        ('slots', '0006_slot_held_attendees'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='held_until',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='booking',
+            name='booking_status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('APPROVED', 'Approved'), ('CANCELLED', 'Cancelled'), ('HELD', 'Held'), ('EXPIRED', 'Expired')], default='PENDING', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['booking_status', 'held_until'], name='booking_status_held_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0007_booking_holds'),
+        ('slots', '0006_slot_held_attendees'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WaitlistEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attendees_count', models.PositiveIntegerField()),
+                ('status', models.CharField(choices=[('WAITING', 'Waiting'), ('PROMOTED', 'Promoted'), ('CANCELLED', 'Cancelled')], default='WAITING', max_length=20)),
+                ('reason', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('slot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='slots.slot')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'waitlist_entry',
+                'indexes': [models.Index(fields=['slot', 'status', 'created_at'], name='waitlist_slot_queue_idx'), models.Index(fields=['user', 'slot', 'status'], name='waitlist_user_slot_idx')],
+            },
+        ),
+    ]
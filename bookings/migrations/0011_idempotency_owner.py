@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0010_idempotency_response_headers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='idempotencykey',
+            name='owner',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
@@ -1 +1,3 @@
-from .booking_model import Booking
\ No newline at end of file
+from .booking_model import Booking
+from .idempotency_model import IdempotencyKey
+from .waitlist_model import WaitlistEntry
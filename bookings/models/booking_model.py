@@ -1,16 +1,66 @@
-from django.db import models
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Q
 from django.core.exceptions import ValidationError
+from django.utils import timezone
+from eventslotbooking_project.versioning import VersionedModel, VersionedQuerySet
 from users.models import User
 from events.models.event_model import Event
 from slots.models import Slot
 
 
-class Booking(models.Model):
+class BookingQuerySet(VersionedQuerySet):
+
+    def update_with_counters(self, **fields):
+        """
+        queryset.update() that keeps the Slot attendee counters in step.
+        Locks the affected bookings, applies the update and then moves the
+        attendee totals between counters with F() expressions. Raises
+        ValidationError (and rolls back) when approved bookings no longer fit.
+        """
+        with transaction.atomic():
+            rows = list(
+                self.select_for_update().values_list(
+                    'pk', 'slot_id', 'booking_status', 'attendees_count', 'deleted_at'
+                )
+            )
+            if not rows:
+                return 0
+
+            deltas = defaultdict(lambda: defaultdict(int))
+            for pk, slot_id, status, attendees_count, deleted_at in rows:
+                before = Booking.counter_field_for(status, deleted_at)
+                after = Booking.counter_field_for(
+                    fields.get('booking_status', status),
+                    fields.get('deleted_at', deleted_at),
+                )
+                if before == after:
+                    continue
+                if before:
+                    deltas[slot_id][before] -= attendees_count
+                if after:
+                    deltas[slot_id][after] += attendees_count
+
+            updated = Booking.objects.filter(pk__in=[row[0] for row in rows]).update_and_sync(**fields)
+            Slot.apply_attendee_deltas(deltas)
+        return updated
+
+
+class Booking(VersionedModel):
 
     class Status(models.TextChoices):
         PENDING = "PENDING", "Pending"
         APPROVED = "APPROVED", "Approved"
         CANCELLED = "CANCELLED", "Cancelled"
+        # Seats reserved until held_until; sweep_holds expires them
+        HELD = "HELD", "Held"
+        EXPIRED = "EXPIRED", "Expired"
+
+    # Statuses that hold (or ask for) a place in the slot
+    ACTIVE_STATUSES = [Status.PENDING, Status.APPROVED, Status.HELD]
 
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     event = models.ForeignKey(Event, on_delete=models.CASCADE)
@@ -23,17 +73,100 @@ class Booking(models.Model):
         default=Status.PENDING,
     )
 
+    # When a HELD booking stops counting against capacity
+    held_until = models.DateTimeField(null=True, blank=True, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
 
+    objects = BookingQuerySet.as_manager()
+
     class Meta:
         db_table = 'booking'
         ordering = ['-created_at']
+        # Composite indexes for the soft-delete read paths. deleted_at is an
+        # index column rather than a partial-index condition because MySQL
+        # has no partial indexes.
+        indexes = [
+            # booking_list for a user, newest first
+            models.Index(fields=['user', 'deleted_at', '-created_at'], name='booking_user_created_idx'),
+            # per-user overlap check and ?status= filter
+            models.Index(fields=['user', 'booking_status', 'deleted_at'], name='booking_user_status_idx'),
+            # approved-attendee sums per slot
+            models.Index(fields=['slot', 'booking_status', 'deleted_at'], name='booking_slot_status_idx'),
+            # staff booking_list, newest first
+            models.Index(fields=['deleted_at', '-created_at'], name='booking_deleted_created_idx'),
+            # sweep_holds: overdue holds, oldest first
+            models.Index(fields=['booking_status', 'held_until'], name='booking_status_held_idx'),
+        ]
 
     def __str__(self):
         return f"Booking #{self.id} - {self.user} - {self.slot}"
 
+    # ---------------- SLOT COUNTERS ----------------
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._counted = instance._counter_contribution()
+        return instance
+
+    @staticmethod
+    def counter_field_for(status, deleted_at):
+        """Slot counter a booking in this state is counted in (or None)."""
+        if deleted_at is not None:
+            return None
+        return {
+            Booking.Status.APPROVED: 'approved_attendees',
+            Booking.Status.PENDING: 'pending_attendees',
+            Booking.Status.HELD: 'held_attendees',
+        }.get(status)
+
+    def _counter_contribution(self):
+        """(slot_id, counter field, attendees) this booking adds, or None."""
+        field = self.counter_field_for(self.booking_status, self.deleted_at)
+        if field is None or not self.slot_id or not self.attendees_count:
+            return None
+        return (self.slot_id, field, self.attendees_count)
+
+    def _held_before(self):
+        """Whether the stored row is a hold (from the counter it was counted in)."""
+        counted = getattr(self, '_counted', None)
+        return bool(counted) and counted[1] == 'held_attendees'
+
+    @staticmethod
+    def hold_ttl():
+        return timedelta(seconds=getattr(settings, 'BOOKING_HOLD_TTL', 10 * 60))
+
+    @classmethod
+    def overlapping(cls, start_time, end_time, now=None):
+        """Live bookings whose slot overlaps the window (holds past held_until no longer count)."""
+        return cls.objects.filter(
+            Q(booking_status__in=[cls.Status.PENDING, cls.Status.APPROVED])
+            | Q(booking_status=cls.Status.HELD, held_until__gt=now or timezone.now()),
+            deleted_at__isnull=True,
+            slot__start_time__lt=end_time,
+            slot__end_time__gt=start_time,
+        )
+
+    @classmethod
+    def overdue_holds(cls, now=None):
+        """Holds past held_until that sweep_holds has not expired yet."""
+        return cls.objects.filter(
+            booking_status=cls.Status.HELD, deleted_at__isnull=True, held_until__lte=now or timezone.now()
+        )
+
+    def _counter_deltas(self):
+        deltas = defaultdict(lambda: defaultdict(int))
+        before = getattr(self, '_counted', None)
+        after = self._counter_contribution()
+        if before != after:
+            if before:
+                deltas[before[0]][before[1]] -= before[2]
+            if after:
+                deltas[after[0]][after[1]] += after[2]
+        return deltas
+
     # ---------------- VALIDATION ----------------
     def clean(self):
         errors = {}
@@ -47,43 +180,51 @@ class Booking(models.Model):
         elif self.slot.event_id != self.event_id:
             general_errors.append("Selected slot does not belong to the provided event.")
 
+        # Cancelling must always be possible, so the booking rules below only
+        # apply to bookings that hold (or ask for) a place in the slot
+        active = self.booking_status in self.ACTIVE_STATUSES and self.deleted_at is None
+
         # Blocked slot
-        if self.slot and self.slot.is_blocked:
+        if active and self.slot and self.slot.is_blocked:
             general_errors.append("This slot is blocked and cannot be booked.")
 
         # Deleted slot
-        if self.slot and self.slot.deleted_at is not None:
+        if active and self.slot and self.slot.deleted_at is not None:
             general_errors.append("Cannot book a slot that is no longer active.")
 
         # Attendees check
         if self.attendees_count <= 0:
             errors['attendees_count'] = "Attendees count must be greater than zero."
 
-        # Capacity validation (only applies for new bookings)
-        if self.slot and not self.pk:
-            total_attendees = Booking.objects.filter(
-                slot=self.slot,
-                booking_status=Booking.Status.APPROVED,
-                deleted_at__isnull=True
-            ).exclude(pk=self.pk).aggregate(
-                models.Sum('attendees_count')
-            )['attendees_count__sum'] or 0
+        # A hold that ran out can only be cancelled (or expired by sweep_holds)
+        now = timezone.now()
+        if active and self._held_before() and self.held_until and self.held_until <= now:
+            errors['booking_status'] = "This hold has expired."
 
+        # Capacity validation. This is a fast fail on the counter columns;
+        # save() re-checks it atomically under the slot row lock.
+        if active and self.slot:
             if self.attendees_count > self.slot.capacity:
                 errors['attendees_count'] = "Attendees count exceeds slot capacity."
 
-            elif (self.booking_status == Booking.Status.APPROVED and
-                  total_attendees + self.attendees_count > self.slot.capacity):
-                errors['slot'] = "Cannot approve booking: slot capacity exceeded."
-
-        # Overlap check (only new booking)
-        if self.user_id and self.slot:
-            overlapping = Booking.objects.filter(
-                user=self.user,
-                booking_status__in=[Booking.Status.PENDING, Booking.Status.APPROVED],
-                deleted_at__isnull=True,
-                slot__start_time__lt=self.slot.end_time,
-                slot__end_time__gt=self.slot.start_time,
+            elif self.booking_status in (Booking.Status.APPROVED, Booking.Status.HELD):
+                row = Slot.objects.filter(pk=self.slot_id).values_list(*Slot.OCCUPYING_FIELDS).first()
+                occupied = sum(row) if row else 0
+                counted = getattr(self, '_counted', None)
+                if counted and counted[0] == self.slot_id and counted[1] in Slot.OCCUPYING_FIELDS:
+                    occupied -= counted[2]
+
+                if occupied + self.attendees_count > self.slot.capacity:
+                    errors['slot'] = (
+                        "Cannot approve booking: slot capacity exceeded."
+                        if self.booking_status == Booking.Status.APPROVED
+                        else "Cannot hold seats: slot capacity exceeded."
+                    )
+
+        # Overlap check
+        if active and self.user_id and self.slot:
+            overlapping = Booking.overlapping(self.slot.start_time, self.slot.end_time, now).filter(
+                user=self.user
             ).exclude(pk=self.pk)
 
             if overlapping.exists():
@@ -96,13 +237,33 @@ class Booking(models.Model):
             raise ValidationError(errors)
 
     def save(self, *args, **kwargs):
-        self.full_clean()
-        super().save(*args, **kwargs)
+        # Admission: the counter UPDATE locks the slot row and fails when the
+        # slot is full, rolling the booking write back with it. Booking rows
+        # are always locked before slot rows (as in update_with_counters()).
+        if self.booking_status == Booking.Status.HELD and not self._held_before():
+            # A new hold: its seats count against capacity until held_until
+            self.held_until = timezone.now() + self.hold_ttl()
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = [*kwargs['update_fields'], 'held_until']
+        with transaction.atomic():
+            if self.booking_status in self.ACTIVE_STATUSES and self.deleted_at is None and self.user_id:
+                # Lock the user row first so two concurrent bookings by the
+                # same user cannot both pass the overlap check in clean()
+                User.objects.select_for_update().filter(pk=self.user_id).values_list('pk').first()
+            self.full_clean()
+            super().save(*args, **kwargs)
+            Slot.apply_attendee_deltas(self._counter_deltas())
+        self._counted = self._counter_contribution()
 
     def cancel(self):
         self.booking_status = Booking.Status.CANCELLED
         self.save(update_fields=['booking_status', 'updated_at'])
 
     def approve(self):
+        previous_status = self.booking_status
         self.booking_status = Booking.Status.APPROVED
-        self.save(update_fields=['booking_status', 'updated_at'])
+        try:
+            self.save(update_fields=['booking_status', 'updated_at'])
+        except ValidationError:
+            self.booking_status = previous_status
+            raise
@@ -0,0 +1,35 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from users.models import User
+
+
+class IdempotencyKey(models.Model):
+    """
+    The stored outcome of one booking write sent with an Idempotency-Key
+    header, replayed to retries of the same request (see
+    bookings/services/idempotency.py). status_code is null while the first
+    request is still running, or after its worker process died.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    key = models.CharField(max_length=255)
+    # sha256 of method, path and body: a reused key with another request is rejected
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    # Headers the view set (e.g. the ETag of a booking_detail PATCH)
+    response_headers = models.JSONField(null=True, blank=True)
+    # hostname:pid of the worker running the first request
+    owner = models.CharField(max_length=255, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='idempotency_user_key_uniq'),
+        ]
+        indexes = [
+            # purge_idempotency_keys
+            models.Index(fields=['created_at'], name='idempotency_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}:{self.key}"
@@ -0,0 +1,38 @@
+from django.db import models
+from users.models import User
+from slots.models import Slot
+
+
+class WaitlistEntry(models.Model):
+    """
+    A place in a full slot's queue. Promotion passes (see
+    bookings/services/waitlist.py) turn the longest-waiting entries that
+    fit into approved bookings whenever seats are released.
+    """
+
+    class Status(models.TextChoices):
+        WAITING = "WAITING", "Waiting"
+        PROMOTED = "PROMOTED", "Promoted"
+        CANCELLED = "CANCELLED", "Cancelled"
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    slot = models.ForeignKey(Slot, on_delete=models.CASCADE)
+    attendees_count = models.PositiveIntegerField()
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.WAITING)
+    # Why a promotion pass dropped the entry (e.g. the user booked an overlapping slot)
+    reason = models.CharField(max_length=255, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'waitlist_entry'
+        indexes = [
+            # promotion pass: a slot's queue, oldest first
+            models.Index(fields=['slot', 'status', 'created_at'], name='waitlist_slot_queue_idx'),
+            # one waiting entry per user and slot
+            models.Index(fields=['user', 'slot', 'status'], name='waitlist_user_slot_idx'),
+        ]
+
+    def __str__(self):
+        return f"Waitlist #{self.id} - {self.user} - slot {self.slot_id}"
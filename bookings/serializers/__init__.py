@@ -1,2 +1,3 @@
 # Import BookingSerializer
-from .booking_serializer import BookingSerializer
+from .booking_serializer import BookingSerializer, BookingBulkStatusSerializer, BookingBatchSerializer
+from .waitlist_serializer import WaitlistEntrySerializer
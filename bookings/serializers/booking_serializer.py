@@ -1,5 +1,7 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 from bookings.models.booking_model import Booking
+from bookings.services.batch_booking import BATCH_STATUSES, max_items
 
 
 class BookingSerializer(serializers.ModelSerializer):
@@ -11,10 +13,10 @@ class BookingSerializer(serializers.ModelSerializer):
         model = Booking
         fields = [
             'id', 'user', 'event', 'event_name', 'slot', 'slot_start',
-            'booking_status', 'attendees_count',
+            'booking_status', 'attendees_count', 'held_until',
             'created_at', 'updated_at', 'deleted_at'
         ]
-        read_only_fields = ['deleted_at', 'created_at', 'updated_at', 'event_name', 'slot_start']
+        read_only_fields = ['deleted_at', 'created_at', 'updated_at', 'event_name', 'slot_start', 'held_until']
 
     def validate(self, attrs):
         event = attrs.get('event')
@@ -27,6 +29,18 @@ class BookingSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("Authenticated user is required to create a booking.")
             attrs['user'] = user
 
+        if attrs.get('booking_status') == Booking.Status.EXPIRED:
+            raise serializers.ValidationError({"booking_status": "Holds are expired by the hold sweeper only."})
+
+        if self.instance is None:
+            if attrs.get('booking_status') == Booking.Status.HELD:
+                raise serializers.ValidationError(
+                    {"booking_status": "Holds are created through POST /api/bookings/batch/."}
+                )
+            if not (attrs['user'].is_staff or attrs['user'].is_superuser):
+                # Non superadmins cannot pick the status of a new booking
+                attrs.pop('booking_status', None)
+
         if slot and slot.deleted_at is not None:
             raise serializers.ValidationError({"slot": "Slot is not available."})
 
@@ -40,7 +54,11 @@ class BookingSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data.setdefault('booking_status', Booking.Status.PENDING)
-        return Booking.objects.create(**validated_data)
+        try:
+            # Booking.save() admits the booking atomically against slot capacity
+            return Booking.objects.create(**validated_data)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.message_dict)
 
     def update(self, instance, validated_data):
         request = self.context.get('request')
@@ -62,5 +80,32 @@ class BookingSerializer(serializers.ModelSerializer):
                 }
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        try:
+            instance.save()
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.message_dict)
         return instance
+
+
+class BookingBulkStatusSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=10000
+    )
+    booking_status = serializers.ChoiceField(choices=[Booking.Status.APPROVED, Booking.Status.CANCELLED])
+
+
+class BookingBatchItemSerializer(serializers.Serializer):
+    slot = serializers.IntegerField(min_value=1)
+    attendees_count = serializers.IntegerField(min_value=1)
+
+
+class BookingBatchSerializer(serializers.Serializer):
+    items = BookingBatchItemSerializer(many=True, allow_empty=False)
+    booking_status = serializers.ChoiceField(choices=BATCH_STATUSES, default=Booking.Status.PENDING)
+
+    def validate_items(self, items):
+        if len(items) > max_items():
+            raise serializers.ValidationError(f"At most {max_items()} slots can be booked at once.")
+        return items
@@ -0,0 +1,26 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+from bookings.models.waitlist_model import WaitlistEntry
+from bookings.services import waitlist
+
+
+class WaitlistEntrySerializer(serializers.ModelSerializer):
+    user = serializers.PrimaryKeyRelatedField(read_only=True)
+    slot = serializers.PrimaryKeyRelatedField(read_only=True)
+    attendees_count = serializers.IntegerField(min_value=1)
+    position = serializers.SerializerMethodField()
+
+    class Meta:
+        model = WaitlistEntry
+        fields = ['id', 'user', 'slot', 'attendees_count', 'status', 'position', 'reason', 'created_at']
+        read_only_fields = ['status', 'reason', 'created_at']
+
+    def get_position(self, obj):
+        return waitlist.position(obj)
+
+    def create(self, validated_data):
+        # The view passes user and slot to save()
+        try:
+            return waitlist.join(validated_data['user'], validated_data['slot'], validated_data['attendees_count'])
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.message_dict)
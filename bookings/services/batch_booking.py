@@ -0,0 +1,124 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from bookings.models.booking_model import Booking
+from middleware.response_cache import bump_versions
+from slots.models.slot_model import Slot
+from users.models import User
+
+BATCH_STATUSES = [Booking.Status.PENDING, Booking.Status.HELD]
+
+
+def max_items():
+    """Most slots one POST /api/bookings/batch/ may book."""
+    return getattr(settings, 'BOOKING_BATCH_MAX', 20)
+
+
+def book_slots(user, items, booking_status=Booking.Status.PENDING):
+    """
+    Book several slots for `user` all-or-nothing. `items` is a list of
+    {'slot': id, 'attendees_count': n}.
+
+    Runs a fixed number of queries however long the list is: the user row
+    and then every requested slot row are locked (slots in ascending id
+    order, so two batches sharing slots cannot deadlock), the user's
+    existing bookings around the requested times are read once, every
+    check runs in memory, and the bookings and counter changes are written
+    with one bulk INSERT and one UPDATE.
+
+    Returns (bookings, errors). errors lines up with items ({} for an item
+    that passed); when any item fails nothing is written and bookings is [].
+    """
+    if booking_status not in BATCH_STATUSES:
+        raise ValueError(f"Unsupported batch status: {booking_status}")
+
+    now = timezone.now()
+    with transaction.atomic():
+        # Same lock order as Booking.save(): the user, then the slots
+        User.objects.select_for_update().filter(pk=user.pk).values_list('pk').first()
+        slots = {
+            slot['pk']: slot
+            for slot in Slot.objects.select_for_update()
+            .filter(pk__in={item['slot'] for item in items})
+            .order_by('pk')
+            .values('pk', 'event_id', 'capacity', 'approved_attendees', 'held_attendees',
+                    'is_blocked', 'deleted_at', 'start_time', 'end_time')
+        }
+        errors = _check_items(user, items, slots, booking_status, now)
+        if any(errors):
+            return [], errors
+
+        held_until = now + Booking.hold_ttl() if booking_status == Booking.Status.HELD else None
+        bookings = [
+            Booking(user=user, event_id=slots[item['slot']]['event_id'], slot_id=item['slot'],
+                    attendees_count=item['attendees_count'], booking_status=booking_status, held_until=held_until)
+            for item in items
+        ]
+        Booking.objects.bulk_create(bookings)
+        if not connection.features.can_return_rows_from_bulk_insert:
+            # MySQL returns no ids: the overlap check leaves one live booking per slot
+            by_slot = {
+                booking.slot_id: booking
+                for booking in Booking.objects.filter(
+                    user=user, slot_id__in=slots, booking_status=booking_status, deleted_at__isnull=True
+                )
+            }
+            bookings = [by_slot[item['slot']] for item in items]
+
+        # Capacity was checked under the slot locks: one CASE UPDATE for every counter
+        field = Booking.counter_field_for(booking_status, None)
+        deltas = {}
+        for item in items:
+            deltas.setdefault(item['slot'], {field: 0})[field] += item['attendees_count']
+        Slot.shift_counters(deltas)
+    bump_versions('booking')  # bulk_create skips the post_save signal
+    return bookings, errors
+
+
+def _check_items(user, items, slots, booking_status, now):
+    errors = [{} for _ in items]
+    by_start = []
+    for index, item in enumerate(items):
+        slot = slots.get(item['slot'])
+        if slot is None:
+            errors[index]['slot'] = "Slot not found."
+        elif slot['deleted_at'] is not None:
+            errors[index]['slot'] = "Cannot book a slot that is no longer active."
+        elif slot['is_blocked']:
+            errors[index]['slot'] = "This slot is blocked and cannot be booked."
+        elif item['attendees_count'] > slot['capacity']:
+            errors[index]['attendees_count'] = "Attendees count exceeds slot capacity."
+        else:
+            by_start.append((slot['start_time'], slot['end_time'], index))
+    if not by_start:
+        return errors
+
+    # Held seats count against capacity at once, summed per slot
+    if booking_status == Booking.Status.HELD:
+        requested = {}
+        for _, _, index in by_start:
+            requested[items[index]['slot']] = requested.get(items[index]['slot'], 0) + items[index]['attendees_count']
+        for _, _, index in by_start:
+            slot = slots[items[index]['slot']]
+            if slot['approved_attendees'] + slot['held_attendees'] + requested[slot['pk']] > slot['capacity']:
+                errors[index]['slot'] = "Cannot hold seats: slot capacity exceeded."
+
+    # Overlaps among the requested slots: sweep them in start order
+    by_start.sort()
+    latest = None  # (end_time, index) of the latest-ending item so far
+    for start, end, index in by_start:
+        if latest is not None and latest[0] > start:
+            errors[index].setdefault('slot', f"Overlaps slot {items[latest[1]]['slot']} in this request.")
+        if latest is None or end > latest[0]:
+            latest = (end, index)
+
+    # Overlaps with the user's bookings: one read over the whole requested span
+    existing = list(
+        Booking.overlapping(by_start[0][0], max(end for _, end, _ in by_start), now)
+        .filter(user=user).values_list('slot__start_time', 'slot__end_time')
+    )
+    for start, end, index in by_start:
+        if any(other_start < end and other_end > start for other_start, other_end in existing):
+            errors[index].setdefault('slot', "You already have a booking that overlaps with this time.")
+    return errors
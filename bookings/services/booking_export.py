@@ -0,0 +1,60 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+# Projection used for exports; 'id' must stay first (it is the keyset column)
+EXPORT_FIELDS = ['id', 'user__username', 'event__name', 'slot__start_time', 'booking_status', 'attendees_count']
+EXPORT_HEADERS = ['Booking ID', 'User', 'Event', 'Slot Start', 'Status', 'Attendees']
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """File-like object whose write() just hands the value back (for csv.writer)."""
+
+    def write(self, value):
+        return value
+
+
+def iter_export_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield export tuples in primary key order, fetching `chunk_size` rows per
+    query with WHERE id > last_id. Unlike iterator(), this keeps memory flat
+    on MySQL too, where the driver buffers the whole result set.
+    """
+    rows = queryset.order_by('pk').values_list(*EXPORT_FIELDS)
+    last_pk = None
+    while True:
+        chunk = rows if last_pk is None else rows.filter(pk__gt=last_pk)
+        chunk = list(chunk[:chunk_size])
+        if not chunk:
+            return
+        yield from chunk
+        last_pk = chunk[-1][0]
+
+
+def stream_csv(queryset):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_HEADERS)
+    for row in iter_export_rows(queryset):
+        yield writer.writerow(row)
+
+
+def stream_ndjson(queryset):
+    keys = ['id', 'user', 'event', 'slot_start', 'booking_status', 'attendees_count']
+    for row in iter_export_rows(queryset):
+        yield json.dumps(dict(zip(keys, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+EXPORT_FORMATS = {
+    'csv': (stream_csv, 'text/csv', 'bookings.csv'),
+    'ndjson': (stream_ndjson, 'application/x-ndjson', 'bookings.ndjson'),
+}
+
+
+def streaming_export_response(queryset, export_format='csv'):
+    stream, content_type, filename = EXPORT_FORMATS[export_format]
+    response = StreamingHttpResponse(stream(queryset), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
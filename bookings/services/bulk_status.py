@@ -0,0 +1,132 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from bookings.models.booking_model import Booking
+from slots.models.slot_model import Slot
+
+# Outcome codes reported per booking
+APPLIED = 'applied'
+SKIPPED = 'skipped'
+REJECTED = 'rejected'
+
+BULK_STATUSES = [Booking.Status.APPROVED, Booking.Status.CANCELLED]
+
+
+def bulk_transition(bookings, target_status):
+    """
+    Move the given bookings to `target_status` with set-based statements in
+    one transaction instead of one save() (and full_clean()) per booking.
+
+    Approval groups the bookings by slot, reads each slot's remaining
+    capacity once under a row lock and admits PENDING bookings in FIFO
+    (created_at) order until the slot is full. Unexpired HELD bookings
+    already own their seats and are always admitted. Cancellation releases
+    every active booking. Returns {booking_id: (outcome, reason)} for every
+    selected booking.
+    """
+    if target_status not in BULK_STATUSES:
+        raise ValueError(f"Unsupported bulk status: {target_status}")
+
+    with transaction.atomic():
+        rows = []
+        deleted = []
+        for pk, slot_id, status, attendees_count, held_until, deleted_at in (
+            bookings.select_for_update()
+            .order_by('created_at', 'pk')
+            .values_list('pk', 'slot_id', 'booking_status', 'attendees_count', 'held_until', 'deleted_at')
+        ):
+            if deleted_at is None:
+                rows.append((pk, slot_id, status, attendees_count, held_until))
+            else:
+                deleted.append(pk)
+
+        if target_status == Booking.Status.APPROVED:
+            outcomes, changed = _plan_approvals(rows)
+        else:
+            outcomes, changed = _plan_cancellations(rows)
+        for pk in deleted:
+            outcomes[pk] = (SKIPPED, "Booking is deleted.")
+
+        if changed:
+            deltas = defaultdict(lambda: defaultdict(int))
+            for pk, slot_id, status, attendees_count, _ in changed:
+                before = Booking.counter_field_for(status, None)
+                after = Booking.counter_field_for(target_status, None)
+                if before:
+                    deltas[slot_id][before] -= attendees_count
+                if after:
+                    deltas[slot_id][after] += attendees_count
+
+            Booking.objects.filter(pk__in=[row[0] for row in changed]).update_and_sync(
+                booking_status=target_status, updated_at=timezone.now()
+            )
+            Slot.apply_attendee_deltas(deltas)
+    return outcomes
+
+
+def _plan_approvals(rows):
+    outcomes = {}
+    pending = []
+    now = timezone.now()
+    for row in rows:
+        pk, slot_id, status, attendees_count, held_until = row
+        if status == Booking.Status.PENDING or (status == Booking.Status.HELD and held_until > now):
+            pending.append(row)
+        elif status == Booking.Status.HELD:
+            outcomes[pk] = (REJECTED, "Hold has expired.")
+        else:
+            outcomes[pk] = (SKIPPED, f"Booking is already {status.lower()}.")
+
+    # One locking read for every slot involved, in id order
+    slots = {
+        slot['pk']: slot
+        for slot in Slot.objects.select_for_update()
+        .filter(pk__in={row[1] for row in pending})
+        .order_by('pk')
+        .values('pk', 'capacity', 'approved_attendees', 'held_attendees', 'is_blocked', 'deleted_at')
+    }
+    remaining = {
+        pk: max(slot['capacity'] - slot['approved_attendees'] - slot['held_attendees'], 0)
+        for pk, slot in slots.items()
+    }
+
+    admitted = []
+    for row in pending:  # already in FIFO order
+        pk, slot_id, status, attendees_count, _ = row
+        slot = slots[slot_id]
+        if slot['is_blocked'] or slot['deleted_at'] is not None:
+            outcomes[pk] = (REJECTED, "Slot is blocked or no longer active.")
+        elif status == Booking.Status.HELD:
+            # Its seats are already counted in held_attendees
+            admitted.append(row)
+            outcomes[pk] = (APPLIED, "Approved.")
+        elif attendees_count > remaining[slot_id]:
+            outcomes[pk] = (REJECTED, "Slot capacity exceeded.")
+        else:
+            remaining[slot_id] -= attendees_count
+            admitted.append(row)
+            outcomes[pk] = (APPLIED, "Approved.")
+    return outcomes, admitted
+
+
+def _plan_cancellations(rows):
+    outcomes = {}
+    cancelled = []
+    for row in rows:
+        pk, slot_id, status, attendees_count, _ = row
+        if status in (Booking.Status.CANCELLED, Booking.Status.EXPIRED):
+            outcomes[pk] = (SKIPPED, f"Booking is already {status.lower()}.")
+        else:
+            cancelled.append(row)
+            outcomes[pk] = (APPLIED, "Cancelled.")
+    return outcomes, cancelled
+
+
+def summarize(outcomes):
+    """Count outcomes by code, e.g. {'applied': 10, 'rejected': 2}."""
+    counts = defaultdict(int)
+    for outcome, _ in outcomes.values():
+        counts[outcome] += 1
+    return dict(counts)
@@ -0,0 +1,39 @@
+from django.db import connection, transaction
+from django.utils import timezone
+
+from bookings.models.booking_model import Booking
+
+SWEEP_BATCH_SIZE = 500
+
+
+def expire_holds(batch_size=SWEEP_BATCH_SIZE, now=None):
+    """
+    Expire one batch of overdue holds, oldest first, and release their
+    seats with set-based counter updates. Returns the number expired.
+
+    On MySQL the batch is claimed with SELECT ... FOR UPDATE SKIP LOCKED,
+    so several sweepers (and bookings being approved or cancelled at the
+    same moment) never wait on each other's rows. SQLite has no row locks;
+    there the write transaction itself is exclusive, and the status filter
+    on the update skips rows that changed since they were read.
+    """
+    with transaction.atomic():
+        overdue = Booking.overdue_holds(now).order_by('held_until')
+        if connection.features.has_select_for_update_skip_locked:
+            overdue = overdue.select_for_update(skip_locked=True)
+        ids = list(overdue.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return 0
+        return Booking.objects.filter(pk__in=ids, booking_status=Booking.Status.HELD).update_with_counters(
+            booking_status=Booking.Status.EXPIRED
+        )
+
+
+def sweep_holds(batch_size=SWEEP_BATCH_SIZE, now=None):
+    """Expire every overdue hold, one short transaction per batch. Returns the total."""
+    total = 0
+    while True:
+        expired = expire_holds(batch_size, now)
+        total += expired
+        if expired < batch_size:
+            return total
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import socket
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from bookings.models.idempotency_model import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def ttl():
+    """Seconds a key is honoured; purge_idempotency_keys deletes older ones."""
+    return getattr(settings, 'IDEMPOTENCY_KEY_TTL', 60 * 60 * 24)
+
+
+def expired_before():
+    return timezone.now() - timedelta(seconds=ttl())
+
+
+def owner():
+    """The worker process claiming a key: hostname:pid."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def owner_gone(record):
+    """
+    True only when the process that claimed `record` is known to have died:
+    it ran on this host and its pid no longer exists. A claim held by a
+    live process (however slow its request) or by another host is kept.
+    """
+    host, _, pid = record.owner.rpartition(':')
+    if os.name != 'posix' or host != socket.gethostname() or not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass  # alive, run by another user
+    return False
+
+
+def stored_headers(response):
+    """Headers the view set, to replay with the stored body (DRF sets Content-Type when rendering)."""
+    return {name: value for name, value in response.items() if name.lower() != 'content-type'}
+
+
+def fingerprint(request):
+    """sha256 of the method, path and (canonical JSON) body of a DRF request."""
+    body = json.dumps(request.data, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(f"{request.method} {request.path}\n{body}".encode()).hexdigest()
+
+
+def claim(user, key, request_fingerprint):
+    """
+    Reserve `key` for this request. Returns (record, None) when the request
+    should run, or (None, response) when a stored outcome (or an error) is
+    to be sent instead. The unique (user, key) constraint settles races:
+    only one of several concurrent requests inserts the row.
+    """
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(
+                    user=user, key=key, fingerprint=request_fingerprint, owner=owner()
+                )
+            return record, None
+        except IntegrityError:
+            pass
+
+        record = IdempotencyKey.objects.filter(user=user, key=key).first()
+        if record is None or record.created_at < expired_before() or (
+            record.status_code is None and owner_gone(record)
+        ):
+            # Released by a failed request, expired but not purged yet, or
+            # left in progress by a worker that died mid-request
+            if record is not None:
+                record.delete()
+            continue
+        if record.fingerprint != request_fingerprint:
+            return None, Response(
+                {"message": f"This {HEADER} was already used for a different request."},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        if record.status_code is None:
+            return None, Response(
+                {"message": f"A request with this {HEADER} is still being processed."},
+                status=status.HTTP_409_CONFLICT,
+                headers={'Retry-After': '1'},
+            )
+        return None, Response(record.response_body, status=record.status_code,
+                              headers={**(record.response_headers or {}), 'Idempotent-Replayed': 'true'})
+
+    return None, Response({"message": f"Could not reserve the {HEADER}; retry the request."},
+                          status=status.HTTP_409_CONFLICT, headers={'Retry-After': '1'})
+
+
+def idempotent(view_func):
+    """
+    Honour an Idempotency-Key header on the unsafe methods of a DRF
+    function view: the first request runs and its response is stored, and
+    retries with the same key and body get that response back without
+    running the view (so no booking rows are read or written).
+
+    Server errors and exceptions release the key, so the client can retry.
+    Retries get a 409 while the key is in progress, however long that takes,
+    unless the worker process that claimed it has died (see owner_gone()).
+    Keys are per user and expire after IDEMPOTENCY_KEY_TTL seconds.
+
+    Goes between @permission_classes and the view function, so only
+    authenticated, permitted requests reserve keys.
+    """
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if request.method in SAFE_METHODS or not key:
+            return view_func(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response({"message": f"{HEADER} can be at most {MAX_KEY_LENGTH} characters."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        record, replay = claim(request.user, key, fingerprint(request))
+        if replay is not None:
+            return replay
+        try:
+            response = view_func(request, *args, **kwargs)
+        except Exception:
+            record.delete()
+            raise
+        if response.status_code >= 500:
+            record.delete()
+        else:
+            IdempotencyKey.objects.filter(pk=record.pk).update(
+                status_code=response.status_code, response_body=response.data,
+                response_headers=stored_headers(response),
+            )
+        return response
+    return _wrapped_view
@@ -0,0 +1,167 @@
+import random
+from bisect import bisect_left
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from bookings.models.booking_model import Booking
+from events.models.event_model import Event
+from middleware.response_cache import CATALOG_MODELS, bump_versions
+from search import index as search_index
+from slots.models.slot_model import Slot
+from slots.services import venue_schedule
+from users.models import User
+from venues.models import Venue
+
+
+class PerfDataSeeder:
+    """
+    Bulk-creates a synthetic dataset for benchmarks and EXPLAIN runs.
+
+    Bookings are spread over slots with a Zipf-like skew (`skew` > 0 makes a
+    few hot slots take most bookings). Slot counters are computed while the
+    bookings are generated, and approvals never exceed slot capacity.
+    Rows are inserted with bulk_create in chunks of `chunk_size`; ids are
+    read back afterwards because MySQL's bulk_create does not return them.
+    """
+
+    def __init__(self, venues=10, events_per_venue=10, slots_per_event=20, users=1000,
+                 bookings=10000, skew=1.1, chunk_size=5000, seed=42, tag='perf', log=None):
+        self.venues = venues
+        self.events_per_venue = events_per_venue
+        self.slots_per_event = slots_per_event
+        self.users = users
+        self.bookings = bookings
+        self.skew = skew
+        self.chunk_size = chunk_size
+        self.random = random.Random(seed)
+        self.tag = tag
+        self.log = log or (lambda message: None)
+
+    def run(self):
+        with transaction.atomic():
+            venue_ids = self._seed_venues()
+            event_rows = self._seed_events(venue_ids)
+            slot_rows = self._seed_slots(event_rows)
+            user_ids = self._seed_users()
+            self._seed_bookings(slot_rows, user_ids)
+            # bulk_create sends no signals: index the new rows for ?search=
+            # and the venue schedule, and invalidate the cached catalog responses
+            search_index.rebuild()
+            venue_schedule.rebuild()
+            bump_versions(*CATALOG_MODELS)
+        return {
+            'venues': len(venue_ids),
+            'events': len(event_rows),
+            'slots': len(slot_rows),
+            'users': len(user_ids),
+            'bookings': self.bookings,
+        }
+
+    def _bulk_create(self, model, objects):
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.chunk_size:
+                model.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_create(batch)
+
+    def _seed_venues(self):
+        prefix = f'{self.tag} venue '
+        self._bulk_create(Venue, (
+            Venue(name=f'{prefix}{i}', address=f'{i} Benchmark Road', city=self.random.choice(['Pune', 'Mumbai', 'Delhi']),
+                  state='MH', pincode='411001', capacity=1000)
+            for i in range(self.venues)
+        ))
+        ids = list(Venue.objects.filter(name__startswith=prefix).order_by('pk').values_list('pk', flat=True))
+        self.log(f"venues: {len(ids)}")
+        return ids
+
+    def _seed_events(self, venue_ids):
+        prefix = f'{self.tag} event '
+        today = timezone.now().date()
+        self._bulk_create(Event, (
+            Event(name=f'{prefix}{v}-{e}', venue_id=venue_id, description=f'Synthetic event {e} at venue {v}',
+                  start_date=today + timedelta(days=1), end_date=today + timedelta(days=365))
+            for v, venue_id in enumerate(venue_ids)
+            for e in range(self.events_per_venue)
+        ))
+        rows = list(Event.objects.filter(name__startswith=prefix).order_by('pk').values_list('pk', 'venue_id'))
+        self.log(f"events: {len(rows)}")
+        return rows
+
+    def _seed_slots(self, event_rows):
+        base = timezone.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+        event_ids = [event_id for event_id, _ in event_rows]
+        # Slots at one venue never overlap: each event gets its own hour band
+        self._bulk_create(Slot, (
+            Slot(event_id=event_id, capacity=self.random.choice([20, 50, 100, 200]),
+                 start_time=base + timedelta(hours=(e * self.slots_per_event + s) % (364 * 24)),
+                 end_time=base + timedelta(hours=(e * self.slots_per_event + s) % (364 * 24), minutes=45))
+            for e, event_id in enumerate(event_ids)
+            for s in range(self.slots_per_event)
+        ))
+        rows = []
+        for start in range(0, len(event_ids), 1000):
+            rows.extend(
+                Slot.objects.filter(event_id__in=event_ids[start:start + 1000])
+                .order_by('pk')
+                .values_list('pk', 'event_id', 'capacity')
+            )
+        self.log(f"slots: {len(rows)}")
+        return rows
+
+    def _seed_users(self):
+        prefix = f'{self.tag}-user-'
+        password = make_password(None)  # unusable; hashing millions of passwords is too slow
+        self._bulk_create(User, (
+            User(username=f'{prefix}{i}', email=f'{prefix}{i}@example.com', password=password)
+            for i in range(self.users)
+        ))
+        ids = list(User.objects.filter(username__startswith=prefix).order_by('pk').values_list('pk', flat=True))
+        self.log(f"users: {len(ids)}")
+        return ids
+
+    def _seed_bookings(self, slot_rows, user_ids):
+        if not slot_rows or not user_ids:
+            return
+        # Zipf-like weights over a shuffled slot order: a few slots are hot
+        order = list(range(len(slot_rows)))
+        self.random.shuffle(order)
+        cumulative = list(accumulate(1 / (rank + 1) ** self.skew for rank in range(len(order))))
+        total_weight = cumulative[-1]
+
+        approved = [0] * len(slot_rows)
+        pending = [0] * len(slot_rows)
+        statuses = [Booking.Status.APPROVED] * 6 + [Booking.Status.PENDING] * 3 + [Booking.Status.CANCELLED]
+
+        def generate():
+            for _ in range(self.bookings):
+                index = order[bisect_left(cumulative, self.random.random() * total_weight)]
+                slot_id, event_id, capacity = slot_rows[index]
+                attendees = self.random.randint(1, 4)
+                status = self.random.choice(statuses)
+                if status == Booking.Status.APPROVED:
+                    if approved[index] + attendees > capacity:
+                        status = Booking.Status.PENDING
+                    else:
+                        approved[index] += attendees
+                if status == Booking.Status.PENDING:
+                    pending[index] += attendees
+                yield Booking(user_id=self.random.choice(user_ids), event_id=event_id, slot_id=slot_id,
+                              attendees_count=attendees, booking_status=status)
+
+        self._bulk_create(Booking, generate())
+
+        touched = [
+            Slot(pk=slot_id, approved_attendees=approved[i], pending_attendees=pending[i])
+            for i, (slot_id, _, _) in enumerate(slot_rows)
+            if approved[i] or pending[i]
+        ]
+        Slot.objects.bulk_update(touched, Slot.COUNTER_FIELDS, batch_size=self.chunk_size)
+        self.log(f"bookings: {self.bookings} ({len(touched)} slots booked)")
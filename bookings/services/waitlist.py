@@ -0,0 +1,178 @@
+import logging
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from bookings.models.booking_model import Booking
+from bookings.models.waitlist_model import WaitlistEntry
+from middleware.response_cache import bump_versions
+from slots.models.slot_model import Slot
+from users.models import User
+
+logger = logging.getLogger(__name__)
+
+# Waiting entries considered by one promotion pass
+PROMOTION_BATCH_SIZE = 100
+
+OVERLAP_REASON = "You already have a booking that overlaps with this slot."
+
+
+# ---------------- QUEUE ----------------
+def join(user, slot, attendees_count):
+    """
+    Queue `user` for a full slot. The user row is locked first (as in
+    Booking.save()), so two concurrent joins cannot both pass the
+    one-entry-per-slot check. Raises ValidationError.
+    """
+    with transaction.atomic():
+        User.objects.select_for_update().filter(pk=user.pk).values_list('pk').first()
+        slot = Slot.objects.filter(pk=slot.pk).select_related('event').first()
+        if slot is None or slot.deleted_at is not None or slot.event.deleted_at is not None:
+            raise ValidationError({'slot': "Slot is not available."})
+        if slot.is_blocked:
+            raise ValidationError({'slot': "Slot is blocked."})
+        if attendees_count > slot.capacity:
+            raise ValidationError({'attendees_count': "Attendees exceed the slot capacity."})
+        if slot.remaining_capacity() >= attendees_count:
+            raise ValidationError({'slot': "Slot has free seats; book it directly."})
+        if WaitlistEntry.objects.filter(user=user, slot=slot, status=WaitlistEntry.Status.WAITING).exists():
+            raise ValidationError({'slot': "You are already on this slot's waitlist."})
+        if Booking.overlapping(slot.start_time, slot.end_time).filter(user=user).exists():
+            raise ValidationError({'slot': OVERLAP_REASON})
+        return WaitlistEntry.objects.create(user=user, slot=slot, attendees_count=attendees_count)
+
+
+def leave(user, slot):
+    """Cancel the user's waiting entry for the slot. Returns whether there was one."""
+    return bool(WaitlistEntry.objects.filter(user=user, slot=slot, status=WaitlistEntry.Status.WAITING).update(
+        status=WaitlistEntry.Status.CANCELLED, updated_at=timezone.now()
+    ))
+
+
+def position(entry):
+    """1-based place of a waiting entry in its slot's queue, or None."""
+    if entry.status != WaitlistEntry.Status.WAITING:
+        return None
+    return WaitlistEntry.objects.filter(
+        Q(created_at__lt=entry.created_at) | Q(created_at=entry.created_at, pk__lt=entry.pk),
+        slot_id=entry.slot_id,
+        status=WaitlistEntry.Status.WAITING,
+    ).count() + 1
+
+
+# ---------------- PROMOTION ----------------
+def promote(slot_id, batch_size=PROMOTION_BATCH_SIZE):
+    """
+    Turn the longest-waiting entries of one slot that fit its free seats
+    into APPROVED bookings, in one transaction. Entries are taken first
+    come, first served; one too large for the seats left is skipped, so a
+    smaller entry behind it can still get in.
+
+    Locks follow Booking.save(): the queued users (by pk), then the slot
+    row, so a pass never deadlocks against a booking by one of them.
+    Entries whose user booked an overlapping slot meanwhile are cancelled.
+
+    Returns the number of entries promoted.
+    """
+    candidates = list(
+        WaitlistEntry.objects.filter(slot_id=slot_id, status=WaitlistEntry.Status.WAITING)
+        .order_by('created_at', 'pk').values_list('pk', 'user_id')[:batch_size]
+    )
+    if not candidates:
+        return 0
+
+    now = timezone.now()
+    with transaction.atomic():
+        user_ids = sorted({user_id for _, user_id in candidates})
+        list(User.objects.select_for_update().filter(pk__in=user_ids).order_by('pk').values_list('pk'))
+        slot = (
+            Slot.objects.select_for_update().filter(pk=slot_id, deleted_at__isnull=True, is_blocked=False)
+            .values('event_id', 'capacity', 'approved_attendees', 'held_attendees', 'start_time', 'end_time')
+            .first()
+        )
+        if slot is None:
+            return 0
+        free = slot['capacity'] - slot['approved_attendees'] - slot['held_attendees']
+        if free <= 0:
+            return 0
+
+        # Re-read under the locks: entries may have left or been promoted meanwhile
+        entries = list(
+            WaitlistEntry.objects.select_for_update()
+            .filter(pk__in=[pk for pk, _ in candidates], status=WaitlistEntry.Status.WAITING)
+            .order_by('created_at', 'pk')
+        )
+        busy = set(
+            Booking.overlapping(slot['start_time'], slot['end_time'], now)
+            .filter(user_id__in=user_ids).values_list('user_id', flat=True)
+        )
+
+        promoted, dropped, admitted = [], [], 0
+        for entry in entries:
+            if entry.user_id in busy:
+                dropped.append(entry.pk)
+            elif entry.attendees_count <= free:
+                free -= entry.attendees_count
+                admitted += entry.attendees_count
+                promoted.append(entry)
+                # One booking per user, even if duplicate entries slipped in
+                busy.add(entry.user_id)
+
+        if dropped:
+            WaitlistEntry.objects.filter(pk__in=dropped).update(
+                status=WaitlistEntry.Status.CANCELLED, reason=OVERLAP_REASON, updated_at=now
+            )
+        if not promoted:
+            return 0
+        Booking.objects.bulk_create(
+            Booking(user_id=entry.user_id, event_id=slot['event_id'], slot_id=slot_id,
+                    attendees_count=entry.attendees_count, booking_status=Booking.Status.APPROVED)
+            for entry in promoted
+        )
+        # bulk_create skips Booking.save(): admit the seats with one counter update
+        Slot.apply_attendee_deltas({slot_id: {'approved_attendees': admitted}})
+        WaitlistEntry.objects.filter(pk__in=[entry.pk for entry in promoted]).update(
+            status=WaitlistEntry.Status.PROMOTED, updated_at=now
+        )
+    bump_versions('booking')
+    logger.info("Promoted %d waitlist entries for slot %s", len(promoted), slot_id)
+    return len(promoted)
+
+
+def promote_all():
+    """
+    Catch-up pass over every live slot with waiting entries and free seats
+    (e.g. after a failed pass, or seats freed by raw SQL). Returns the total
+    promoted.
+    """
+    slot_ids = (
+        Slot.objects.filter(
+            waitlistentry__status=WaitlistEntry.Status.WAITING,
+            deleted_at__isnull=True,
+            is_blocked=False,
+            capacity__gt=F('approved_attendees') + F('held_attendees'),
+        )
+        .order_by('pk').values_list('pk', flat=True).distinct()
+    )
+    return sum(promote(slot_id) for slot_id in list(slot_ids))
+
+
+# ---------------- AFTER COMMIT ----------------
+def schedule_promotion(slot_ids):
+    """
+    Promote the slots' waitlists once the current transaction commits, in
+    the same request. A pass that fails is logged, not raised (the release
+    itself has committed); promote_all() catches up on it.
+    """
+    slot_ids = list(dict.fromkeys(slot_ids))
+    transaction.on_commit(lambda: _promote_each(slot_ids))
+
+
+def _promote_each(slot_ids):
+    for slot_id in slot_ids:
+        try:
+            promote(slot_id)
+        except Exception:
+            logger.exception("Waitlist promotion failed for slot %s", slot_id)
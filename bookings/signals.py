@@ -0,0 +1,34 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from bookings.models.booking_model import Booking
+from bookings.services import waitlist
+from middleware.response_cache import bump_versions
+from slots.models.slot_model import Slot, capacity_released
+
+
+@receiver(post_delete, sender=Booking)
+def release_slot_counters(sender, instance, **kwargs):
+    # Hard deletes (admin "delete selected", cascades) bypass Booking.save()
+    counted = getattr(instance, '_counted', None)
+    if counted:
+        slot_id, field, attendees = counted
+        Slot.apply_attendee_deltas({slot_id: {field: -attendees}})
+
+
+@receiver([post_save, post_delete], sender=Booking)
+def invalidate_cached_responses(sender, **kwargs):
+    # Slot responses render capacity figures summed from bookings
+    bump_versions('booking')
+
+
+@receiver(capacity_released, sender=Slot)
+def promote_waitlist(sender, slot_ids, **kwargs):
+    waitlist.schedule_promotion(slot_ids)
+
+
+@receiver(post_save, sender=Slot)
+def promote_waitlist_on_capacity_increase(sender, instance, created, raw=False, **kwargs):
+    loaded = getattr(instance, '_loaded_capacity', None)
+    if not created and not raw and loaded is not None and instance.capacity > loaded:
+        waitlist.schedule_promotion([instance.pk])
@@ -1,12 +1,31 @@
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.utils import timezone
 from django.core.exceptions import ValidationError
-from users.models import User
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from users.models import User, UserRole, RolePermission
 from venues.models import Venue
 from events.models.event_model import Event
 from slots.models.slot_model import Slot
 from bookings.models.booking_model import Booking
+from bookings.models.idempotency_model import IdempotencyKey
+from bookings.models.waitlist_model import WaitlistEntry
+from bookings.services import waitlist
+from bookings.services.booking_export import iter_export_rows
+from bookings.services.bulk_status import bulk_transition, summarize
 from datetime import timedelta
+from unittest import mock
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.core.management.base import CommandError
 
 
 class BookingValidationTests(TestCase):
@@ -74,18 +93,677 @@ class BookingValidationTests(TestCase):
             attendees_count=2,
             booking_status=Booking.Status.APPROVED
         )
+        # Overlapping slots can only be at different venues
+        elsewhere = Event.objects.create(
+            name='Side Summit',
+            venue=Venue.objects.create(name='Side Hall', address='124 Street', city='Pune', state='MH',
+                                       pincode='411001', capacity=100),
+            start_date=self.event.start_date,
+            end_date=self.event.end_date
+        )
         overlapping_slot = Slot.objects.create(
-            event=self.event,
+            event=elsewhere,
             start_time=self.slot.start_time + timedelta(minutes=30),
             end_time=self.slot.end_time + timedelta(minutes=30),
             capacity=10
         )
         booking = Booking(
             user=self.user,
-            event=self.event,
+            event=elsewhere,
             slot=overlapping_slot,
             attendees_count=1,
             booking_status=Booking.Status.PENDING
         )
         with self.assertRaises(ValidationError):
             booking.full_clean()
+
+
+class SlotCounterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='counter', password='pass1234', email='counter@example.com')
+        venue = Venue.objects.create(
+            name='Expo Centre',
+            address='1 Road',
+            city='Pune',
+            state='MH',
+            pincode='411001',
+            capacity=100
+        )
+        self.event = Event.objects.create(
+            name='Expo',
+            venue=venue,
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date()
+        )
+        now = timezone.now()
+        self.slot = Slot.objects.create(
+            event=self.event,
+            start_time=now + timedelta(hours=1),
+            end_time=now + timedelta(hours=2),
+            capacity=10
+        )
+
+    def _book(self, **kwargs):
+        return Booking.objects.create(
+            user=self.user,
+            event=self.event,
+            slot=self.slot,
+            attendees_count=kwargs.pop('attendees_count', 3),
+            **kwargs
+        )
+
+    def test_counters_follow_status_transitions(self):
+        booking = self._book()
+        self.slot.refresh_from_db()
+        self.assertEqual((self.slot.approved_attendees, self.slot.pending_attendees), (0, 3))
+
+        booking.approve()
+        self.slot.refresh_from_db()
+        self.assertEqual((self.slot.approved_attendees, self.slot.pending_attendees), (3, 0))
+        self.assertEqual(self.slot.remaining_capacity(), 7)
+
+        booking.cancel()
+        self.slot.refresh_from_db()
+        self.assertEqual((self.slot.approved_attendees, self.slot.pending_attendees), (0, 0))
+
+    def test_slot_edits_keep_counters_moved_by_concurrent_bookings(self):
+        stale = Slot.objects.get(pk=self.slot.pk)
+        self._book(attendees_count=4).approve()
+
+        # An edit of a copy loaded before the booking (admin form, PATCH)
+        stale.capacity = 6
+        stale.save()
+        self.slot.refresh_from_db()
+        self.assertEqual((self.slot.capacity, self.slot.approved_attendees), (6, 4))
+
+        other_user = User.objects.create_user(username='counter3', password='pass1234', email='counter3@example.com')
+        late = Booking.objects.create(user=other_user, event=self.event, slot=self.slot, attendees_count=3)
+        with self.assertRaisesMessage(ValidationError, "Cannot approve booking: slot capacity exceeded."):
+            late.approve()
+
+    def test_approving_existing_booking_rechecks_capacity(self):
+        first = self._book(attendees_count=6)
+        other_user = User.objects.create_user(username='counter2', password='pass1234', email='counter2@example.com')
+        second = Booking.objects.create(
+            user=other_user,
+            event=self.event,
+            slot=self.slot,
+            attendees_count=6
+        )
+
+        first.approve()
+        with self.assertRaises(ValidationError):
+            second.approve()
+
+        second.refresh_from_db()
+        self.slot.refresh_from_db()
+        self.assertEqual(second.booking_status, Booking.Status.PENDING)
+        self.assertEqual((self.slot.approved_attendees, self.slot.pending_attendees), (6, 6))
+
+    def test_admission_rejects_stale_capacity_check(self):
+        # Simulate a concurrent approval landing after clean() has passed
+        booking = self._book(attendees_count=6)
+        Slot.objects.filter(pk=self.slot.pk).update(approved_attendees=8)
+        booking.booking_status = Booking.Status.APPROVED
+        with self.assertRaises(ValidationError):
+            with transaction.atomic():
+                Slot.apply_attendee_deltas(booking._counter_deltas())
+        self.slot.refresh_from_db()
+        self.assertEqual(self.slot.approved_attendees, 8)
+
+    def test_queryset_update_keeps_counters(self):
+        self._book(booking_status=Booking.Status.APPROVED)
+        Booking.objects.filter(slot=self.slot).update_with_counters(deleted_at=timezone.now())
+        self.slot.refresh_from_db()
+        self.assertEqual(self.slot.approved_attendees, 0)
+
+        Booking.objects.filter(slot=self.slot).update_with_counters(deleted_at=None)
+        self.slot.refresh_from_db()
+        self.assertEqual(self.slot.approved_attendees, 3)
+
+    def test_rebuild_command_repairs_drift(self):
+        self._book(booking_status=Booking.Status.APPROVED)
+        Slot.objects.filter(pk=self.slot.pk).update(approved_attendees=9)
+
+        with self.assertRaises(CommandError):
+            call_command('rebuild_slot_counters', '--check', stdout=StringIO())
+
+        call_command('rebuild_slot_counters', stdout=StringIO())
+        self.slot.refresh_from_db()
+        self.assertEqual(self.slot.approved_attendees, 3)
+
+
+class HotQueryIndexTests(TestCase):
+    def test_hot_queries_use_indexes(self):
+        out = StringIO()
+        call_command('explain_hot_queries', '--seed', '400', '--strict', stdout=out)
+        self.assertIn("Every hot query uses an index.", out.getvalue())
+        self.assertFalse(Booking.objects.exists())
+
+
+class BookingExportTests(TestCase):
+    def setUp(self):
+        role = UserRole.objects.create(name='Customer')
+        RolePermission.objects.create(role=role, module_name='Bookings', is_read=True)
+        self.user = User.objects.create_user(username='exporter', password='pass1234', email='exporter@example.com', role=role)
+        other = User.objects.create_user(username='other', password='pass1234', email='other@example.com')
+        venue = Venue.objects.create(name='Arena', address='1 Road', city='Pune', state='MH', pincode='411001', capacity=100)
+        event = Event.objects.create(name='Concert', venue=venue, start_date=timezone.now().date(), end_date=timezone.now().date())
+        start = timezone.now() + timedelta(hours=1)
+        for i in range(5):
+            slot = Slot.objects.create(
+                event=event,
+                start_time=start + timedelta(hours=i),
+                end_time=start + timedelta(hours=i, minutes=30),
+                capacity=10
+            )
+            Booking.objects.create(user=self.user, event=event, slot=slot, attendees_count=i + 1)
+        Booking.objects.create(user=other, event=event, slot=slot, attendees_count=1)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=str(RefreshToken.for_user(self.user).access_token))
+
+    def test_chunked_rows_cover_queryset_in_pk_order(self):
+        rows = list(iter_export_rows(Booking.objects.all(), chunk_size=2))
+        self.assertEqual([row[0] for row in rows], sorted(Booking.objects.values_list('pk', flat=True)))
+
+    def test_csv_export_is_streamed_and_scoped_to_user(self):
+        response = self.client.get('/api/bookings/export/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'Booking ID,User,Event,Slot Start,Status,Attendees')
+        self.assertEqual(len(lines), 6)
+
+    def test_ndjson_export_applies_booking_list_filters(self):
+        response = self.client.get('/api/bookings/export/?export_format=ndjson&status=cancelled')
+        self.assertEqual(b''.join(response.streaming_content), b'')
+
+        response = self.client.get('/api/bookings/export/?export_format=ndjson')
+        records = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([record['attendees_count'] for record in records], [1, 2, 3, 4, 5])
+        self.assertTrue(all(record['user'] == 'exporter' for record in records))
+
+
+class BulkStatusTests(TestCase):
+    def setUp(self):
+        venue = Venue.objects.create(name='Stadium', address='1 Road', city='Pune', state='MH', pincode='411001', capacity=100)
+        self.event = Event.objects.create(name='Final', venue=venue, start_date=timezone.now().date(), end_date=timezone.now().date())
+        start = timezone.now() + timedelta(hours=1)
+        self.slot = Slot.objects.create(event=self.event, start_time=start, end_time=start + timedelta(hours=1), capacity=10)
+        self.bookings = [
+            Booking.objects.create(
+                user=User.objects.create_user(username=f'fan{i}', password='pass1234', email=f'fan{i}@example.com'),
+                event=self.event,
+                slot=self.slot,
+                attendees_count=4
+            )
+            for i in range(4)
+        ]
+
+    def test_approval_admits_fifo_up_to_capacity(self):
+        with self.assertNumQueries(6):
+            outcomes = bulk_transition(Booking.objects.filter(slot=self.slot), Booking.Status.APPROVED)
+
+        first, second, third, fourth = [outcomes[b.pk][0] for b in self.bookings]
+        self.assertEqual((first, second, third, fourth), ('applied', 'applied', 'rejected', 'rejected'))
+        self.slot.refresh_from_db()
+        self.assertEqual((self.slot.approved_attendees, self.slot.pending_attendees), (8, 8))
+
+    def test_cancellation_releases_counters(self):
+        bulk_transition(Booking.objects.filter(slot=self.slot), Booking.Status.APPROVED)
+        outcomes = bulk_transition(Booking.objects.filter(slot=self.slot), Booking.Status.CANCELLED)
+
+        self.assertEqual(summarize(outcomes), {'applied': 4})
+        self.slot.refresh_from_db()
+        self.assertEqual((self.slot.approved_attendees, self.slot.pending_attendees), (0, 0))
+
+    def test_endpoint_is_staff_only_and_reports_outcomes(self):
+        role = UserRole.objects.create(name='Manager')
+        RolePermission.objects.create(role=role, module_name='Bookings', is_read=True, is_create=True)
+        client = APIClient()
+        member = User.objects.create_user(username='member', password='pass1234', email='member@example.com', role=role)
+        client.credentials(HTTP_AUTHORIZATION=str(RefreshToken.for_user(member).access_token))
+        payload = {'ids': [b.pk for b in self.bookings] + [999999], 'booking_status': 'APPROVED'}
+        self.assertEqual(client.post('/api/bookings/bulk-status/', payload, format='json').status_code, 403)
+
+        staff = User.objects.create_user(username='staff', password='pass1234', email='staff@example.com', role=role, is_staff=True)
+        client.credentials(HTTP_AUTHORIZATION=str(RefreshToken.for_user(staff).access_token))
+        response = client.post('/api/bookings/bulk-status/', payload, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['summary'], {'applied': 2, 'rejected': 2})
+        self.assertEqual(response.data['data']['results'][-1]['reason'], "Booking not found.")
+
+
+class PerfBenchmarkTests(TestCase):
+
+    def test_seeded_counters_match_bookings(self):
+        call_command(
+            'seed_perf_data', '--venues', '2', '--events-per-venue', '2', '--slots-per-event', '5',
+            '--users', '20', '--bookings', '500', stdout=StringIO()
+        )
+        self.assertEqual(Booking.objects.count(), 500)
+        for slot in Slot.objects.all():
+            self.assertLessEqual(slot.approved_attendees, slot.capacity)
+        # Raises CommandError on drift
+        call_command('rebuild_slot_counters', '--check', stdout=StringIO())
+
+    def test_bench_api_saves_and_compares_baseline(self):
+        call_command(
+            'seed_perf_data', '--venues', '1', '--events-per-venue', '2', '--slots-per-event', '3',
+            '--users', '10', '--bookings', '100', stdout=StringIO()
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            roles = dict(User.objects.values_list('pk', 'role_id'))
+            bookings = dict(Booking.objects.values_list('pk', 'booking_status'))
+            counts = [model.objects.count() for model in (UserRole, Venue, Event, Slot)]
+            call_command('bench_api', '--repeat', '2', '--warmup', '0', '--cached',
+                         '--save', path, stdout=StringIO())
+            # Writes went to the fixtures, which are gone; real rows are untouched
+            self.assertEqual(dict(User.objects.values_list('pk', 'role_id')), roles)
+            self.assertEqual(dict(Booking.objects.values_list('pk', 'booking_status')), bookings)
+            self.assertEqual([model.objects.count() for model in (UserRole, Venue, Event, Slot)], counts)
+            call_command('rebuild_slot_counters', '--check', stdout=StringIO())
+            with open(path) as handle:
+                baseline = json.load(handle)
+
+            self.assertIn('GET slots (cached)', baseline['results'])
+            # Every write is undone between runs, so the second run succeeds too
+            for label, result in baseline['results'].items():
+                self.assertIn(result['status'], ([200], [201]), label)
+                self.assertGreater(result['bytes'], 0, label)
+
+            out = StringIO()
+            call_command('bench_api', '--repeat', '1', '--warmup', '0', '--only', 'GET slots',
+                         '--compare', path, stdout=out)
+            self.assertIn('Compared with baseline', out.getvalue())
+
+
+class BookingRaceSimulatorTests(TransactionTestCase):
+
+    # The in-memory test database cannot take concurrent writers, so this
+    # covers the harness and invariant checks; run the command against a
+    # file-based SQLite or MySQL database for real contention.
+    def test_simulator_reports_and_cleans_up(self):
+        out = StringIO()
+        call_command('simulate_booking_race', '--workers', '1', '--users', '12', '--capacity', '6',
+                     '--seed', '1', '--json', stdout=out)
+        report = json.loads(out.getvalue())
+
+        self.assertEqual(report['violations'], [])
+        self.assertLessEqual(report['hot_slot']['approved_attendees'], 6)
+        # One booking per user: the overlapping second booking is refused
+        self.assertEqual(report['bookings_created'], 12)
+        overlap_error = 'book 400 slot: You already have a booking that overlaps with this time.'
+        self.assertEqual(report['errors'][overlap_error], 12)
+        # The throwaway rows are removed again
+        self.assertFalse(Booking.objects.exists())
+
+
+class IdempotencyKeyTests(TestCase):
+    def setUp(self):
+        role = UserRole.objects.create(name='Member')
+        RolePermission.objects.create(role=role, module_name='Bookings', is_read=True, is_create=True)
+        self.user = User.objects.create_user(username='member', password='pass1234', email='member@example.com', role=role)
+        venue = Venue.objects.create(name='Stadium', address='1 Road', city='Pune', state='MH', pincode='411001', capacity=100)
+        self.event = Event.objects.create(name='Final', venue=venue, start_date=timezone.now().date(), end_date=timezone.now().date())
+        start = timezone.now() + timedelta(hours=1)
+        self.slot = Slot.objects.create(event=self.event, start_time=start, end_time=start + timedelta(hours=1), capacity=10)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=str(RefreshToken.for_user(self.user).access_token))
+        self.payload = {'event': self.event.pk, 'slot': self.slot.pk, 'attendees_count': 2}
+
+    def post(self, path, payload=None, key='retry-1'):
+        return self.client.post(path, payload or {}, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_the_stored_response_without_touching_bookings(self):
+        first = self.post('/api/bookings/', self.payload)
+        self.assertEqual(first.status_code, 201)
+
+        with CaptureQueriesContext(connection) as queries:
+            retry = self.post('/api/bookings/', self.payload)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.data['data']['id'], first.data['data']['id'])
+        self.assertFalse([q for q in queries.captured_queries if 'bookings_booking' in q['sql']])
+        self.assertEqual(Booking.objects.filter(user=self.user).count(), 1)
+
+        # Without a key (or with a new one) the request runs again
+        self.assertEqual(self.post('/api/bookings/', self.payload, key='retry-2').status_code, 400)
+
+    def test_cancel_retry_gets_the_first_outcome(self):
+        booking = Booking.objects.create(user=self.user, event=self.event, slot=self.slot, attendees_count=2)
+        path = f'/api/bookings/{booking.pk}/cancel/'
+        self.assertEqual(self.post(path).data['message'], "Booking cancelled successfully")
+        self.assertEqual(self.post(path).data['message'], "Booking cancelled successfully")
+        self.assertEqual(self.post(path, key='retry-2').data['message'], "Booking is already cancelled.")
+
+    def test_reused_key_and_in_flight_requests(self):
+        self.post('/api/bookings/', self.payload)
+        response = self.post('/api/bookings/', dict(self.payload, attendees_count=3))
+        self.assertEqual(response.status_code, 422)
+
+        IdempotencyKey.objects.update(status_code=None, response_body=None)  # first request still running
+        response = self.post('/api/bookings/', self.payload)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response['Retry-After'], '1')
+
+        # A slow first request keeps its key, however old: the claim of a live
+        # worker (or of one on another host) is never taken over
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(self.post('/api/bookings/', self.payload).status_code, 409)
+        IdempotencyKey.objects.update(owner='other-host:1')
+        self.assertEqual(self.post('/api/bookings/', self.payload).status_code, 409)
+
+        # The worker that claimed it died: the retry runs again
+        worker = subprocess.Popen([sys.executable, '-c', ''])
+        worker.wait()
+        IdempotencyKey.objects.update(owner=f'{socket.gethostname()}:{worker.pid}')
+        response = self.post('/api/bookings/', self.payload)
+        self.assertEqual(response.status_code, 400)  # ran: overlaps the first booking
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_replay_includes_the_response_headers(self):
+        RolePermission.objects.filter(module_name='Bookings').update(is_update=True)
+        booking = Booking.objects.create(user=self.user, event=self.event, slot=self.slot, attendees_count=2)
+        path = f'/api/bookings/{booking.pk}/'
+        first = self.client.patch(path, {'attendees_count': 3}, format='json', HTTP_IDEMPOTENCY_KEY='edit-1')
+        self.assertEqual(first.status_code, 200)
+
+        retry = self.client.patch(path, {'attendees_count': 3}, format='json', HTTP_IDEMPOTENCY_KEY='edit-1')
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry['ETag'], first['ETag'])
+
+    def test_expired_keys_run_again_and_are_purged(self):
+        self.post('/api/bookings/', self.payload)
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=2))
+        response = self.post('/api/bookings/', self.payload)
+        self.assertEqual(response.status_code, 400)  # ran again: overlaps the first booking
+        # Raised validation errors release the key instead of storing the outcome
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        cancel = f'/api/bookings/{Booking.objects.get().pk}/cancel/'
+        self.post(cancel, key='old')
+        self.post(cancel, key='fresh')
+        IdempotencyKey.objects.filter(key='old').update(created_at=timezone.now() - timedelta(days=2))
+        out = StringIO()
+        call_command('purge_idempotency_keys', stdout=out)
+        self.assertIn("Deleted 1 expired", out.getvalue())
+        self.assertEqual(list(IdempotencyKey.objects.values_list('key', flat=True)), ['fresh'])
+
+
+class BookingHoldTests(TestCase):
+    def setUp(self):
+        venue = Venue.objects.create(name='Arena', address='1 Road', city='Pune', state='MH', pincode='411001', capacity=100)
+        self.event = Event.objects.create(name='On-sale', venue=venue, start_date=timezone.now().date(), end_date=timezone.now().date())
+        start = timezone.now() + timedelta(hours=1)
+        self.slot = Slot.objects.create(event=self.event, start_time=start, end_time=start + timedelta(hours=1), capacity=10)
+        self.users = [
+            User.objects.create_user(username=f'buyer{i}', password='pass1234', email=f'buyer{i}@example.com')
+            for i in range(3)
+        ]
+
+    def _book(self, user, attendees_count, status=Booking.Status.HELD):
+        return Booking.objects.create(user=user, event=self.event, slot=self.slot, attendees_count=attendees_count,
+                                      booking_status=status)
+
+    def _counters(self):
+        self.slot.refresh_from_db()
+        return self.slot.approved_attendees, self.slot.pending_attendees, self.slot.held_attendees
+
+    def test_holds_take_capacity_until_approved_or_cancelled(self):
+        hold = self._book(self.users[0], 6)
+        self.assertAlmostEqual(hold.held_until, timezone.now() + Booking.hold_ttl(), delta=timedelta(seconds=5))
+        self.assertEqual(self._counters(), (0, 0, 6))
+        self.assertEqual(self.slot.remaining_capacity(), 4)
+
+        with self.assertRaisesMessage(ValidationError, "Cannot hold seats: slot capacity exceeded."):
+            self._book(self.users[1], 5)
+        pending = self._book(self.users[1], 5, status=Booking.Status.PENDING)
+        with self.assertRaisesMessage(ValidationError, "Cannot approve booking: slot capacity exceeded."):
+            pending.approve()
+
+        hold.approve()
+        self.assertEqual(self._counters(), (6, 5, 0))
+        hold.cancel()
+        pending.approve()
+        self.assertEqual(self._counters(), (5, 0, 0))
+
+    def test_sweep_expires_overdue_holds_and_releases_seats(self):
+        overdue = [self._book(self.users[0], 4), self._book(self.users[1], 3)]
+        live = self._book(self.users[2], 2)
+        Booking.objects.filter(pk__in=[b.pk for b in overdue]).update(held_until=timezone.now() - timedelta(seconds=1))
+
+        out = StringIO()
+        call_command('sweep_holds', '--batch-size', '1', stdout=out)
+        self.assertIn("Expired 2 hold(s).", out.getvalue())
+        self.assertEqual(
+            set(Booking.objects.values_list('pk', 'booking_status')),
+            {(overdue[0].pk, Booking.Status.EXPIRED), (overdue[1].pk, Booking.Status.EXPIRED),
+             (live.pk, Booking.Status.HELD)},
+        )
+        self.assertEqual(self._counters(), (0, 0, 2))
+
+    def test_overdue_holds_cannot_be_approved_and_do_not_block_the_user(self):
+        hold = self._book(self.users[0], 4)
+        Booking.objects.filter(pk=hold.pk).update(held_until=timezone.now() - timedelta(seconds=1))
+        hold.refresh_from_db()
+        with self.assertRaisesMessage(ValidationError, "This hold has expired."):
+            hold.approve()
+        outcomes = bulk_transition(Booking.objects.filter(pk=hold.pk), Booking.Status.APPROVED)
+        self.assertEqual(outcomes[hold.pk], ('rejected', "Hold has expired."))
+
+        # A new booking for the same time is not an overlap
+        self._book(self.users[0], 2, status=Booking.Status.PENDING)
+
+    def test_api_creates_holds_through_the_batch_path_only(self):
+        role = UserRole.objects.create(name='Buyer')
+        RolePermission.objects.create(role=role, module_name='Bookings', is_read=True, is_create=True)
+        User.objects.filter(pk=self.users[0].pk).update(role=role)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=str(RefreshToken.for_user(self.users[0]).access_token))
+        payload = {'event': self.event.pk, 'slot': self.slot.pk, 'attendees_count': 2}
+
+        for booking_status in ['EXPIRED', 'HELD']:
+            response = client.post('/api/bookings/', dict(payload, booking_status=booking_status), format='json')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('booking_status', response.data['errors'])
+
+        # Members cannot pick the status of a new booking
+        response = client.post('/api/bookings/', dict(payload, booking_status='APPROVED'), format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['data']['booking_status'], Booking.Status.PENDING)
+        self.assertEqual(self._counters(), (0, 2, 0))
+        client.post(f"/api/bookings/{response.data['data']['id']}/cancel/")
+
+        response = client.post('/api/bookings/batch/', {'items': [{'slot': self.slot.pk, 'attendees_count': 2}],
+                                                         'booking_status': 'HELD'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIsNotNone(response.data['data'][0]['held_until'])
+
+
+class WaitlistTests(TestCase):
+    def setUp(self):
+        role = UserRole.objects.create(name='Member')
+        RolePermission.objects.create(role=role, module_name='Slots', is_read=True, is_create=True, is_delete=True)
+        venue = Venue.objects.create(name='Arena', address='1 Road', city='Pune', state='MH', pincode='411001', capacity=100)
+        self.event = Event.objects.create(name='Sold out', venue=venue, start_date=timezone.now().date(), end_date=timezone.now().date())
+        start = timezone.now() + timedelta(hours=1)
+        self.slot = Slot.objects.create(event=self.event, start_time=start, end_time=start + timedelta(hours=1), capacity=4)
+        self.users = [
+            User.objects.create_user(username=f'fan{i}', password='pass1234', email=f'fan{i}@example.com', role=role)
+            for i in range(4)
+        ]
+        self.booking = Booking.objects.create(user=self.users[0], event=self.event, slot=self.slot,
+                                              attendees_count=4, booking_status=Booking.Status.APPROVED)
+        self.client = APIClient()
+
+    def join(self, user, attendees_count):
+        self.client.credentials(HTTP_AUTHORIZATION=str(RefreshToken.for_user(user).access_token))
+        return self.client.post(f'/api/slots/{self.slot.pk}/waitlist/', {'attendees_count': attendees_count},
+                                format='json')
+
+    def test_join_reports_position_and_rejects_invalid_entries(self):
+        response = self.join(self.users[1], 2)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['data']['position'], response.data['data']['status']), (1, 'WAITING'))
+        self.assertEqual(self.join(self.users[2], 1).data['data']['position'], 2)
+
+        for user, attendees_count, field in [
+            (self.users[1], 1, 'slot'),  # already waiting
+            (self.users[0], 1, 'slot'),  # already booked
+            (self.users[3], 5, 'attendees_count'),  # larger than the slot
+            (self.users[3], 0, 'attendees_count'),
+        ]:
+            with self.subTest(user=user.username, attendees_count=attendees_count):
+                response = self.join(user, attendees_count)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(field, response.data['errors'])
+
+        response = self.client.delete(f'/api/slots/{self.slot.pk}/waitlist/')
+        self.assertEqual(response.status_code, 404)  # users[3] never joined
+        self.client.credentials(HTTP_AUTHORIZATION=str(RefreshToken.for_user(self.users[1]).access_token))
+        self.assertEqual(self.client.delete(f'/api/slots/{self.slot.pk}/waitlist/').status_code, 200)
+        self.assertEqual(WaitlistEntry.objects.get(user=self.users[2]).status, WaitlistEntry.Status.WAITING)
+
+    def test_free_slots_are_booked_directly(self):
+        self.booking.cancel()
+        response = self.join(self.users[1], 2)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors']['slot'], ["Slot has free seats; book it directly."])
+
+    def test_cancellation_promotes_longest_waiting_entries_that_fit(self):
+        self.join(self.users[1], 3)
+        self.join(self.users[2], 2)
+        self.join(self.users[3], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.booking.cancel()
+        # users[1] gets 3 seats; users[2] (2) no longer fits, users[3] (1) does
+        self.assertEqual(
+            dict(WaitlistEntry.objects.values_list('user__username', 'status')),
+            {'fan1': 'PROMOTED', 'fan2': 'WAITING', 'fan3': 'PROMOTED'},
+        )
+        self.assertEqual(
+            set(Booking.objects.filter(booking_status=Booking.Status.APPROVED).values_list('user__username', 'attendees_count')),
+            {('fan1', 3), ('fan3', 1)},
+        )
+        self.slot.refresh_from_db()
+        self.assertEqual(self.slot.approved_attendees, 4)
+
+        # Raising the capacity admits the next entry
+        slot = Slot.objects.get(pk=self.slot.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            slot.capacity = 6
+            slot.save()
+        self.assertEqual(WaitlistEntry.objects.get(user=self.users[2]).status, WaitlistEntry.Status.PROMOTED)
+        self.slot.refresh_from_db()
+        self.assertEqual(self.slot.approved_attendees, 6)
+
+    def test_failed_promotion_is_logged_and_caught_up_by_the_sweep(self):
+        self.join(self.users[1], 2)
+        with mock.patch.object(waitlist, 'promote', side_effect=RuntimeError('database went away')), \
+                self.assertLogs('bookings.services.waitlist', 'ERROR'):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.booking.cancel()
+        self.assertEqual(WaitlistEntry.objects.get().status, WaitlistEntry.Status.WAITING)
+
+        call_command('sweep_holds', stdout=StringIO())
+        self.assertEqual(WaitlistEntry.objects.get().status, WaitlistEntry.Status.PROMOTED)
+
+    def test_expired_holds_promote_and_overlapping_users_are_dropped(self):
+        self.booking.cancel()
+        hold = Booking.objects.create(user=self.users[0], event=self.event, slot=self.slot, attendees_count=4,
+                                      booking_status=Booking.Status.HELD)
+        self.join(self.users[1], 2)
+        self.join(self.users[2], 2)
+        # users[1] books an overlapping slot elsewhere while waiting
+        elsewhere = Event.objects.create(name='Elsewhere', venue=Venue.objects.create(
+            name='Club', address='2 Road', city='Pune', state='MH', pincode='411001', capacity=10),
+            start_date=self.event.start_date, end_date=self.event.end_date)
+        other = Slot.objects.create(event=elsewhere, start_time=self.slot.start_time, end_time=self.slot.end_time,
+                                    capacity=5)
+        Booking.objects.create(user=self.users[1], event=elsewhere, slot=other, attendees_count=1)
+
+        Booking.objects.filter(pk=hold.pk).update(held_until=timezone.now() - timedelta(seconds=1))
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('sweep_holds', stdout=StringIO())
+        self.assertEqual(
+            set(WaitlistEntry.objects.values_list('user__username', 'status', 'reason')),
+            {('fan1', 'CANCELLED', waitlist.OVERLAP_REASON), ('fan2', 'PROMOTED', '')},
+        )
+
+
+class BatchBookingTests(TestCase):
+    def setUp(self):
+        role = UserRole.objects.create(name='Member')
+        RolePermission.objects.create(role=role, module_name='Bookings', is_read=True, is_create=True)
+        self.user = User.objects.create_user(username='attendee', password='pass1234', email='attendee@example.com',
+                                             role=role)
+        venue = Venue.objects.create(name='Campus', address='1 Road', city='Pune', state='MH', pincode='411001', capacity=100)
+        self.event = Event.objects.create(name='Course', venue=venue, start_date=timezone.now().date(), end_date=timezone.now().date())
+        start = timezone.now() + timedelta(days=1)
+        # Consecutive one-hour sessions
+        self.slots = [
+            Slot.objects.create(event=self.event, start_time=start + timedelta(hours=i),
+                                end_time=start + timedelta(hours=i + 1), capacity=5)
+            for i in range(6)
+        ]
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=str(RefreshToken.for_user(self.user).access_token))
+
+    def batch(self, slots, attendees_count=2, **extra):
+        items = [{'slot': slot.pk, 'attendees_count': attendees_count} for slot in slots]
+        return self.client.post('/api/bookings/batch/', dict(extra, items=items), format='json')
+
+    def test_books_every_slot_with_constant_queries(self):
+        self.client.get('/api/bookings/')  # load the role permission matrix
+
+        with CaptureQueriesContext(connection) as one:
+            self.assertEqual(self.batch(self.slots[:1]).status_code, 201)
+        with CaptureQueriesContext(connection) as many:
+            response = self.batch(self.slots[1:], booking_status=Booking.Status.HELD)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(many), len(one))
+
+        self.assertEqual([booking['slot'] for booking in response.data['data']], [slot.pk for slot in self.slots[1:]])
+        self.assertTrue(all(booking['held_until'] for booking in response.data['data']))
+        self.assertEqual(
+            list(Slot.objects.filter(event=self.event).order_by('start_time')
+                 .values_list('pending_attendees', 'held_attendees')),
+            [(2, 0)] + [(0, 2)] * 5,
+        )
+
+    def test_any_failure_rejects_the_whole_batch(self):
+        Slot.objects.filter(pk=self.slots[1].pk).update(is_blocked=True)
+        Slot.objects.filter(pk=self.slots[3].pk).update(held_attendees=4)
+        Booking.objects.create(user=self.user, event=self.event, slot=self.slots[4], attendees_count=1)
+        annex = Event.objects.create(name='Lab', venue=Venue.objects.create(
+            name='Annex', address='2 Road', city='Pune', state='MH', pincode='411001', capacity=100),
+            start_date=self.event.start_date, end_date=self.event.end_date)
+        overlapping = Slot.objects.create(event=annex, start_time=self.slots[0].start_time + timedelta(minutes=30),
+                                          end_time=self.slots[0].end_time + timedelta(minutes=30), capacity=5)
+
+        response = self.batch([self.slots[0], self.slots[1], self.slots[3], self.slots[4], overlapping, self.slots[5]],
+                              booking_status=Booking.Status.HELD)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors']['items'], [
+            {},
+            {'slot': "This slot is blocked and cannot be booked."},
+            {'slot': "Cannot hold seats: slot capacity exceeded."},
+            {'slot': "You already have a booking that overlaps with this time."},
+            {'slot': f"Overlaps slot {self.slots[0].pk} in this request."},
+            {},
+        ])
+        self.assertEqual(Booking.objects.count(), 1)
+        self.assertEqual(Slot.objects.get(pk=self.slots[0].pk).held_attendees, 0)
+
+    def test_invalid_requests(self):
+        for body in [{'items': []}, {'items': [{'slot': self.slots[0].pk, 'attendees_count': 0}]},
+                     {'items': [{'slot': self.slots[0].pk, 'attendees_count': 1}], 'booking_status': 'APPROVED'}]:
+            with self.subTest(body=body):
+                self.assertEqual(self.client.post('/api/bookings/batch/', body, format='json').status_code, 400)
+        response = self.batch([self.slots[0]], attendees_count=6)
+        self.assertEqual(response.data['errors']['items'], [{'attendees_count': "Attendees count exceeds slot capacity."}])
+        with override_settings(BOOKING_BATCH_MAX=2):
+            self.assertIn('items', self.batch(self.slots[:3]).data['errors'])
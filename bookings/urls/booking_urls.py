@@ -1,12 +1,18 @@
 from django.urls import path
 from bookings.views.booking_views import (
     booking_list,
+    booking_batch,
     booking_detail,
-    cancel_booking
+    cancel_booking,
+    export_bookings,
+    bulk_update_status,
 )
 
 urlpatterns = [
     path('', booking_list, name='booking_list'),
+    path('batch/', booking_batch, name='booking_batch'),
+    path('export/', export_bookings, name='export_bookings'),
+    path('bulk-status/', bulk_update_status, name='bulk_update_status'),
     path('<int:pk>/', booking_detail, name='booking_detail'),
     path('<int:pk>/cancel/', cancel_booking, name='cancel_booking'),
 ]
@@ -1,5 +1,8 @@
 from .booking_views import (
     booking_list,
+    booking_batch,
     booking_detail,
     cancel_booking,
+    export_bookings,
+    bulk_update_status,
 )
@@ -1,16 +1,28 @@
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.pagination import PageNumberPagination
+from eventslotbooking_project.pagination import get_paginator
+from eventslotbooking_project.versioning import (
+    VersionConflict, etag, expected_versions, if_match_header, version_conflict_response,
+)
 from django.db.models import Q
 from bookings.models.booking_model import Booking
-from bookings.serializers.booking_serializer import BookingSerializer
+from bookings.serializers.booking_serializer import BookingSerializer, BookingBatchSerializer, BookingBulkStatusSerializer
+from bookings.services.batch_booking import book_slots
+from bookings.services.booking_export import EXPORT_FORMATS, streaming_export_response
+from bookings.services.bulk_status import SKIPPED, bulk_transition, summarize
+from bookings.services.idempotency import HEADER as IDEMPOTENCY_HEADER, idempotent
+from search import index as search_index
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
+# Keyset columns for list pagination: the trailing id breaks ties, so the
+# composite cursor is unique
+BOOKING_LIST_ORDERING = ('-created_at', 'id')
+
 # Swagger example body for Booking
 booking_example = openapi.Schema(
     type=openapi.TYPE_OBJECT,
@@ -22,47 +34,78 @@ booking_example = openapi.Schema(
     }
 )
 
+idempotency_key_header = openapi.Parameter(
+    IDEMPOTENCY_HEADER, openapi.IN_HEADER, type=openapi.TYPE_STRING, required=False,
+    description="Retries with the same key and body get the first response back",
+)
+
+batch_booking_example = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        'items': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT), example=[
+            {'slot': 1, 'attendees_count': 2},
+            {'slot': 2, 'attendees_count': 2},
+        ]),
+        'booking_status': openapi.Schema(type=openapi.TYPE_STRING, example='PENDING'),
+    }
+)
+
+bulk_status_example = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        'ids': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER), example=[1, 2, 3]),
+        'booking_status': openapi.Schema(type=openapi.TYPE_STRING, example='APPROVED'),
+    }
+)
+
+
+def filter_bookings(request):
+    """Bookings visible to request.user, narrowed by the booking_list query params."""
+    user = request.user
+    search = request.GET.get('search', '')
+    status_filter = request.GET.get('status')
+    event_id = request.GET.get('event')
+    timeframe = request.GET.get('timeframe')  # upcoming / past
+
+    bookings = Booking.objects.filter(deleted_at__isnull=True)
+    if not user.is_staff and not user.is_superuser:
+        bookings = bookings.filter(user=user)
+
+    if search_index.has_terms(search):
+        # Name matches on the event or its venue
+        bookings = bookings.filter(
+            Q(event_id__in=search_index.matching('event', search, title_only=True)) |
+            Q(event__venue_id__in=search_index.matching('venue', search, title_only=True))
+        )
+
+    if status_filter:
+        status_value = status_filter.upper()
+        if status_value in Booking.Status.values:
+            bookings = bookings.filter(booking_status=status_value)
+
+    if event_id:
+        bookings = bookings.filter(event_id=event_id)
+
+    if timeframe:
+        now = timezone.now()
+        if timeframe.lower() == 'upcoming':
+            bookings = bookings.filter(slot__start_time__gte=now)
+        elif timeframe.lower() == 'past':
+            bookings = bookings.filter(slot__end_time__lt=now)
+
+    return bookings
+
 
 @swagger_auto_schema(method='get', responses={200: BookingSerializer(many=True)})
-@swagger_auto_schema(method='post', request_body=booking_example)
+@swagger_auto_schema(method='post', request_body=booking_example, manual_parameters=[idempotency_key_header])
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@idempotent
 def booking_list(request):
-    user = request.user
     if request.method == 'GET':
-        search = request.GET.get('search', '')
-        status_filter = request.GET.get('status')
-        event_id = request.GET.get('event')
-        timeframe = request.GET.get('timeframe')  # upcoming / past
-
-        bookings = Booking.objects.filter(deleted_at__isnull=True)
-        if not user.is_staff and not user.is_superuser:
-            bookings = bookings.filter(user=user)
-
-        if search:
-            bookings = bookings.filter(
-                Q(event__name__icontains=search) |
-                Q(slot__event__venue__name__icontains=search)
-            )
-
-        if status_filter:
-            status_value = status_filter.upper()
-            if status_value in Booking.Status.values:
-                bookings = bookings.filter(booking_status=status_value)
-
-        if event_id:
-            bookings = bookings.filter(event_id=event_id)
-
-        if timeframe:
-            now = timezone.now()
-            if timeframe.lower() == 'upcoming':
-                bookings = bookings.filter(slot__start_time__gte=now)
-            elif timeframe.lower() == 'past':
-                bookings = bookings.filter(slot__end_time__lt=now)
-
-        paginator = PageNumberPagination()
-        paginator.page_size = int(request.GET.get('page_size', 10))
-        bookings = bookings.select_related('event', 'slot', 'user')
+        bookings = filter_bookings(request)
+        paginator = get_paginator(request, ordering=BOOKING_LIST_ORDERING)
+        bookings = bookings.select_related('event', 'slot', 'user').order_by(*BOOKING_LIST_ORDERING)
         result_page = paginator.paginate_queryset(bookings, request)
         serializer = BookingSerializer(result_page, many=True)
         return paginator.get_paginated_response({
@@ -80,32 +123,68 @@ def booking_list(request):
     return Response({"message": "Booking creation failed", "errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
 
 
+@swagger_auto_schema(method='post', request_body=batch_booking_example, manual_parameters=[idempotency_key_header])
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@idempotent
+def booking_batch(request):
+    """
+    Book several slots at once, all or nothing: either every booking is
+    created, or none is and each failing item gets its reasons (errors.items
+    lines up with the request's items).
+    """
+    serializer = BookingBatchSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response({"message": "Batch booking failed", "errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    bookings, errors = book_slots(
+        request.user, serializer.validated_data['items'], serializer.validated_data['booking_status']
+    )
+    if not bookings:
+        return Response({"message": "Batch booking failed", "errors": {"items": errors}}, status=status.HTTP_400_BAD_REQUEST)
+    bookings = Booking.objects.filter(pk__in=[booking.pk for booking in bookings]).select_related('event', 'slot')
+    return Response({
+        "message": "Bookings created successfully",
+        "data": BookingSerializer(bookings.order_by('slot__start_time', 'id'), many=True).data
+    }, status=status.HTTP_201_CREATED)
+
+
 @swagger_auto_schema(method='get', responses={200: BookingSerializer()})
-@swagger_auto_schema(method='patch', request_body=booking_example)
+@swagger_auto_schema(method='patch', request_body=booking_example,
+                     manual_parameters=[idempotency_key_header, if_match_header])
 @api_view(['GET', 'PATCH'])
 @permission_classes([IsAuthenticated])
+@idempotent
 def booking_detail(request, pk):
-    booking = get_object_or_404(Booking, pk=pk, deleted_at__isnull=True)
-    if not request.user.is_staff and booking.user != request.user:
+    booking = get_object_or_404(Booking.objects.select_related('event', 'slot'), pk=pk, deleted_at__isnull=True)
+    if not request.user.is_staff and booking.user_id != request.user.pk:
         return Response({"message": "Not authorized to view this booking."}, status=status.HTTP_403_FORBIDDEN)
 
     if request.method == 'GET':
         serializer = BookingSerializer(booking)
-        return Response({"message": "Booking fetched successfully", "data": serializer.data}, status=status.HTTP_200_OK)
+        return Response({"message": "Booking fetched successfully", "data": serializer.data}, status=status.HTTP_200_OK,
+                        headers={'ETag': etag(booking)})
 
     serializer = BookingSerializer(booking, data=request.data, partial=True, context={'request': request})
     if serializer.is_valid():
-        serializer.save()
-        return Response({"message": "Booking updated successfully", "data": serializer.data}, status=status.HTTP_200_OK)
+        # If-Match turns the save into UPDATE ... WHERE version = n
+        booking.expect_versions(expected_versions(request))
+        try:
+            serializer.save()
+        except VersionConflict:
+            return version_conflict_response()
+        return Response({"message": "Booking updated successfully", "data": serializer.data}, status=status.HTTP_200_OK,
+                        headers={'ETag': etag(booking)})
     return Response({"message": "Booking update failed", "errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
 
 
-@swagger_auto_schema(method='post', responses={200: "Booking cancelled"})
+@swagger_auto_schema(method='post', responses={200: "Booking cancelled"}, manual_parameters=[idempotency_key_header])
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@idempotent
 def cancel_booking(request, pk):
-    booking = get_object_or_404(Booking, pk=pk, deleted_at__isnull=True)
-    if not request.user.is_staff and booking.user != request.user:
+    booking = get_object_or_404(Booking.objects.select_related('event', 'slot'), pk=pk, deleted_at__isnull=True)
+    if not request.user.is_staff and booking.user_id != request.user.pk:
         return Response({"message": "Not authorized to cancel this booking."}, status=status.HTTP_403_FORBIDDEN)
 
     if booking.booking_status == Booking.Status.CANCELLED:
@@ -113,3 +192,60 @@ def cancel_booking(request, pk):
 
     booking.cancel()
     return Response({"message": "Booking cancelled successfully"}, status=status.HTTP_200_OK)
+
+
+
+@swagger_auto_schema(
+    method='get',
+    manual_parameters=[
+        openapi.Parameter(
+            'export_format', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+            enum=list(EXPORT_FORMATS), default='csv'
+        ),
+    ],
+    responses={200: "Streamed CSV / NDJSON attachment"}
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_bookings(request):
+    """
+    Stream the bookings booking_list would return (same filters and user
+    scoping) as CSV or NDJSON. Rows are fetched in keyset chunks, so memory
+    stays flat and the first byte is sent before the first query runs.
+    """
+    export_format = request.GET.get('export_format', 'csv').lower()
+    if export_format not in EXPORT_FORMATS:
+        return Response(
+            {"message": f"Unsupported export format. Use one of: {', '.join(EXPORT_FORMATS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return streaming_export_response(filter_bookings(request), export_format)
+
+
+
+@swagger_auto_schema(method='post', request_body=bulk_status_example)
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def bulk_update_status(request):
+    """
+    Staff only: approve or cancel many bookings at once. Approvals are
+    admitted per slot in FIFO order up to the remaining capacity; every
+    booking gets its own outcome in the response.
+    """
+    serializer = BookingBulkStatusSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response({"message": "Bulk status update failed", "errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    ids = serializer.validated_data['ids']
+    outcomes = bulk_transition(
+        Booking.objects.filter(pk__in=ids),
+        serializer.validated_data['booking_status']
+    )
+    results = []
+    for pk in dict.fromkeys(ids):
+        outcome, reason = outcomes.get(pk, (SKIPPED, "Booking not found."))
+        results.append({"id": pk, "outcome": outcome, "reason": reason})
+    return Response({
+        "message": "Bulk status update processed",
+        "data": {"summary": summarize(outcomes), "results": results}
+    }, status=status.HTTP_200_OK)
@@ -1,19 +1,76 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.utils import timezone
 from events.models.event_model import Event
+from slots.admin import SlotAdminForm
 from slots.models.slot_model import Slot
-from middleware.admin_administration_helpers import check_role_permission
+from slots.services import venue_schedule
+from middleware.admin_administration_helpers import check_request_permission
 
 
+class SlotInlineFormSet(forms.BaseInlineFormSet):
+    def clean(self):
+        # SlotAdminForm checks each row against the saved slots; check the
+        # rows of this page against each other too
+        super().clean()
+        rows = sorted(
+            (form.cleaned_data['start_time'], form.cleaned_data['end_time'])
+            for form in self.forms
+            if form.cleaned_data and not form.cleaned_data.get('DELETE')
+            and form.instance.deleted_at is None
+            and form.cleaned_data.get('start_time') and form.cleaned_data.get('end_time')
+        )
+        latest_end = None
+        for start_time, end_time in rows:
+            if latest_end is not None and start_time < latest_end:
+                raise forms.ValidationError("Slots on this page overlap each other.")
+            latest_end = end_time if latest_end is None else max(latest_end, end_time)
+
 
 class SlotInline(admin.TabularInline):
     model = Slot
+    form = SlotAdminForm
+    formset = SlotInlineFormSet
     extra = 1  # Number of empty slots to show by default
-    readonly_fields = ['created_at', 'updated_at', 'deleted_at']
-    fields = ['start_time', 'end_time', 'capacity', 'is_blocked', 'created_at', 'updated_at']
+    readonly_fields = [
+        'booked_capacity_display', 'remaining_capacity_display',
+        'created_at', 'updated_at', 'deleted_at'
+    ]
+    fields = [
+        'start_time', 'end_time', 'capacity', 'booked_capacity_display', 'remaining_capacity_display',
+        'is_blocked', 'created_at', 'updated_at'
+    ]
     can_delete = True
+
+    def booked_capacity_display(self, obj):
+        return obj.booked_capacity() if obj.pk else '-'
+    booked_capacity_display.short_description = "Booked"
+
+    def remaining_capacity_display(self, obj):
+        return obj.remaining_capacity() if obj.pk else '-'
+    remaining_capacity_display.short_description = "Available"
+
+
+class EventAdminForm(forms.ModelForm):
+    class Meta:
+        model = Event
+        fields = '__all__'
+
+    def clean(self):
+        cleaned_data = super().clean()
+        venue = cleaned_data.get('venue')
+        if venue and self.instance.pk and self.instance.deleted_at is None and venue.pk != self.instance.venue_id:
+            conflicts = venue_schedule.event_conflicts(self.instance.pk, venue.pk)
+            if conflicts:
+                raise forms.ValidationError(Event.conflicts_message(conflicts))
+        return cleaned_data
+
+
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
+    form = EventAdminForm
     list_display = ['id', 'name', 'venue', 'description', 'start_date', 'end_date']
     search_fields = ['name', 'description', 'venue__name']
     list_filter = ['venue', 'start_date', 'end_date']
@@ -27,37 +84,68 @@ class EventAdmin(admin.ModelAdmin):
 
     # ---------------- Permission Controls ----------------
     def has_module_permission(self, request):
-        return check_role_permission(request.user, 'Events', 'read')
+        return check_request_permission(request, 'Events', 'read')
 
     def has_view_permission(self, request, obj=None):
-        return check_role_permission(request.user, 'Events', 'read')
+        return check_request_permission(request, 'Events', 'read')
 
     def has_add_permission(self, request):
-        return check_role_permission(request.user, 'Events', 'create')
+        return check_request_permission(request, 'Events', 'create')
 
     def has_change_permission(self, request, obj=None):
-        return check_role_permission(request.user, 'Events', 'update')
+        return check_request_permission(request, 'Events', 'update')
 
     def has_delete_permission(self, request, obj=None):
-        return check_role_permission(request.user, 'Events', 'delete')
+        return check_request_permission(request, 'Events', 'delete')
+
+    # Event.save() and Slot.save() repeat the form checks under the venue
+    # lock; a concurrent write that got in first is reported, not a server error
+    def save_model(self, request, obj, form, change):
+        try:
+            obj.save()
+        except ValidationError as e:
+            self.message_user(request, f"❌ {' '.join(e.messages)}", level=messages.ERROR)
+
+    def save_formset(self, request, form, formset, change):
+        try:
+            with transaction.atomic():
+                super().save_formset(request, form, formset, change)
+        except ValidationError as e:
+            self.message_user(request, f"❌ Slots not saved: {' '.join(e.messages)}", level=messages.ERROR)
 
     # ---------------- Bulk Actions ----------------
     def get_actions(self, request):
         actions = super().get_actions(request)
-        if not check_role_permission(request.user, 'Events', 'delete'):
+        if not check_request_permission(request, 'Events', 'delete'):
             actions.pop('soft_delete_events', None)
-        if not check_role_permission(request.user, 'Events', 'update'):
+        if not check_request_permission(request, 'Events', 'update'):
             actions.pop('restore_events', None)
         return actions
 
     # ---------------- Soft Delete / Restore ----------------
     def soft_delete_events(self, request, queryset):
-        updated = queryset.update(deleted_at=timezone.now())
+        updated = queryset.update_and_sync(deleted_at=timezone.now())
         self.message_user(request, f"{updated} event(s) soft deleted.")
     soft_delete_events.short_description = "Soft delete selected events"
 
     def restore_events(self, request, queryset):
-        updated = queryset.update(deleted_at=None)
-        self.message_user(request, f"{updated} event(s) restored.")
+        # One at a time: save() checks each event's slots against its venue, under the venue lock
+        restored, skipped = 0, []
+        for event in queryset.filter(deleted_at__isnull=False).order_by('pk'):
+            event.deleted_at = None
+            try:
+                event.save(update_fields=['deleted_at', 'updated_at'])
+            except ValidationError:
+                skipped.append(event.pk)
+                continue
+            restored += 1
+        self.message_user(request, f"{restored} event(s) restored.")
+        if skipped:
+            self.message_user(
+                request,
+                f"{len(skipped)} event(s) have slots overlapping other events at their venue and were not restored: "
+                + ', '.join(map(str, skipped)),
+                level=messages.WARNING,
+            )
     restore_events.short_description = "Restore selected events"
 
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_remove_event_end_time_remove_event_start_time_and_more'),
+        ('venues', '0002_venue_deleted_name_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['deleted_at', 'start_date'], name='event_deleted_start_idx'),
+        ),
+    ]
@@ -1,9 +1,11 @@
 # events/models/event_model.py
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
 from venues.models.venue_model import Venue
 from django.utils import timezone
+from eventslotbooking_project.versioning import VersionedModel
 
-class Event(models.Model):
+class Event(VersionedModel):
     name = models.CharField(max_length=255)
     venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='events')
     description = models.TextField(blank=True, null=True)
@@ -13,8 +15,52 @@ class Event(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True)  # soft delete
 
+    SYNC_BY_ID = True
+
     def __str__(self):
         return f"{self.name} - {self.venue.name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_placement = (instance.__dict__.get('venue_id'), instance.__dict__.get('deleted_at') is None)
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Restoring the event or moving it to another venue puts its slots
+        # into that venue's schedule: check them against it under the venue
+        # lock, as Slot.save() does for a single slot
+        if self._state.adding or self.deleted_at is not None or getattr(self, '_loaded_placement', None) == (self.venue_id, True):
+            super().save(*args, **kwargs)
+        else:
+            from slots.services import venue_schedule  # local import to avoid circular dependency
+            with transaction.atomic(using=kwargs.get('using')):
+                venue_schedule.lock_venue(self.venue_id)
+                conflicts = venue_schedule.event_conflicts(self.pk, self.venue_id)
+                if conflicts:
+                    raise ValidationError(self.conflicts_message(conflicts))
+                super().save(*args, **kwargs)
+        self._loaded_placement = (self.venue_id, self.deleted_at is None)
+
+    @classmethod
+    def sync_updated(cls, ids):
+        # local imports to avoid circular dependency
+        from search import index as search_index
+        from slots.models.slot_model import Slot
+        from slots.services import venue_schedule
+        search_index.sync('event', ids)
+        venue_schedule.sync(Slot.objects.filter(event_id__in=ids))
+        super().sync_updated(ids)
+
+    @staticmethod
+    def conflicts_message(conflicts):
+        return "Slots of this event overlap slots of other events at the venue: " + ', '.join(
+            f"{slot_id} with {other_id}" for slot_id, other_id in conflicts
+        )
+
     class Meta:
         db_table = 'event'
+        indexes = [
+            # event_list ordered by start_date
+            models.Index(fields=['deleted_at', 'start_date'], name='event_deleted_start_idx'),
+        ]
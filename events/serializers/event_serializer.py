@@ -1,3 +1,4 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 from django.utils import timezone
 from events.models.event_model import Event
@@ -25,3 +26,10 @@ class EventSerializer(serializers.ModelSerializer):
         if start_date and end_date and start_date > end_date:
             raise serializers.ValidationError("Event start date cannot be after end date.")
         return attrs
+
+    # Event.save() checks a venue move against the new venue's slots, under its lock
+    def update(self, instance, validated_data):
+        try:
+            return super().update(instance, validated_data)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError({'non_field_errors': e.messages})
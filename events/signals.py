@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from middleware.response_cache import bump_versions
+from events.models.event_model import Event
+from slots.models.slot_model import Slot
+from slots.services import venue_schedule
+
+
+@receiver([post_save, post_delete], sender=Event)
+def invalidate_cached_responses(sender, **kwargs):
+    # Saves include soft deletes and restores (deleted_at changes)
+    bump_versions('event')
+
+
+@receiver(post_save, sender=Event)
+def sync_venue_schedule(sender, instance, created, raw=False, **kwargs):
+    # A soft delete, restore or venue change moves all of the event's slots
+    if not created and not raw:
+        venue_schedule.sync(Slot.objects.filter(event=instance))
@@ -1,3 +1,187 @@
+import json
+from datetime import datetime, timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from bookings.models.booking_model import Booking
+from events.models.event_model import Event
+from slots.models.slot_model import Slot
+from users.models import RolePermission, User, UserRole
+from venues.models import Venue
+
+
+class EventAvailabilityTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        role = UserRole.objects.create(name='Member')
+        RolePermission.objects.create(role=role, module_name='Events', is_read=True)
+        cls.user = User.objects.create_user(
+            username='member', password='pass1234', email='member@example.com', role=role
+        )
+        venue = Venue.objects.create(name='Hall', address='Road', city='Pune', state='MH', pincode='411001',
+                                     capacity=100)
+        cls.day = timezone.now().date() + timedelta(days=1)
+        cls.event = Event.objects.create(name='Fair', venue=venue, start_date=cls.day,
+                                         end_date=cls.day + timedelta(days=2))
+
+        def at(days, hour):
+            return timezone.make_aware(datetime.combine(cls.day + timedelta(days=days), datetime.min.time())
+                                       + timedelta(hours=hour))
+
+        cls.morning = Slot.objects.create(event=cls.event, start_time=at(0, 9), end_time=at(0, 10), capacity=10)
+        cls.noon = Slot.objects.create(event=cls.event, start_time=at(0, 12), end_time=at(0, 13), capacity=20)
+        Slot.objects.create(event=cls.event, start_time=at(0, 14), end_time=at(0, 15), capacity=30,
+                            is_blocked=True)
+        Slot.objects.create(event=cls.event, start_time=at(0, 16), end_time=at(0, 17), capacity=40,
+                            deleted_at=timezone.now())
+        Slot.objects.create(event=cls.event, start_time=at(2, 9), end_time=at(2, 10), capacity=5)
+
+        approved = Booking.objects.create(user=cls.user, event=cls.event, slot=cls.morning, attendees_count=4)
+        Booking.objects.filter(pk=approved.pk).update_with_counters(booking_status=Booking.Status.APPROVED)
+        other = User.objects.create_user(username='other', password='pass1234', email='other@example.com',
+                                         role=role)
+        Booking.objects.create(user=other, event=cls.event, slot=cls.noon, attendees_count=3)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=str(RefreshToken.for_user(self.user).access_token))
+        # Load the role permission matrix, so counts measure steady state
+        self.client.get('/api/events/')
+
+    def availability(self, **params):
+        response = self.client.get(f'/api/events/{self.event.pk}/availability/', params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return json.loads(b''.join(response.streaming_content))['data']
+
+    def test_daily_buckets(self):
+        with self.assertNumQueries(3):  # user, event and one grouped aggregate
+            data = self.availability()
+        self.assertEqual((data['from'], data['to'], data['granularity']),
+                         (str(self.day), str(self.day + timedelta(days=2)), 'day'))
+        self.assertEqual(data['buckets'], [
+            {'bucket': str(self.day), 'slots': 3, 'blocked_slots': 1, 'capacity': 30,
+             'approved_attendees': 4, 'pending_attendees': 3, 'held_attendees': 0, 'remaining_capacity': 26},
+            {'bucket': str(self.day + timedelta(days=2)), 'slots': 1, 'blocked_slots': 0, 'capacity': 5,
+             'approved_attendees': 0, 'pending_attendees': 0, 'held_attendees': 0, 'remaining_capacity': 5},
+        ])
+
+    def test_hourly_buckets_within_range(self):
+        data = self.availability(granularity='hour', to=str(self.day))
+        self.assertEqual(
+            [(bucket['slots'], bucket['capacity'], bucket['remaining_capacity']) for bucket in data['buckets']],
+            [(1, 10, 6), (1, 20, 20), (1, 0, 0)],
+        )
+        self.assertEqual(data['buckets'][0]['bucket'], self.morning.start_time.isoformat().replace('+00:00', 'Z'))
+
+    def test_invalid_params(self):
+        path = f'/api/events/{self.event.pk}/availability/'
+        for params, field in [
+            ({'granularity': 'week'}, 'granularity'),
+            ({'from': '2025-02-30'}, 'from'),
+            ({'from': str(self.day), 'to': str(self.day - timedelta(days=1))}, 'to'),
+            ({'from': str(self.day), 'to': str(self.day + timedelta(days=400))}, 'to'),
+        ]:
+            with self.subTest(params=params):
+                response = self.client.get(path, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(field, response.data['errors'])
+
+        self.assertEqual(self.client.get('/api/events/999999/availability/').status_code, 404)
+
+
+class EventGenerateSlotsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        role = UserRole.objects.create(name='Organizer')
+        RolePermission.objects.create(role=role, module_name='Events', is_read=True, is_create=True)
+        cls.user = User.objects.create_user(
+            username='organizer', password='pass1234', email='organizer@example.com', role=role
+        )
+        venue = Venue.objects.create(name='Hall', address='Road', city='Pune', state='MH', pincode='411001',
+                                     capacity=50)
+        cls.day = timezone.now().date() + timedelta(days=1)
+        cls.event = Event.objects.create(name='Clinic', venue=venue, start_date=cls.day,
+                                         end_date=cls.day + timedelta(days=13))
+        cls.existing = Slot.objects.create(
+            event=cls.event,
+            start_time=timezone.make_aware(datetime.combine(cls.day, datetime.min.time()) + timedelta(hours=10)),
+            end_time=timezone.make_aware(datetime.combine(cls.day, datetime.min.time()) + timedelta(hours=11)),
+            capacity=5,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=str(RefreshToken.for_user(self.user).access_token))
+        self.path = f'/api/events/{self.event.pk}/slots/generate/'
+
+    def generate(self, **overrides):
+        rule = {
+            'start_date': str(self.day),
+            'end_date': str(self.day + timedelta(days=6)),
+            'weekdays': list(range(7)),
+            'day_start': '09:00',
+            'day_end': '12:00',
+            'slot_minutes': 45,
+            'gap_minutes': 15,
+            'capacity': 10,
+        }
+        rule.update(overrides)
+        return self.client.post(self.path, rule, format='json')
+
+    def test_dry_run_reports_conflicts_without_writing(self):
+        response = self.generate(dry_run=True)
+        self.assertEqual(response.status_code, 200)
+        data = response.data['data']
+        # 09:00, 10:00 and 11:00 on seven days; 10:00 on the first day is taken
+        self.assertEqual((data['slots'], data['created']), (21, 0))
+        self.assertEqual([conflict['reason'] for conflict in data['conflicts']],
+                         [f'Overlaps slot {self.existing.pk}.'])
+        self.assertEqual(Slot.objects.filter(event=self.event).count(), 1)
+
+    def test_conflicts_fail_unless_skipped(self):
+        response = self.generate()
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.data['errors']['conflicts']), 1)
+        self.assertEqual(Slot.objects.filter(event=self.event).count(), 1)
+
+        response = self.generate(skip_conflicts=True)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['data']['created'], 20)
+        slots = Slot.objects.filter(event=self.event, capacity=10).order_by('start_time')
+        self.assertEqual(slots.count(), 20)
+        self.assertEqual(slots[0].end_time - slots[0].start_time, timedelta(minutes=45))
+
+    def test_weekdays_and_exclusions(self):
+        start = self.day + timedelta(days=1)
+        excluded = start + timedelta(days=7)
+        response = self.generate(start_date=str(start), end_date=str(self.day + timedelta(days=13)),
+                                 weekdays=[start.weekday()], exclude_dates=[str(excluded)], day_end='10:00')
+        self.assertEqual(response.status_code, 201)
+        created = Slot.objects.filter(event=self.event, capacity=10)
+        self.assertEqual([slot.start_time.date() for slot in created], [start])
+
+    def test_generated_slots_overlapping_each_other_are_rejected(self):
+        # The second generation over the same window overlaps the first
+        self.assertEqual(self.generate(start_date=str(self.day + timedelta(days=1))).status_code, 201)
+        response = self.generate(start_date=str(self.day + timedelta(days=1)), dry_run=True)
+        self.assertEqual(len(response.data['data']['conflicts']), response.data['data']['slots'])
 
-# Create your tests here.
+    def test_invalid_rules(self):
+        for overrides, field in [
+            ({'day_end': '08:00'}, 'non_field_errors'),
+            ({'end_date': str(self.day + timedelta(days=30))}, 'non_field_errors'),
+            ({'capacity': 500}, 'non_field_errors'),
+            ({'slot_minutes': 5, 'gap_minutes': 0, 'day_start': '00:00', 'day_end': '23:59'}, 'non_field_errors'),
+            ({'weekdays': [7]}, 'weekdays'),
+        ]:
+            with self.subTest(overrides=overrides):
+                response = self.generate(**overrides)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(field, response.data['errors'])
+        self.assertEqual(self.client.post('/api/events/999999/slots/generate/', {}, format='json').status_code, 404)
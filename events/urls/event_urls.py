@@ -2,9 +2,13 @@ from django.urls import path
 from events.views.event_views import (
     event_list,
     event_detail,
+    event_availability,
+    event_generate_slots,
 )
 
 urlpatterns = [
     path('', event_list, name='event_list'),
     path('<int:pk>/', event_detail, name='event_detail'),
+    path('<int:pk>/availability/', event_availability, name='event_availability'),
+    path('<int:pk>/slots/generate/', event_generate_slots, name='event_generate_slots'),
 ]
@@ -1,4 +1,6 @@
 from .event_views import (
     event_list,
     event_detail,
+    event_availability,
+    event_generate_slots,
 )
@@ -1,6 +1,8 @@
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework import status
 from django.utils import timezone
@@ -8,10 +10,40 @@ from events.models.event_model import Event
 from events.serializers.event_serializer import EventSerializer
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from rest_framework.pagination import PageNumberPagination
-from django.db.models import Q
+from eventslotbooking_project.pagination import get_paginator, query_date
+from eventslotbooking_project.versioning import (
+    VersionConflict, etag, expected_versions, if_match_header, version_conflict_response,
+)
+from middleware.response_cache import cached_response
+from search import index as search_index
+from slots.serializers.slot_serializer import SlotRecurrenceSerializer
+from slots.services.availability import GRANULARITIES, MAX_RANGE_DAYS, stream_availability
+from slots.services.recurrence import SlotRecurrence, generate_slots
+
+# Keyset columns for list pagination: the trailing id breaks ties, so the
+# composite cursor is unique
+EVENT_LIST_ORDERING = ('start_date', 'id')
 
 # Swagger Example Body
+slot_recurrence_example = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        'start_date': openapi.Schema(type=openapi.TYPE_STRING, example='2025-11-20'),
+        'end_date': openapi.Schema(type=openapi.TYPE_STRING, example='2025-12-19'),
+        'weekdays': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER),
+                                   example=[0, 1, 2, 3, 4]),
+        'day_start': openapi.Schema(type=openapi.TYPE_STRING, example='09:00'),
+        'day_end': openapi.Schema(type=openapi.TYPE_STRING, example='17:00'),
+        'slot_minutes': openapi.Schema(type=openapi.TYPE_INTEGER, example=30),
+        'gap_minutes': openapi.Schema(type=openapi.TYPE_INTEGER, example=0),
+        'capacity': openapi.Schema(type=openapi.TYPE_INTEGER, example=20),
+        'exclude_dates': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_STRING),
+                                        example=['2025-12-25']),
+        'dry_run': openapi.Schema(type=openapi.TYPE_BOOLEAN, example=True),
+        'skip_conflicts': openapi.Schema(type=openapi.TYPE_BOOLEAN, example=False),
+    }
+)
+
 event_example = openapi.Schema(
     type=openapi.TYPE_OBJECT,
     properties={
@@ -28,6 +60,7 @@ event_example = openapi.Schema(
 @swagger_auto_schema(method='post', request_body=event_example, responses={201: EventSerializer()})
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticatedOrReadOnly])
+@cached_response('event')
 def event_list(request):
     """
     GET => Public catalog of events
@@ -38,19 +71,20 @@ def event_list(request):
         start_date = request.GET.get('start_date')
         end_date = request.GET.get('end_date')
 
-        events = Event.objects.filter(deleted_at__isnull=True).filter(
-            Q(name__icontains=search_query) |
-            Q(description__icontains=search_query)
-        )
+        events = Event.objects.filter(deleted_at__isnull=True)
+        ordering = EVENT_LIST_ORDERING
+        if search_index.has_terms(search_query):
+            # Full-text matches on name/description, best match first
+            events = search_index.ranked(events, 'event', search_query)
+            ordering = search_index.SEARCH_ORDERING
 
         if start_date:
             events = events.filter(start_date__gte=start_date)
         if end_date:
             events = events.filter(end_date__lte=end_date)
 
-        paginator = PageNumberPagination()
-        paginator.page_size = int(request.GET.get('page_size', 10))
-        result_page = paginator.paginate_queryset(events.order_by('start_date'), request)
+        paginator = get_paginator(request, ordering=ordering)
+        result_page = paginator.paginate_queryset(events.order_by(*ordering), request)
         serializer = EventSerializer(result_page, many=True)
         return paginator.get_paginated_response({
             "message": "Events fetched successfully",
@@ -68,24 +102,120 @@ def event_list(request):
 
 
 @swagger_auto_schema(method='get', responses={200: EventSerializer()})
-@swagger_auto_schema(method='patch', request_body=event_example)
+@swagger_auto_schema(method='patch', request_body=event_example, manual_parameters=[if_match_header])
 @swagger_auto_schema(method='delete', responses={200: "Event deleted successfully"})
 @api_view(['GET', 'PATCH', 'DELETE'])
 @permission_classes([IsAuthenticatedOrReadOnly])
+@cached_response('event')
 def event_detail(request, pk):
     event = get_object_or_404(Event, pk=pk, deleted_at__isnull=True)
 
     if request.method == 'GET':
         serializer = EventSerializer(event)
-        return Response({"message": "Event fetched successfully", "data": serializer.data}, status=status.HTTP_200_OK)
+        return Response({"message": "Event fetched successfully", "data": serializer.data}, status=status.HTTP_200_OK,
+                        headers={'ETag': etag(event)})
 
     if request.method == 'PATCH':
         serializer = EventSerializer(event, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
-            return Response({"message": "Event updated successfully", "data": serializer.data}, status=status.HTTP_200_OK)
+            # If-Match turns the save into UPDATE ... WHERE version = n
+            event.expect_versions(expected_versions(request))
+            try:
+                serializer.save()
+            except VersionConflict:
+                return version_conflict_response()
+            except ValidationError as e:
+                # A venue move that overlaps the new venue's slots (Event.save())
+                return Response({"message": "Event update failed", "errors": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({"message": "Event updated successfully", "data": serializer.data}, status=status.HTTP_200_OK,
+                            headers={'ETag': etag(event)})
         return Response({"message": "Event update failed", "errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
 
     event.deleted_at = timezone.now()
     event.save(update_fields=['deleted_at'])
-    return Response({"message": "Event deleted successfully"}, status=status.HTTP_200_OK)
\ No newline at end of file
+    return Response({"message": "Event deleted successfully"}, status=status.HTTP_200_OK)
+
+
+@swagger_auto_schema(
+    method='get',
+    manual_parameters=[
+        openapi.Parameter('from', openapi.IN_QUERY, type=openapi.TYPE_STRING, format='date',
+                          description="First day (default: event start date)"),
+        openapi.Parameter('to', openapi.IN_QUERY, type=openapi.TYPE_STRING, format='date',
+                          description="Last day, inclusive (default: event end date)"),
+        openapi.Parameter('granularity', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                          enum=list(GRANULARITIES), default='day'),
+    ],
+    responses={200: "Streamed per-day/hour capacity buckets"}
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def event_availability(request, pk):
+    """
+    Capacity calendar for one event: per-bucket slot capacity, approved,
+    pending and held attendees, remaining capacity and blocked slots, from a
+    single grouped query. Streamed, so long events are not built up in memory.
+    """
+    event = get_object_or_404(Event, pk=pk, deleted_at__isnull=True)
+
+    granularity = request.GET.get('granularity', 'day').lower()
+    start_date = query_date(request, 'from', event.start_date)
+    end_date = query_date(request, 'to', event.end_date)
+
+    errors = {}
+    if granularity not in GRANULARITIES:
+        errors['granularity'] = [f"Use one of: {', '.join(GRANULARITIES)}"]
+    if start_date is None:
+        errors['from'] = ["Enter a date as YYYY-MM-DD."]
+    if end_date is None:
+        errors['to'] = ["Enter a date as YYYY-MM-DD."]
+    if start_date and end_date:
+        if start_date > end_date:
+            errors['to'] = ["Must not be before 'from'."]
+        elif (end_date - start_date).days >= MAX_RANGE_DAYS:
+            errors['to'] = [f"The range can span at most {MAX_RANGE_DAYS} days."]
+    if errors:
+        return Response({"message": "Availability request failed", "errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    return StreamingHttpResponse(
+        stream_availability(event.pk, start_date, end_date, granularity),
+        content_type='application/json'
+    )
+
+
+@swagger_auto_schema(method='post', request_body=slot_recurrence_example)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def event_generate_slots(request, pk):
+    """
+    Create an event's slots from a recurrence rule in one request. The rule
+    is expanded in memory, checked against the existing slots with a single
+    range query and inserted with bulk_create. With dry_run nothing is
+    written; conflicts (overlaps, past start times) fail the request unless
+    skip_conflicts is set, in which case only the free slots are created.
+    """
+    event = get_object_or_404(Event.objects.select_related('venue'), pk=pk, deleted_at__isnull=True)
+    serializer = SlotRecurrenceSerializer(data=request.data, context={'event': event})
+    if not serializer.is_valid():
+        return Response({"message": "Slot generation failed", "errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    options = dict(serializer.validated_data)
+    dry_run = options.pop('dry_run')
+    skip_conflicts = options.pop('skip_conflicts')
+    windows, conflicts, created = generate_slots(
+        event, SlotRecurrence(**options), dry_run=dry_run, skip_conflicts=skip_conflicts
+    )
+    data = {
+        "slots": len(windows),
+        "created": created,
+        "conflicts": [
+            {"start_time": windows[index][0], "end_time": windows[index][1], "reason": reason}
+            for index, reason in sorted(conflicts.items())
+        ],
+    }
+    if dry_run:
+        return Response({"message": "Slot generation preview", "data": data}, status=status.HTTP_200_OK)
+    if conflicts and not skip_conflicts:
+        return Response({"message": "Slot generation failed", "errors": {"conflicts": data["conflicts"]}},
+                        status=status.HTTP_400_BAD_REQUEST)
+    return Response({"message": "Slots generated successfully", "data": data}, status=status.HTTP_201_CREATED)
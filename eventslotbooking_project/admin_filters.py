@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+
+def related_list_filter(*related):
+    """
+    RelatedFieldListFilter whose choices are loaded with
+    select_related(*related). The stock filter calls str() on every related
+    object, so a __str__ that follows a foreign key (Slot -> Event -> Venue)
+    costs one query per choice.
+    """
+    class SelectRelatedFieldListFilter(admin.RelatedFieldListFilter):
+        def field_choices(self, field, request, model_admin):
+            ordering = self.field_admin_ordering(field, request, model_admin)
+            queryset = field.related_model._default_manager.select_related(*related).order_by(*ordering)
+            return [(obj.pk, str(obj)) for obj in queryset]
+
+    return SelectRelatedFieldListFilter
@@ -0,0 +1,117 @@
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination
+
+
+class CappedPageNumberPagination(PageNumberPagination):
+    """Default ?page= pagination with a server-side cap on ?page_size=."""
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Opt-in ?cursor= pagination. The cursor holds every ordering column of
+    the row it stopped at, and the next page seeks past it with a composite
+    keyset filter, (a, id) > (x, y) written out as a > x OR (a = x AND
+    id > y), instead of using OFFSET. It skips the COUNT(*), so page N
+    costs the same as page 1, however many rows share a value of `a`.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+    def __init__(self, ordering):
+        self.ordering = ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self._decode_position(self.cursor)
+
+        # A previous-page cursor walks back from its row in flipped order
+        ordering = [self._flipped(field) for field in self.ordering] if reverse else list(self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after(ordering, position))
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+        self.has_next = position is not None if reverse else has_more
+        self.has_previous = has_more if reverse else position is not None
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self._position(self.page[-1])))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=self._position(self.page[0])))
+
+    def _position(self, instance):
+        return json.dumps([str(getattr(instance, field.lstrip('-'))) for field in self.ordering])
+
+    def _decode_position(self, cursor):
+        if cursor is None or cursor.position is None:
+            return None
+        try:
+            position = json.loads(cursor.position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    @staticmethod
+    def _flipped(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def _after(ordering, position):
+        """Rows after `position` in `ordering`, column by column (< on descending columns)."""
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+
+def get_paginator(request, ordering):
+    """
+    Pick the paginator for a list endpoint. Passing ?cursor= (empty for the
+    first page) switches to keyset pagination on `ordering`, which must end
+    in a unique column, such as ('-created_at', 'id').
+    """
+    if 'cursor' in request.query_params:
+        return KeysetCursorPagination(ordering)
+    return CappedPageNumberPagination()
+
+
+def query_date(request, name, default):
+    """A YYYY-MM-DD query param, `default` when absent, None when invalid."""
+    value = request.GET.get(name)
+    if not value:
+        return default
+    try:
+        return parse_date(value)
+    except ValueError:
+        return None
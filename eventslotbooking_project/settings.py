@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 import sys
 from pathlib import Path
 from datetime import timedelta
@@ -48,6 +49,7 @@ INSTALLED_APPS = [
     'events', 
     'slots',
     'bookings',
+    'search',
 
 ]
 ########################################################################
@@ -57,7 +59,8 @@ AUTH_USER_MODEL = "users.User"
 # Django REST Framework configuration
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # Reuses the user RoleAccessMiddleware already authenticated
+        "middleware.authentication.RoleAccessJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
         "rest_framework.authentication.BasicAuthentication",
     ),
@@ -66,6 +69,27 @@ REST_FRAMEWORK = {
     ),
 }
 
+# Upper bound for ?page_size= on every list endpoint
+API_MAX_PAGE_SIZE = 100
+
+# Most slots one POST /api/events/<id>/slots/generate/ may create
+SLOT_GENERATION_MAX = 2000
+
+# Seconds a HELD booking keeps its seats; `manage.py sweep_holds --loop`
+# expires overdue holds and returns the seats to the slot
+BOOKING_HOLD_TTL = 10 * 60
+
+# Most slots one POST /api/bookings/batch/ may book
+BOOKING_BATCH_MAX = 20
+
+# Booking writes sent with an Idempotency-Key header replay their stored
+# response for this long (purge_idempotency_keys deletes older keys)
+IDEMPOTENCY_KEY_TTL = 60 * 60 * 24
+
+# Ranked ?search= lists (events, venues) show at most this many best matches;
+# slot and booking lists filter on every match
+SEARCH_MAX_RESULTS = 1000
+
 # Swagger settings
 SWAGGER_SETTINGS = {
     'USE_SESSION_AUTH': True, 
@@ -100,6 +124,8 @@ TIME_ZONE = "UTC"
 sys.path.append(str(BASE_DIR.parent / "middleware"))
 
 MIDDLEWARE = [
+    # Outermost so it also counts the queries of the middleware below
+    "middleware.query_instrumentation.QueryInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -114,6 +140,11 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = "eventslotbooking_project.urls"
 
+# Per-request query count / SQL time (Server-Timing header + /api/_debug/queries/)
+QUERY_INSTRUMENTATION_ENABLED = False
+QUERY_INSTRUMENTATION_SLOW_QUERIES = 5   # slowest statements kept per endpoint
+QUERY_INSTRUMENTATION_WINDOW = 200       # requests kept per endpoint
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -156,6 +187,67 @@ DATABASES = {
     }
 }
 
+# Local SQLite database (benchmarks, seed_perf_data, comparing commits):
+#   DJANGO_DB_ENGINE=sqlite python manage.py migrate
+# WAL lets readers run alongside the writer and IMMEDIATE takes the write
+# lock up front, so concurrent transactions wait instead of failing.
+if os.environ.get('DJANGO_DB_ENGINE') == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DJANGO_SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': 20,
+            },
+        }
+    }
+
+# Cache (permission matrix, catalog responses). Local memory is per
+# process: with several workers, use the file-based cache so a write in
+# one worker invalidates the others:
+#   DJANGO_CACHE_BACKEND=file DJANGO_CACHE_DIR=/var/tmp/eventslotbooking_cache
+if os.environ.get('DJANGO_CACHE_BACKEND') == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('DJANGO_CACHE_DIR', BASE_DIR / '.cache'),
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
+# Longest a worker keeps its role-permission matrix without rereading it
+# (seconds); a shared cache also reloads it at once on a change
+PERMISSION_MATRIX_TTL = 5
+
+# GET responses of the venue/event/slot endpoints, keyed on the query
+# params and invalidated by model version stamps (middleware/response_cache.py).
+# Only on with the shared file cache: with the per-process default a write
+# would invalidate the worker that made it and no other. Set
+# RESPONSE_CACHE_ENABLED=1 to force it on (e.g. a single worker).
+RESPONSE_CACHE_ENABLED = os.environ.get(
+    'RESPONSE_CACHE_ENABLED', '1' if os.environ.get('DJANGO_CACHE_BACKEND') == 'file' else '0'
+) == '1'
+RESPONSE_CACHE_TIMEOUT = 300
+
+# Identical slot_list/slot_detail cache misses in one worker are computed
+# once and shared; the result is reused for REQUEST_COALESCING_WINDOW
+# seconds, even across writes (0 = share only between concurrent requests).
+# Waiters give up and compute themselves after REQUEST_COALESCING_TIMEOUT.
+REQUEST_COALESCING_WINDOW = 1.0
+REQUEST_COALESCING_TIMEOUT = 10.0
+
+# /swagger/ and /redoc/ (the schema only changes on deploy)
+SCHEMA_CACHE_TIMEOUT = 60 * 15
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,140 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib import admin
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from bookings.models.booking_model import Booking
+from events.models.event_model import Event
+from slots.models.slot_model import Slot
+from users.models import RolePermission, User, UserRole
+from venues.models import Venue
+
+PAGE_SIZES = [1, 10, 100]
+ROWS = 120  # more than the largest page, so every page is full
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False, REQUEST_COALESCING_WINDOW=0)
+class QueryBudgetTests(TestCase):
+    """
+    Fixed query budgets per endpoint. List budgets must hold for every page
+    size: a budget that only fails at page_size=100 is an N+1 query.
+    Response caching is off, so the budgets measure the views themselves.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.role = UserRole.objects.create(name='Member')
+        for module in ['Venues', 'Events', 'Slots', 'Bookings']:
+            RolePermission.objects.create(
+                role=cls.role, module_name=module, is_read=True, is_create=True, is_update=True, is_delete=True
+            )
+        cls.user = User.objects.create_user(
+            username='member', password='pass1234', email='member@example.com', role=cls.role
+        )
+        cls.superuser = User.objects.create_superuser(
+            username='root', password='pass1234', email='root@example.com'
+        )
+
+        today = timezone.now().date()
+        start = timezone.now() + timedelta(days=1)
+        venues = Venue.objects.bulk_create([
+            Venue(name=f'Venue {i}', address='Street', city='Pune', state='MH', pincode='411001', capacity=100)
+            for i in range(ROWS)
+        ])
+        events = Event.objects.bulk_create([
+            Event(name=f'Event {i}', venue=venues[i], start_date=today, end_date=today + timedelta(days=30))
+            for i in range(ROWS)
+        ])
+        slots = Slot.objects.bulk_create([
+            Slot(event=events[i], start_time=start + timedelta(hours=i),
+                 end_time=start + timedelta(hours=i, minutes=30), capacity=10)
+            for i in range(ROWS)
+        ])
+        cls.bookings = [
+            Booking.objects.create(user=cls.user, event=slot.event, slot=slot, attendees_count=1)
+            for slot in slots
+        ]
+        cls.venue, cls.event, cls.slot = venues[0], events[0], slots[0]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=str(RefreshToken.for_user(self.user).access_token))
+        # Load the role permission matrix, so budgets measure steady state
+        self.client.get('/api/venues/')
+
+    def assertQueryBudget(self, budget, method, path, data=None, status=200):
+        with self.assertNumQueries(budget):
+            response = getattr(self.client, method)(path, data, format='json')
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, status, getattr(response, 'data', None))
+        return response
+
+    def assertListBudget(self, budget, path):
+        for page_size in PAGE_SIZES:
+            with self.subTest(page_size=page_size):
+                response = self.assertQueryBudget(budget, 'get', f'{path}?page_size={page_size}')
+                self.assertEqual(len(response.data['results']['data']), page_size)
+
+    # ---------------- API ----------------
+    def test_booking_list(self):
+        # user, count, page
+        self.assertListBudget(3, '/api/bookings/')
+
+    def test_booking_detail(self):
+        # user, booking joined to event and slot
+        self.assertQueryBudget(2, 'get', f'/api/bookings/{self.bookings[0].pk}/')
+
+    def test_cancel_booking(self):
+        # user, booking, full_clean() FK checks, then the booking and counter UPDATEs
+        self.assertQueryBudget(9, 'post', f'/api/bookings/{self.bookings[0].pk}/cancel/')
+
+    def test_slot_list(self):
+        self.assertListBudget(3, '/api/slots/')
+
+    def test_slot_detail(self):
+        self.assertQueryBudget(2, 'get', f'/api/slots/{self.slot.pk}/')
+
+    def test_event_list(self):
+        self.assertListBudget(3, '/api/events/')
+
+    def test_event_detail(self):
+        self.assertQueryBudget(2, 'get', f'/api/events/{self.event.pk}/')
+
+    def test_venue_list(self):
+        self.assertListBudget(3, '/api/venues/')
+
+    def test_venue_detail(self):
+        self.assertQueryBudget(2, 'get', f'/api/venues/{self.venue.pk}/')
+
+    def test_register(self):
+        self.client.credentials()
+        self.assertQueryBudget(6, 'post', '/api/auth/register/', {
+            'username': 'newcomer', 'first_name': 'New', 'last_name': 'Comer', 'email': 'new@example.com',
+            'role': 'Member', 'password': 'S3cure-pass!',
+        }, status=201)
+
+    def test_login(self):
+        self.client.credentials()
+        self.assertQueryBudget(2, 'post', '/api/auth/login/', {'username': 'member', 'password': 'pass1234'})
+
+    # ---------------- ADMIN ----------------
+    def assertChangelistBudget(self, budget, model, url):
+        self.client.force_login(self.superuser)
+        model_admin = admin.site._registry[model]
+        for page_size in PAGE_SIZES:
+            with self.subTest(page_size=page_size), mock.patch.object(model_admin, 'list_per_page', page_size):
+                response = self.assertQueryBudget(budget, 'get', url)
+                self.assertEqual(len(response.context['cl'].result_list), page_size)
+
+    def test_booking_admin_changelist(self):
+        # session, user, event/slot/user filter choices, count, page
+        self.assertChangelistBudget(7, Booking, '/admin/bookings/booking/')
+
+    def test_slot_admin_changelist(self):
+        # session, user, event filter choices, count, page, capacity filter choices
+        self.assertChangelistBudget(6, Slot, '/admin/slots/slot/')
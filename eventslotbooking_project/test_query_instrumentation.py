@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from bookings.models.booking_model import Booking
+from events.models.event_model import Event
+from middleware.query_instrumentation import query_stats
+from slots.models.slot_model import Slot
+from users.models import RolePermission, User, UserRole
+from venues.models import Venue
+
+
+@override_settings(QUERY_INSTRUMENTATION_ENABLED=True)
+class QueryInstrumentationTests(TestCase):
+    def setUp(self):
+        query_stats.clear()
+        role = UserRole.objects.create(name='Viewer')
+        for module in ['Venues', 'Bookings']:
+            RolePermission.objects.create(role=role, module_name=module, is_read=True)
+        self.user = User.objects.create_user(username='viewer', password='pass1234', email='viewer@example.com',
+                                             role=role)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=str(RefreshToken.for_user(self.user).access_token))
+
+    def endpoints(self):
+        staff = User.objects.create_user(username='staff', password='pass1234', email='staff@example.com', is_staff=True)
+        client = APIClient()
+        client.force_login(staff)
+        response = client.get('/api/_debug/queries/')
+        self.assertEqual(response.status_code, 200)
+        return {row['endpoint']: row for row in response.data['data']}
+
+    def test_server_timing_header_and_stats_table(self):
+        response = self.client.get('/api/venues/')
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('queries', response['Server-Timing'])
+
+        endpoints = self.endpoints()
+        self.assertIn('GET /api/venues/', endpoints)
+        self.assertGreater(endpoints['GET /api/venues/']['avg_queries'], 0)
+
+    def test_streamed_bodies_are_counted_until_consumed(self):
+        venue = Venue.objects.create(name='Arena', address='1 Road', city='Pune', state='MH', pincode='411001',
+                                     capacity=100)
+        event = Event.objects.create(name='Concert', venue=venue, start_date=timezone.now().date(),
+                                     end_date=timezone.now().date() + timedelta(days=1))
+        start = timezone.now() + timedelta(hours=1)
+        slot = Slot.objects.create(event=event, start_time=start, end_time=start + timedelta(minutes=30), capacity=10)
+        Booking.objects.create(user=self.user, event=event, slot=slot, attendees_count=1)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/bookings/export/')
+            before_body = len(queries)
+            b''.join(response.streaming_content)
+        total = len(queries)
+        self.assertIn(f'{before_body} queries, 0 repeated before streaming', response['Server-Timing'])
+        # The export reads its rows while the body is sent
+        self.assertGreater(total, before_body)
+        self.assertEqual(self.endpoints()['GET /api/bookings/export/']['max_queries'], total)
+
+    def test_stats_endpoints_are_staff_only(self):
+        for path in ['/api/_debug/queries/', '/api/_debug/coalescing/']:
+            self.assertIn(self.client.get(path).status_code, (401, 403))
+            self.client.force_login(self.user)
+            self.assertEqual(self.client.get(path).status_code, 403)
+            self.client.logout()
+        # Only the exact paths skip the role check
+        self.client.credentials()
+        self.assertEqual(self.client.get('/api/venues/?next=/api/_debug/queries/').status_code, 401)
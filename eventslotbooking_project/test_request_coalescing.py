@@ -0,0 +1,175 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import AsyncClient, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from bookings.models.booking_model import Booking
+from events.models.event_model import Event
+from middleware.request_coalescing import SingleFlight, coalesced_reads
+from slots.models.slot_model import Slot
+from users.models import RolePermission, User, UserRole
+from venues.models import Venue
+
+THREADS = 8
+
+
+class SingleFlightTests(SimpleTestCase):
+    def run_concurrently(self, flight, fn, window=0):
+        barrier = threading.Barrier(THREADS)
+
+        def call():
+            barrier.wait()
+            return flight.do('key', fn, window=window, timeout=5)
+
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            return [future.result() for future in [executor.submit(call) for _ in range(THREADS)]]
+
+    def test_concurrent_calls_share_one_computation(self):
+        flight = SingleFlight()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'value'
+
+        self.assertEqual(self.run_concurrently(flight, fn), ['value'] * THREADS)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.snapshot(), {'computed': 1, 'coalesced': THREADS - 1, 'fresh': 0, 'in_flight': 0})
+
+    def test_unshareable_results_are_computed_by_each_caller(self):
+        flight = SingleFlight()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            time.sleep(0.05)
+            return None
+
+        self.run_concurrently(flight, fn)
+        self.assertEqual(len(calls), THREADS)
+
+    def test_waiters_recompute_when_the_leader_fails(self):
+        flight = SingleFlight()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            time.sleep(0.1)
+            if len(calls) == 1:
+                raise RuntimeError('first call fails')
+            return 'value'
+
+        barrier = threading.Barrier(2)
+
+        def call():
+            barrier.wait()
+            try:
+                return flight.do('key', fn, timeout=5)
+            except RuntimeError:
+                return 'failed'
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = sorted(future.result() for future in [executor.submit(call) for _ in range(2)])
+        self.assertEqual(results, ['failed', 'value'])
+
+    def test_freshness_window(self):
+        flight = SingleFlight()
+        values = iter(['first', 'second'])
+
+        self.assertEqual(flight.do('key', lambda: next(values), window=0.2), 'first')
+        self.assertEqual(flight.do('key', lambda: next(values), window=0.2), 'first')
+        time.sleep(0.25)
+        self.assertEqual(flight.do('key', lambda: next(values), window=0.2), 'second')
+        self.assertEqual(flight.snapshot()['fresh'], 1)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True)
+class SlotReadCoalescingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        role = UserRole.objects.create(name='Member')
+        RolePermission.objects.create(role=role, module_name='Slots', is_read=True)
+        cls.user = User.objects.create_user(
+            username='member', password='pass1234', email='member@example.com', role=role, is_staff=True
+        )
+        venue = Venue.objects.create(name='Hall', address='Road', city='Pune', state='MH', pincode='411001',
+                                     capacity=100)
+        today = timezone.now().date()
+        cls.event = Event.objects.create(name='Launch', venue=venue, start_date=today,
+                                         end_date=today + timedelta(days=2))
+        start = timezone.now() + timedelta(days=1)
+        cls.slot = Slot.objects.create(event=cls.event, start_time=start, end_time=start + timedelta(hours=1),
+                                       capacity=10)
+
+    def setUp(self):
+        cache.clear()
+        coalesced_reads.clear()
+        self.addCleanup(coalesced_reads.clear)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=str(RefreshToken.for_user(self.user).access_token))
+
+    def booked_capacity(self):
+        return self.client.get(f'/api/slots/{self.slot.pk}/').data['data']['booked_capacity']
+
+    def approve_booking(self):
+        booking = Booking.objects.create(user=self.user, event=self.event, slot=self.slot, attendees_count=2)
+        Booking.objects.filter(pk=booking.pk).update_with_counters(booking_status=Booking.Status.APPROVED)
+
+    @override_settings(REQUEST_COALESCING_WINDOW=60)
+    def test_window_serves_across_writes(self):
+        self.assertEqual(self.booked_capacity(), 0)
+        self.approve_booking()
+        # Within the window the computed result is reused despite the write
+        self.assertEqual(self.booked_capacity(), 0)
+        self.assertEqual(coalesced_reads.snapshot()['fresh'], 1)
+
+        coalesced_reads.clear()
+        self.assertEqual(self.booked_capacity(), 2)
+
+    @override_settings(REQUEST_COALESCING_WINDOW=0)
+    def test_no_window_reads_the_write(self):
+        self.assertEqual(self.booked_capacity(), 0)
+        self.approve_booking()
+        self.assertEqual(self.booked_capacity(), 2)
+
+    async def test_asgi_burst_is_computed_once(self):
+        # Under ASGI the sync views run one at a time on one thread: nothing
+        # waits on a leader, the requests after the first hit the response
+        # cache (or the window) instead
+        client = AsyncClient()
+        headers = {'Authorization': str(RefreshToken.for_user(self.user).access_token)}
+        path = f'/api/slots/{self.slot.pk}/'
+        responses = await asyncio.gather(*(client.get(path, headers=headers) for _ in range(THREADS)))
+
+        self.assertEqual([response.status_code for response in responses], [200] * THREADS)
+        self.assertEqual(len({response['ETag'] for response in responses}), 1)
+        self.assertEqual(coalesced_reads.snapshot(), {'computed': 1, 'coalesced': 0, 'fresh': 0, 'in_flight': 0})
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+                       REQUEST_COALESCING_WINDOW=60)
+    async def test_asgi_burst_missing_the_cache_is_served_from_the_window(self):
+        client = AsyncClient()
+        headers = {'Authorization': str(RefreshToken.for_user(self.user).access_token)}
+        responses = await asyncio.gather(*(client.get('/api/slots/', {'event': self.event.pk}, headers=headers)
+                                           for _ in range(THREADS)))
+
+        self.assertEqual([response.status_code for response in responses], [200] * THREADS)
+        self.assertEqual(coalesced_reads.snapshot(), {'computed': 1, 'coalesced': 0, 'fresh': THREADS - 1,
+                                                      'in_flight': 0})
+
+    def test_stats_endpoint(self):
+        self.client.get('/api/slots/', {'event': self.event.pk})
+        self.client.credentials()
+        self.client.force_login(self.user)
+        response = self.client.get('/api/_debug/coalescing/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['computed'], 1)
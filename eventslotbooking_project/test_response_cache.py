@@ -0,0 +1,146 @@
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.contrib import admin
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from bookings.models.booking_model import Booking
+from bookings.services.batch_booking import book_slots
+from events.models.event_model import Event
+from middleware.request_coalescing import coalesced_reads
+from slots.models.slot_model import Slot
+from users.models import RolePermission, User, UserRole
+from venues.models import Venue
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True, REQUEST_COALESCING_WINDOW=0)
+class ResponseCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.role = UserRole.objects.create(name='Member')
+        for module in ['Venues', 'Events', 'Slots', 'Bookings']:
+            RolePermission.objects.create(
+                role=cls.role, module_name=module, is_read=True, is_create=True, is_update=True, is_delete=True
+            )
+        cls.user = User.objects.create_user(
+            username='member', password='pass1234', email='member@example.com', role=cls.role, is_staff=True
+        )
+        cls.venue = Venue.objects.create(
+            name='Town Hall', address='Main Road', city='Pune', state='MH', pincode='411001', capacity=100
+        )
+        today = timezone.now().date()
+        cls.event = Event.objects.create(name='Expo', venue=cls.venue, start_date=today,
+                                         end_date=today + timedelta(days=5))
+        start = timezone.now() + timedelta(days=1)
+        cls.slot = Slot.objects.create(event=cls.event, start_time=start,
+                                       end_time=start + timedelta(hours=1), capacity=10)
+
+    def setUp(self):
+        cache.clear()
+        coalesced_reads.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=str(RefreshToken.for_user(self.user).access_token))
+        # Load the role permission matrix, so counts measure steady state
+        self.client.get('/api/bookings/')
+
+    def test_repeat_reads_skip_the_view_queries(self):
+        first = self.client.get('/api/venues/', {'city': 'Pune', 'page_size': 5})
+        self.assertEqual(first.status_code, 200)
+        # Only the role middleware's user lookup is left
+        with self.assertNumQueries(1):
+            second = self.client.get('/api/venues/?page_size=5&city=Pune')
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get(f'/api/events/{self.event.pk}/')['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/events/{self.event.pk}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        self.client.patch(f'/api/events/{self.event.pk}/', {'name': 'Expo 2'}, format='json')
+        response = self.client.get(f'/api/events/{self.event.pk}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['name'], 'Expo 2')
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_writes_invalidate_cached_lists(self):
+        self.assertEqual(len(self.client.get('/api/venues/').data['results']['data']), 1)
+        self.client.post('/api/venues/', {
+            'name': 'Annex', 'address': 'Side Road', 'city': 'Pune', 'state': 'MH', 'pincode': '411002',
+            'capacity': 50,
+        }, format='json')
+        self.assertEqual(len(self.client.get('/api/venues/').data['results']['data']), 2)
+
+    def test_admin_update_actions_invalidate(self):
+        self.assertEqual(len(self.client.get('/api/slots/').data['results']['data']), 1)
+
+        request = RequestFactory().post('/')
+        request.user = User.objects.create_superuser(username='root', password='pass1234', email='root@example.com')
+        request._messages = type('Messages', (), {'add': lambda *args, **kwargs: None})()
+        admin.site._registry[Slot].soft_delete_slots(request, Slot.objects.filter(pk=self.slot.pk))
+
+        self.assertEqual(self.client.get('/api/slots/').data['results']['data'], [])
+
+    def test_booking_writes_refresh_slot_capacity(self):
+        path = f'/api/slots/{self.slot.pk}/'
+        self.assertEqual(self.client.get(path).data['data']['booked_capacity'], 0)
+
+        booking = Booking.objects.create(user=self.user, event=self.event, slot=self.slot, attendees_count=3)
+        Booking.objects.filter(pk=booking.pk).update_with_counters(booking_status=Booking.Status.APPROVED)
+
+        self.assertEqual(self.client.get(path).data['data']['booked_capacity'], 3)
+
+    def test_batch_holds_refresh_slot_capacity(self):
+        path = f'/api/slots/{self.slot.pk}/'
+        self.assertEqual(self.client.get(path).data['data']['booked_capacity'], 0)
+
+        # bulk_create skips the booking signals; the counter update invalidates
+        book_slots(self.user, [{'slot': self.slot.pk, 'attendees_count': 2}], Booking.Status.HELD)
+
+        self.assertEqual(self.client.get(path).data['data']['booked_capacity'], 2)
+
+    def test_booking_writes_that_leave_the_counters_keep_slot_entries(self):
+        booking = Booking.objects.create(user=self.user, event=self.event, slot=self.slot, attendees_count=3)
+        path = f'/api/slots/{self.slot.pk}/'
+        self.client.get(path)
+
+        Booking.objects.filter(pk=booking.pk).update_and_sync(updated_at=timezone.now())
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(path).status_code, 200)
+
+    def test_errors_are_not_cached(self):
+        self.assertEqual(self.client.get('/api/venues/999999/').status_code, 404)
+        venue = Venue.objects.create(pk=999999, name='Late', address='Road', city='Pune', state='MH',
+                                     pincode='411001', capacity=10)
+        self.assertEqual(self.client.get(f'/api/venues/{venue.pk}/').status_code, 200)
+
+    @override_settings(RESPONSE_CACHE_ENABLED=False)
+    def test_disabled(self):
+        self.client.get('/api/venues/')
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/venues/')
+        self.assertNotIn('ETag', response)
+
+
+class FileBasedResponseCacheTests(ResponseCacheTests):
+    """The same behaviour on the file-based backend (shared between processes)."""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        settings_override = override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': directory,
+        }})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        super().setUp()
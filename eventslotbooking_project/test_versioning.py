@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from bookings.models.booking_model import Booking
+from events.models.event_model import Event
+from slots.models.slot_model import Slot
+from users.models import RolePermission, User, UserRole
+from venues.models import Venue
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True, REQUEST_COALESCING_WINDOW=0)
+class OptimisticConcurrencyTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        role = UserRole.objects.create(name='Editor')
+        for module in ['Venues', 'Events', 'Slots', 'Bookings']:
+            RolePermission.objects.create(role=role, module_name=module, is_read=True, is_update=True)
+        cls.user = User.objects.create_user(
+            username='editor', password='pass1234', email='editor@example.com', role=role, is_staff=True
+        )
+        cls.venue = Venue.objects.create(
+            name='Town Hall', address='Main Road', city='Pune', state='MH', pincode='411001', capacity=100
+        )
+        today = timezone.now().date()
+        cls.event = Event.objects.create(name='Expo', venue=cls.venue, start_date=today,
+                                         end_date=today + timedelta(days=5))
+        start = timezone.now() + timedelta(days=1)
+        cls.slot = Slot.objects.create(event=cls.event, start_time=start,
+                                       end_time=start + timedelta(hours=1), capacity=10)
+        cls.booking = Booking.objects.create(user=cls.user, event=cls.event, slot=cls.slot, attendees_count=2)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=str(RefreshToken.for_user(self.user).access_token))
+
+    def test_if_match_detects_concurrent_edits(self):
+        for path, body, model in [
+            (f'/api/venues/{self.venue.pk}/', {'name': 'Annex'}, Venue),
+            (f'/api/events/{self.event.pk}/', {'name': 'Expo 2'}, Event),
+            (f'/api/slots/{self.slot.pk}/', {'capacity': 12}, Slot),
+            (f'/api/bookings/{self.booking.pk}/', {'attendees_count': 3}, Booking),
+        ]:
+            with self.subTest(path=path):
+                etag = self.client.get(path)['ETag']
+                self.assertTrue(etag.startswith('"1'))
+
+                response = self.client.patch(path, body, format='json', HTTP_IF_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['ETag'], '"2"')
+
+                # A second editor still holding the first ETag loses
+                response = self.client.patch(path, body, format='json', HTTP_IF_MATCH=etag)
+                self.assertEqual(response.status_code, 412)
+                self.assertEqual(model.objects.get(pk=response.wsgi_request.resolver_match.kwargs['pk']).version, 2)
+
+                # Without If-Match the update still goes through
+                self.assertEqual(self.client.patch(path, body, format='json')['ETag'], '"3"')
+
+    def test_slot_etag_tracks_bookings_but_if_match_only_the_version(self):
+        path = f'/api/slots/{self.slot.pk}/'
+        etag = self.client.get(path)['ETag']
+        self.assertEqual(self.client.get(path, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # A booking changes the representation, not the slot's version
+        Booking.objects.filter(pk=self.booking.pk).update_with_counters(booking_status=Booking.Status.APPROVED)
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.client.patch(path, {'capacity': 12}, format='json', HTTP_IF_MATCH=etag).status_code, 200)
+
+    def test_unusable_if_match_values(self):
+        path = f'/api/events/{self.event.pk}/'
+        self.assertEqual(self.client.patch(path, {'name': 'A'}, format='json', HTTP_IF_MATCH='*').status_code, 200)
+        for header in ['"nope"', 'W/"2"', '"1"']:
+            with self.subTest(header=header):
+                response = self.client.patch(path, {'name': 'B'}, format='json', HTTP_IF_MATCH=header)
+                self.assertEqual(response.status_code, 412)
+        self.assertEqual(self.client.patch(path, {'name': 'C'}, format='json', HTTP_IF_MATCH='"1", "2"').status_code, 200)
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.name, self.event.version), ('C', 3))
@@ -23,6 +23,8 @@ from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 from django.http import HttpResponse
 from eventslotbooking_project import admin_menu  # noqa: F401
+from middleware.query_instrumentation import query_stats_view
+from middleware.request_coalescing import coalescing_stats_view
 
 schema_view = get_schema_view(
    openapi.Info(
@@ -42,8 +44,8 @@ urlpatterns = [
     path('accounts/', include('django.contrib.auth.urls')),
 
     # Swagger URLs
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    path('swagger/', schema_view.with_ui('swagger', cache_timeout=settings.SCHEMA_CACHE_TIMEOUT), name='schema-swagger-ui'),
+    path('redoc/', schema_view.with_ui('redoc', cache_timeout=settings.SCHEMA_CACHE_TIMEOUT), name='schema-redoc'),
 
     # Root endpoint
     path("", lambda request: HttpResponse("Welcome to Event & Slot Booking API 🚀")),
@@ -58,6 +60,9 @@ urlpatterns = [
     path("api/slots/", include("slots.urls.slot_urls")),
     # Bookings App
     path("api/bookings/", include("bookings.urls.booking_urls")),
+    # Staff-only diagnostics
+    path("api/_debug/queries/", query_stats_view, name='query_stats'),
+    path("api/_debug/coalescing/", coalescing_stats_view, name='coalescing_stats'),
 
 ]
 
@@ -0,0 +1,139 @@
+from django.db import models, transaction
+from django.db.models import F
+from django.utils.http import parse_etags
+from drf_yasg import openapi
+from rest_framework import status
+from rest_framework.response import Response
+
+from middleware.response_cache import bump_versions
+
+
+if_match_header = openapi.Parameter(
+    'If-Match', openapi.IN_HEADER, type=openapi.TYPE_STRING, required=False,
+    description="ETag from an earlier GET; the update fails with 412 if the record changed since",
+)
+
+
+class VersionConflict(Exception):
+    """The row changed since the version the client sent in If-Match."""
+
+
+class VersionedQuerySet(models.QuerySet):
+
+    def update_and_sync(self, **fields):
+        """
+        queryset.update() for versioned models. update() skips save() and
+        the post_save signal, so this bumps every row's version and then
+        runs the model's sync_updated(), which does what the signal
+        receivers would (cached responses, search index, venue schedule).
+        The ids of the rows are read first only for models with
+        SYNC_BY_ID, as the filter may no longer match after the update.
+        """
+        if not self.model.SYNC_BY_ID:
+            updated = self.update(version=bumped_version(), **fields)
+            if updated:
+                self.model.sync_updated(None)
+            return updated
+        ids = list(self.values_list('pk', flat=True))
+        if not ids:
+            return 0
+        updated = self.model._default_manager.filter(pk__in=ids).update(version=bumped_version(), **fields)
+        self.model.sync_updated(ids)
+        return updated
+
+
+class VersionedModel(models.Model):
+    """
+    A `version` that goes up by one on every save(), exposed as the ETag of
+    detail responses. After expect_versions(), save() is an optimistic
+    write: the UPDATE carries WHERE version IN (...) and raises
+    VersionConflict when the row has moved on, so concurrent edits never
+    wait on each other's row locks.
+    """
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    objects = VersionedQuerySet.as_manager()
+
+    # Whether sync_updated() needs the ids of the updated rows
+    SYNC_BY_ID = False
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def sync_updated(cls, ids):
+        """After update_and_sync() (ids: the updated rows, or None without SYNC_BY_ID): invalidate the cached responses built from this model."""
+        bump_versions(cls._meta.model_name)
+
+    def expect_versions(self, versions):
+        """Make the next save() conditional on these versions (None: unconditional)."""
+        self._expected_versions = versions
+
+    def save(self, *args, **kwargs):
+        if getattr(self, '_expected_versions', None) is None:
+            return super().save(*args, **kwargs)
+        # A savepoint, so a conflict leaves an enclosing transaction usable
+        with transaction.atomic(using=kwargs.get('using')):
+            return super().save(*args, **kwargs)
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        expected = getattr(self, '_expected_versions', None)
+        self._expected_versions = None
+        version_field = self._meta.get_field('version')
+        values = [value for value in values if value[0] is not version_field]
+
+        if expected is not None:
+            base_qs = base_qs.filter(version__in=expected)
+        if expected is not None and len(expected) == 1:
+            new_version = next(iter(expected)) + 1
+        else:
+            new_version = None
+        values.append((version_field, None, F('version') + 1 if new_version is None else new_version))
+
+        updated = super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        if expected is not None and not updated:
+            raise VersionConflict
+        if new_version is None:
+            # The row may have moved on since it was loaded, so this can trail
+            # the database (an If-Match with it then fails safely), never lead it
+            new_version = self.version + 1
+        self.version = new_version
+        return updated
+
+
+def bumped_version():
+    """For queryset.update() (see update_and_sync()): it skips save(), so the version is bumped explicitly."""
+    return F('version') + 1
+
+
+def etag(instance):
+    return f'"{instance.version}"'
+
+
+def expected_versions(request):
+    """
+    Versions the If-Match header accepts, or None when there is none (or
+    it is "*"). Cached responses carry "<version>.<cache key>" ETags; only
+    the version counts here. Weak tags never match, as If-Match compares
+    strongly.
+    """
+    header = request.headers.get('If-Match')
+    if not header:
+        return None
+    tags = parse_etags(header)
+    if tags == ['*']:
+        return None
+    versions = set()
+    for tag in tags:
+        if tag.startswith('"'):
+            version = tag.strip('"').split('.', 1)[0]
+            if version.isdigit():
+                versions.add(int(version))
+    return versions
+
+
+def version_conflict_response():
+    return Response(
+        {"message": "This record was changed by someone else. Fetch it again and retry."},
+        status=status.HTTP_412_PRECONDITION_FAILED,
+    )
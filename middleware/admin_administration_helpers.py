@@ -1,34 +1,27 @@
 # middleware/admin_administration_helpers.py
-from users.models import RolePermission
+from middleware.permission_cache import get_module_permissions
 
-def check_role_permission(user, module_name, action):
+ACTIONS = ('read', 'create', 'update', 'delete')
+
+
+def check_request_permission(request, module_name, action):
     """
-    Check if a user has permission for a module in Django Admin.
+    Check if request.user has permission for a module in Django Admin.
     action: 'read', 'create', 'update', 'delete'
+
+    Reads the same process-wide permission matrix as RoleAccessMiddleware,
+    so the many checks of one admin page (module list, model perms,
+    actions, every changelist row) run no permission queries.
     """
+    user = request.user
     # Superuser or Superadmin → full access
     if user.is_superuser or (
         getattr(user, 'role', None) and user.role.name.lower() == 'superadmin'
     ):
         return True
 
-    if not hasattr(user, 'role') or user.role is None:
-        return False
-
-    # Normalize module name (case-insensitive lookup)
-    perm = RolePermission.objects.filter(
-        role=user.role,
-        module_name__iexact=module_name.strip()
-    ).first()
-
-    if not perm:
+    role_id = getattr(user, 'role_id', None)
+    if not role_id or action not in ACTIONS:
         return False
-
-    action_map = {
-        'read': perm.is_read,
-        'create': perm.is_create,
-        'update': perm.is_update,
-        'delete': perm.is_delete,
-    }
-
-    return bool(action_map.get(action, False))
+    perms = get_module_permissions(role_id, module_name.strip())
+    return bool(perms and perms[ACTIONS.index(action)])
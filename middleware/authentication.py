@@ -0,0 +1,16 @@
+# middleware/authentication.py
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+class RoleAccessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that reuses the user and token RoleAccessMiddleware
+    already validated, so each request decodes the token and loads the
+    user once. Falls back to regular JWT authentication otherwise.
+    """
+
+    def authenticate(self, request):
+        authenticated = getattr(request._request, 'jwt_authenticated', None)
+        if authenticated is not None:
+            return authenticated
+        return super().authenticate(request)
@@ -0,0 +1,83 @@
+# middleware/permission_cache.py
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from middleware.response_cache import current_stamps
+from users.models import RolePermission
+
+# Shared version stamp: bumping it makes every worker reload its matrix.
+# It only reaches the other workers through a cache they share; with the
+# default local-memory cache each process has its own stamp. So a matrix
+# is also never kept longer than PERMISSION_MATRIX_TTL seconds: a revoked
+# permission reaches every worker within that time whatever the cache,
+# and at once with DJANGO_CACHE_BACKEND=file (see settings.CACHES).
+VERSION_KEY = 'role_permission_matrix_version'
+
+_lock = threading.Lock()
+_matrix = None
+_matrix_version = None
+_matrix_loaded_at = None
+
+
+def _ttl():
+    return getattr(settings, 'PERMISSION_MATRIX_TTL', 5)
+
+
+def _fresh(version, now):
+    return _matrix is not None and _matrix_version == version and now - _matrix_loaded_at < _ttl()
+
+
+def _current_version():
+    return current_stamps([VERSION_KEY])[VERSION_KEY]
+
+
+def get_permission_matrix():
+    """
+    Process-local {role_id: {module_name: (read, create, update, delete)}},
+    loaded with a single query and reloaded when the version stamp changes
+    (see invalidate_permission_matrix()) or PERMISSION_MATRIX_TTL has passed.
+    """
+    global _matrix, _matrix_version, _matrix_loaded_at
+    version = _current_version()
+    now = time.monotonic()
+    if _fresh(version, now):
+        return _matrix
+
+    with _lock:
+        if not _fresh(version, now):
+            matrix = {}
+            for role_id, module_name, *bits in RolePermission.objects.values_list(
+                'role_id', 'module_name', 'is_read', 'is_create', 'is_update', 'is_delete'
+            ):
+                matrix.setdefault(role_id, {})[module_name] = tuple(bits)
+            _matrix, _matrix_version, _matrix_loaded_at = matrix, version, now
+        return _matrix
+
+
+def get_module_permissions(role_id, module_name):
+    """(read, create, update, delete) for the role/module pair, or None."""
+    return get_permission_matrix().get(role_id, {}).get(module_name)
+
+
+def invalidate_permission_matrix():
+    """
+    Drop this worker's matrix and bump the shared version for the others,
+    straight away and again when the transaction commits, as
+    response_cache.bump_versions() does: a worker that reloads inside the
+    write window reads the old rows and caches them under the first new
+    stamp. A fresh random stamp (rather than incr) cannot lose an update on
+    the file-based cache, which has no atomic increment.
+    """
+    def bump():
+        global _matrix
+        with _lock:
+            _matrix = None
+        cache.set(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+    bump()
+    transaction.on_commit(bump)
@@ -0,0 +1,173 @@
+# middleware/query_instrumentation.py
+import threading
+import time
+from collections import Counter, deque
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class QueryRecorder:
+    """connection.execute_wrapper() hook collecting one request's SQL."""
+
+    def __init__(self):
+        self.count = 0
+        self.sql_time = 0.0
+        self.statements = []
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.count += 1
+            self.sql_time += duration
+            self.statements.append((duration, sql))
+            # The SQL still has its placeholders, so it is the fingerprint:
+            # the same template run many times is the N+1 signature
+            self.fingerprints[sql] += 1
+
+    def slowest(self, limit):
+        return sorted(self.statements, key=lambda item: item[0], reverse=True)[:limit]
+
+    def duplicates(self):
+        return {sql: count for sql, count in self.fingerprints.items() if count > 1}
+
+
+class QueryStatsTable:
+    """Rolling per-endpoint query statistics for this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint, recorder, total_time):
+        window = _setting('QUERY_INSTRUMENTATION_WINDOW', 200)
+        slow_limit = _setting('QUERY_INSTRUMENTATION_SLOW_QUERIES', 5)
+        with self._lock:
+            entry = self._endpoints.setdefault(endpoint, {
+                'samples': deque(maxlen=window),
+                'slowest': [],
+                'duplicates': Counter(),
+            })
+            entry['samples'].append((recorder.count, recorder.sql_time, total_time))
+            entry['slowest'] = sorted(
+                entry['slowest'] + recorder.slowest(slow_limit),
+                key=lambda item: item[0],
+                reverse=True,
+            )[:slow_limit]
+            for sql, count in recorder.duplicates().items():
+                entry['duplicates'][sql] = max(entry['duplicates'][sql], count)
+
+    def snapshot(self):
+        rows = []
+        with self._lock:
+            for endpoint, entry in self._endpoints.items():
+                samples = list(entry['samples'])
+                requests = len(samples)
+                rows.append({
+                    'endpoint': endpoint,
+                    'requests': requests,
+                    'avg_queries': round(sum(s[0] for s in samples) / requests, 2),
+                    'max_queries': max(s[0] for s in samples),
+                    'avg_sql_ms': round(sum(s[1] for s in samples) * 1000 / requests, 2),
+                    'avg_total_ms': round(sum(s[2] for s in samples) * 1000 / requests, 2),
+                    'slowest': [
+                        {'ms': round(duration * 1000, 2), 'sql': sql}
+                        for duration, sql in entry['slowest']
+                    ],
+                    'duplicates': [
+                        {'count': count, 'sql': sql}
+                        for sql, count in entry['duplicates'].most_common(5)
+                    ],
+                })
+        return sorted(rows, key=lambda row: row['avg_sql_ms'], reverse=True)
+
+    def clear(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+query_stats = QueryStatsTable()
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Records query count, SQL time, slowest statements and repeated query
+    fingerprints per request, sends them as a Server-Timing header and keeps
+    rolling per-endpoint totals for /api/_debug/queries/.
+
+    Streaming responses (exports, availability) run most of their queries
+    while the body is sent, after the headers: their Server-Timing header
+    counts the queries before the body ("before streaming"), and the
+    per-endpoint totals are recorded once the body has been consumed.
+
+    Enabled with QUERY_INSTRUMENTATION_ENABLED; when it is off the middleware
+    removes itself from the chain at startup, so it costs nothing.
+    """
+
+    def __init__(self, get_response):
+        if not _setting('QUERY_INSTRUMENTATION_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        streamed = response.streaming and not response.is_async
+        duplicates = sum(count - 1 for count in recorder.duplicates().values())
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={recorder.sql_time * 1000:.2f};desc="{recorder.count} queries, {duplicates} repeated'
+            + (' before streaming"' if streamed else '"'),
+            f'app;dur={elapsed * 1000:.2f}',
+        ])
+        if streamed:
+            response.streaming_content = self._streamed(
+                response.streaming_content, recorder, self._endpoint(request), start
+            )
+        else:
+            query_stats.record(self._endpoint(request), recorder, elapsed)
+        return response
+
+    @staticmethod
+    def _streamed(content, recorder, endpoint, start):
+        # Re-entered while the body is sent; never entered if it is not
+        try:
+            with connection.execute_wrapper(recorder):
+                yield from content
+        finally:
+            query_stats.record(endpoint, recorder, time.perf_counter() - start)
+
+    @staticmethod
+    def _endpoint(request):
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match else request.path
+        return f"{request.method} /{route.lstrip('/')}"
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def query_stats_view(request):
+    """Staff only: rolling per-endpoint query stats (DELETE resets them)."""
+    if request.method == 'DELETE':
+        query_stats.clear()
+        return Response({"message": "Query stats cleared"})
+    return Response({
+        "message": "Query stats fetched successfully",
+        "enabled": _setting('QUERY_INSTRUMENTATION_ENABLED', False),
+        "data": query_stats.snapshot(),
+    })
@@ -0,0 +1,139 @@
+# middleware/request_coalescing.py
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+MAX_RECENT = 1000  # finished results kept for the freshness window
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+
+
+class SingleFlight:
+    """
+    Per-process single flight. The first caller for a key runs fn(); the
+    callers that arrive while it runs wait and share its value, and so do
+    the callers within `window` seconds after it finished.
+
+    fn() returning None means "nothing to share" (e.g. an error response):
+    waiters then run fn() themselves, as they do when the first caller
+    raises or takes longer than `timeout`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._recent = {}
+        self._stats = Counter()
+
+    def do(self, key, fn, window=0, timeout=None):
+        with self._lock:
+            recent = self._recent.get(key)
+            if recent is not None and time.monotonic() - recent[0] < window:
+                self._stats['fresh'] += 1
+                return recent[1]
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if call.done.wait(timeout) and call.value is not None:
+                self._count('coalesced')
+                return call.value
+            return self._compute(fn)
+
+        try:
+            call.value = self._compute(fn)
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.value is not None and window > 0:
+                    self._remember(key, call.value, window)
+                else:
+                    self._recent.pop(key, None)
+            call.done.set()
+        return call.value
+
+    def _compute(self, fn):
+        self._count('computed')
+        return fn()
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _remember(self, key, value, window):
+        now = time.monotonic()
+        if len(self._recent) >= MAX_RECENT:
+            self._recent = {k: v for k, v in self._recent.items() if now - v[0] < window}
+            if len(self._recent) >= MAX_RECENT:
+                self._recent.clear()
+        self._recent[key] = (now, value)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'computed': self._stats['computed'],
+                'coalesced': self._stats['coalesced'],
+                'fresh': self._stats['fresh'],
+                'in_flight': len(self._calls),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
+            self._recent.clear()
+
+
+coalesced_reads = SingleFlight()
+
+
+def coalesce(key, compute):
+    """
+    Run compute() once for identical concurrent requests (same `key`) in
+    this worker. compute() returns (response, shared): the response for
+    the request that ran it and the (etag, data) pair handed to the
+    others, or None when the response must not be shared.
+    """
+    own = {}
+
+    def run():
+        own['response'], shared = compute()
+        return shared
+
+    shared = coalesced_reads.do(
+        key, run,
+        window=_setting('REQUEST_COALESCING_WINDOW', 1.0),
+        timeout=_setting('REQUEST_COALESCING_TIMEOUT', 10.0),
+    )
+    if 'response' in own:
+        return own['response']
+    etag, data = shared
+    return Response(data, headers={'ETag': etag})
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def coalescing_stats_view(request):
+    """Staff only: computed vs coalesced read counters (DELETE resets them)."""
+    if request.method == 'DELETE':
+        coalesced_reads.clear()
+        return Response({"message": "Coalescing stats cleared"})
+    return Response({
+        "message": "Coalescing stats fetched successfully",
+        "window": _setting('REQUEST_COALESCING_WINDOW', 1.0),
+        "data": coalesced_reads.snapshot(),
+    })
@@ -0,0 +1,128 @@
+# middleware/response_cache.py
+import hashlib
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from middleware.request_coalescing import coalesce
+
+# One version stamp per model; bumping it orphans every cached response
+# that was built from that model's rows
+VERSION_KEY = 'response_cache_version:{}'
+# Entries are (etag, data) pairs
+RESPONSE_KEY = 'response_cache_entry:{}'
+CATALOG_MODELS = ('venue', 'event', 'slot', 'booking')
+
+
+def _enabled():
+    return getattr(settings, 'RESPONSE_CACHE_ENABLED', False)
+
+
+def current_stamps(keys):
+    """
+    {key: version stamp} for these cache keys, seeding a random stamp for
+    keys that have none. Shared with the permission cache's stamp.
+    """
+    stamps = cache.get_many(keys)
+    for key in keys:
+        if stamps.get(key) is None:
+            # First worker to look seeds the stamp; add() keeps a concurrent one
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            stamps[key] = cache.get(key)
+    return stamps
+
+
+def get_versions(models):
+    """{model: version stamp}, seeding a stamp for models that have none."""
+    keys = {model: VERSION_KEY.format(model) for model in models}
+    stamps = current_stamps(list(keys.values()))
+    return {model: stamps[key] for model, key in keys.items()}
+
+
+def bump_versions(*models):
+    """
+    Invalidate the cached responses built from `models`. A fresh random
+    stamp (rather than incr) cannot lose an update on caches without an
+    atomic increment, such as the file-based one.
+
+    The stamp is bumped straight away and again when the transaction
+    commits: a read that ran inside the write window may have cached the
+    old rows under the first new stamp.
+    """
+    def bump():
+        cache.set_many({VERSION_KEY.format(model): uuid.uuid4().hex for model in models}, timeout=None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def cache_key(request, versions):
+    """Path, host and normalized query params (order-insensitive) plus the versions."""
+    params = sorted((name, sorted(request.GET.getlist(name))) for name in request.GET)
+    raw = repr((request.build_absolute_uri(request.path), params, sorted(versions.items())))
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _matching_etag(if_none_match, key):
+    """The If-None-Match tag issued for this cache key ("<key>" or "<version>.<key>"), or None."""
+    for tag in parse_etags(if_none_match):
+        if tag == f'"{key}"' or tag.endswith(f'.{key}"'):
+            return tag
+    return None
+
+
+def cached_response(*models, coalesce_reads=False):
+    """
+    Cache the data of successful GET responses of a DRF function view until
+    one of `models` changes, and answer If-None-Match with 304 when the
+    ETag still matches. A hit runs no queries in the view. An ETag set by
+    the view (a row version, see eventslotbooking_project/versioning.py)
+    is kept as the prefix of the cache ETag, so If-Match still finds it.
+
+    With coalesce_reads, identical cache misses in one worker are computed
+    once and shared (see middleware/request_coalescing.py); the shared
+    result may be up to REQUEST_COALESCING_WINDOW seconds old.
+
+    Goes between @api_view and the view function, so authentication,
+    permissions and content negotiation still run on every request.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if request.method != 'GET' or not _enabled():
+                return view_func(request, *args, **kwargs)
+
+            key = cache_key(request, get_versions(models))
+            matched = _matching_etag(request.headers.get('If-None-Match', ''), key)
+            if matched is not None:
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': matched})
+
+            cached = cache.get(RESPONSE_KEY.format(key))
+            if cached is not None:
+                etag, data = cached
+                return Response(data, headers={'ETag': etag})
+
+            def compute():
+                response = view_func(request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response, None
+                # Detail views tag responses with the row version; keep it in front
+                version = response.get('ETag', '').strip('"')
+                etag = f'"{version}.{key}"' if version else f'"{key}"'
+                cache.set(RESPONSE_KEY.format(key), (etag, response.data),
+                          timeout=getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300))
+                response['ETag'] = etag
+                return response, (etag, response.data)
+
+            if coalesce_reads:
+                # Keyed without the versions, so the freshness window spans writes
+                return coalesce(cache_key(request, {}), compute)
+            return compute()[0]
+        return _wrapped_view
+    return decorator
@@ -1,7 +1,11 @@
 # employee/middleware/role_base_access.py
 from django.http import JsonResponse
-from users.models import RolePermission
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from middleware.permission_cache import get_module_permissions
+
+# Staff-only diagnostics, matched exactly: DRF authenticates these views
+# and their IsAdminUser permission checks is_staff
+DEBUG_PATHS = ('/api/_debug/queries/', '/api/_debug/coalescing/')
 
 class RoleAccessMiddleware:
     def __init__(self, get_response):
@@ -11,8 +15,9 @@ class RoleAccessMiddleware:
     def __call__(self, request):
         path = request.path
 
-        # Bypass for admin, swagger, auth/register, auth/login
-        if any(p in path for p in ['admin', 'swagger', 'auth/register', 'auth/login']):
+        # Bypass for admin, swagger, auth/register, auth/login and the
+        # staff-only diagnostics
+        if path in DEBUG_PATHS or any(p in path for p in ['admin', 'swagger', 'auth/register', 'auth/login']):
             return self.get_response(request)
 
         # ✅ Direct token authentication
@@ -26,24 +31,28 @@ class RoleAccessMiddleware:
         except Exception:
             return JsonResponse({'message': 'Invalid or expired token'}, status=401)
 
-        # ✅ Role check
-        if not getattr(request.user, 'role', None):
+        # Hand the result to DRF (RoleAccessJWTAuthentication) so the token
+        # is not decoded and the user not loaded a second time
+        request.jwt_authenticated = (request.user, validated_token)
+
+        # ✅ Role check (role_id only, no extra query for the role row)
+        if not getattr(request.user, 'role_id', None):
             return JsonResponse({'message': 'No role assigned'}, status=403)
 
-        # ✅ Module & CRUD permission check
+        # ✅ Module & CRUD permission check (process-local matrix, no query)
         parts = path.strip('/').split('/')
         module_name = parts[1].capitalize() if len(parts) > 1 else parts[0].capitalize()
-        try:
-            permission = RolePermission.objects.get(role=request.user.role, module_name=module_name)
-        except RolePermission.DoesNotExist:
+        permission = get_module_permissions(request.user.role_id, module_name)
+        if permission is None:
             return JsonResponse({'message': f'Access denied for module {module_name}'}, status=403)
 
+        is_read, is_create, is_update, is_delete = permission
         method = request.method
         allowed = (
-            (method == 'GET' and permission.is_read) or
-            (method == 'POST' and permission.is_create) or
-            (method in ['PUT', 'PATCH'] and permission.is_update) or
-            (method == 'DELETE' and permission.is_delete)
+            (method == 'GET' and is_read) or
+            (method == 'POST' and is_create) or
+            (method in ['PUT', 'PATCH'] and is_update) or
+            (method == 'DELETE' and is_delete)
         )
         if not allowed:
             return JsonResponse({'message': f'{method} not allowed for your role'}, status=403)
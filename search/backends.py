@@ -0,0 +1,364 @@
+import re
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+from search.documents import DOCUMENTS
+
+
+def terms(text):
+    """Lower-cased word tokens of the user's search text."""
+    return re.findall(r'\w+', (text or '').lower())
+
+
+class SearchBackend(ABC):
+    """
+    One full-text index table per document kind ('event', 'venue'), keyed
+    by the object id. Subclasses implement the storage for one database
+    vendor; search() returns [(object_id, score)] best match first.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    @staticmethod
+    def table(kind):
+        return f'search_{kind}'
+
+    @abstractmethod
+    def install(self):
+        """Create the index tables."""
+
+    @abstractmethod
+    def uninstall(self):
+        """Drop the index tables."""
+
+    @abstractmethod
+    def upsert(self, kind, documents):
+        """Index (object_id, title, body) documents, replacing earlier versions."""
+
+    @abstractmethod
+    def delete(self, kind, object_ids):
+        """Drop the documents of these objects."""
+
+    @abstractmethod
+    def clear(self, kind):
+        """Drop every document of the kind."""
+
+    @abstractmethod
+    def search(self, kind, text, limit):
+        """[(object_id, score)] of the best `limit` matches, best first."""
+
+    @abstractmethod
+    def matching(self, kind, text, title_only=False):
+        """
+        Ids of every match, as a subquery for `__in` filters. title_only
+        matches the title (the name) alone.
+        """
+
+    @abstractmethod
+    def ranked(self, queryset, kind, text, limit):
+        """
+        `queryset` narrowed to the best `limit` matches and annotated with
+        search_rank from their score (lower is better).
+        """
+
+    @contextmanager
+    def bulk_load(self, kind):
+        """Wraps a rebuild's upserts, for backends that can tune bulk writes."""
+        yield
+
+    def _pk(self, queryset):
+        """The queryset's primary key column, for subqueries correlated with it."""
+        meta = queryset.model._meta
+        quote = self.connection.ops.quote_name
+        return f'{quote(meta.db_table)}.{quote(meta.pk.column)}'
+
+    @staticmethod
+    def _ranked(queryset, top, top_params, rank, rank_params):
+        """
+        Narrow `queryset` to the ids the `top` subquery returns and annotate
+        search_rank with the `rank` subquery, correlated on its primary key.
+        """
+        return queryset.filter(pk__in=RawSQL(top, top_params)).annotate(
+            search_rank=RawSQL(rank, rank_params, output_field=FloatField())
+        )
+
+    def _execute(self, sql, params=None, many=False):
+        with self.connection.cursor() as cursor:
+            if many:
+                cursor.executemany(sql, params)
+            else:
+                cursor.execute(sql, params)
+            return cursor.fetchall() if cursor.description else None
+
+
+class SQLiteFTS5Backend(SearchBackend):
+    """
+    FTS5 virtual tables; the rowid is the object id, ranking is bm25().
+
+    Writes are flushed to the on-disk index straight away (hashsize 1):
+    on SQLite < 3.42 a prefix query that runs over pending (unflushed)
+    deletes and is followed by an insert in the same transaction corrupts
+    the index ("database disk image is malformed").
+    """
+
+    TITLE_WEIGHT = 10.0
+    BULK_HASHSIZE = 1024 * 1024  # the FTS5 default
+
+    def install(self):
+        for kind in DOCUMENTS:
+            self._execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table(kind)} "
+                f"USING fts5(title, body, tokenize='unicode61')"
+            )
+            self._set_hashsize(kind, 1)
+
+    def uninstall(self):
+        for kind in DOCUMENTS:
+            self._execute(f"DROP TABLE IF EXISTS {self.table(kind)}")
+
+    def upsert(self, kind, documents):
+        documents = list(documents)
+        if not documents:
+            return
+        self.delete(kind, [document[0] for document in documents])
+        self._execute(
+            f"INSERT INTO {self.table(kind)} (rowid, title, body) VALUES (%s, %s, %s)",
+            documents, many=True,
+        )
+
+    def delete(self, kind, object_ids):
+        object_ids = list(object_ids)
+        if object_ids:
+            placeholders = ', '.join(['%s'] * len(object_ids))
+            self._execute(f"DELETE FROM {self.table(kind)} WHERE rowid IN ({placeholders})", object_ids)
+
+    def clear(self, kind):
+        self._execute(f"DELETE FROM {self.table(kind)}")
+
+    @staticmethod
+    def _match(text, title_only=False):
+        # every word must match, as a prefix ("tech" finds "technology")
+        match = ' '.join(f'"{word}"*' for word in terms(text))
+        return f'title : ({match})' if title_only else match
+
+    def _score(self, table):
+        # bm25() is negative, lower is better
+        return f"bm25({table}, {self.TITLE_WEIGHT}, 1.0)"
+
+    def search(self, kind, text, limit):
+        if not terms(text):
+            return []
+        table = self.table(kind)
+        rows = self._execute(
+            f"SELECT rowid, {self._score(table)} AS score FROM {table} "
+            f"WHERE {table} MATCH %s ORDER BY score LIMIT %s",
+            [self._match(text), limit],
+        )
+        return [(object_id, -score) for object_id, score in rows]
+
+    def matching(self, kind, text, title_only=False):
+        table = self.table(kind)
+        return RawSQL(f"SELECT rowid FROM {table} WHERE {table} MATCH %s", [self._match(text, title_only)])
+
+    def ranked(self, queryset, kind, text, limit):
+        table = self.table(kind)
+        match = self._match(text)
+        return self._ranked(
+            queryset,
+            f"SELECT rowid FROM {table} WHERE {table} MATCH %s ORDER BY {self._score(table)} LIMIT %s",
+            [match, limit],
+            f"SELECT {self._score(table)} FROM {table} WHERE {table} MATCH %s AND rowid = {self._pk(queryset)}",
+            [match],
+        )
+
+    @contextmanager
+    def bulk_load(self, kind):
+        self._set_hashsize(kind, self.BULK_HASHSIZE)
+        try:
+            yield
+        finally:
+            self._set_hashsize(kind, 1)
+
+    def _set_hashsize(self, kind, size):
+        table = self.table(kind)
+        self._execute(f"INSERT INTO {table} ({table}, rank) VALUES ('hashsize', %s)", [size])
+
+
+class MySQLFullTextBackend(SearchBackend):
+    """
+    InnoDB tables with FULLTEXT indexes, queried in boolean mode. Words
+    shorter than innodb_ft_min_token_size (3 by default) are not indexed
+    by MySQL, so search words that short are matched with LIKE on the
+    index row instead.
+    """
+
+    MIN_TOKEN_SIZE = 3
+
+    def install(self):
+        for kind in DOCUMENTS:
+            table = self.table(kind)
+            self._execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                f"object_id BIGINT NOT NULL PRIMARY KEY, "
+                f"title VARCHAR(255) NOT NULL, "
+                f"body TEXT NOT NULL, "
+                f"FULLTEXT KEY {table}_title_ft (title), "
+                f"FULLTEXT KEY {table}_ft (title, body)"
+                f") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"
+            )
+
+    def uninstall(self):
+        for kind in DOCUMENTS:
+            self._execute(f"DROP TABLE IF EXISTS {self.table(kind)}")
+
+    def upsert(self, kind, documents):
+        documents = list(documents)
+        if documents:
+            self._execute(
+                f"INSERT INTO {self.table(kind)} (object_id, title, body) VALUES (%s, %s, %s) "
+                f"ON DUPLICATE KEY UPDATE title = VALUES(title), body = VALUES(body)",
+                documents, many=True,
+            )
+
+    def delete(self, kind, object_ids):
+        object_ids = list(object_ids)
+        if object_ids:
+            placeholders = ', '.join(['%s'] * len(object_ids))
+            self._execute(f"DELETE FROM {self.table(kind)} WHERE object_id IN ({placeholders})", object_ids)
+
+    def clear(self, kind):
+        self._execute(f"DELETE FROM {self.table(kind)}")
+
+    def _against(self, text):
+        # every indexed word must match, as a prefix
+        return ' '.join(f'+{word}*' for word in terms(text) if len(word) >= self.MIN_TOKEN_SIZE)
+
+    def _where(self, table, text, columns=('title', 'body')):
+        """Condition, and its params, matching every word of `text` in `columns`."""
+        columns = ', '.join(f'{table}.{column}' for column in columns)
+        where, params = [], []
+        against = self._against(text)
+        if against:
+            where.append(f"MATCH({columns}) AGAINST (%s IN BOOLEAN MODE)")
+            params.append(against)
+        for word in terms(text):
+            if len(word) < self.MIN_TOKEN_SIZE:
+                where.append(f"CONCAT_WS(' ', {columns}) LIKE %s")
+                params.append('%' + word.replace('_', r'\_') + '%')
+        return ' AND '.join(where), params
+
+    @staticmethod
+    def _score(table):
+        return (f"2 * MATCH({table}.title) AGAINST (%s IN BOOLEAN MODE) "
+                f"+ MATCH({table}.title, {table}.body) AGAINST (%s IN BOOLEAN MODE)")
+
+    def search(self, kind, text, limit):
+        if not terms(text):
+            return []
+        against = self._against(text)
+        table = self.table(kind)
+        where, params = self._where(table, text)
+        return list(self._execute(
+            f"SELECT object_id, {self._score(table)} AS score FROM {table} "
+            f"WHERE {where} ORDER BY score DESC, object_id LIMIT %s",
+            [against, against, *params, limit],
+        ))
+
+    def matching(self, kind, text, title_only=False):
+        table = self.table(kind)
+        where, params = self._where(table, text, ('title',) if title_only else ('title', 'body'))
+        return RawSQL(f"SELECT object_id FROM {table} WHERE {where}", params)
+
+    def ranked(self, queryset, kind, text, limit):
+        table = self.table(kind)
+        against = self._against(text)
+        where, params = self._where(table, text)
+        return self._ranked(
+            queryset,
+            # MySQL takes no LIMIT in an IN (...) subquery: wrap it in a derived table
+            f"SELECT object_id FROM (SELECT object_id FROM {table} WHERE {where} "
+            f"ORDER BY {self._score(table)} DESC, object_id LIMIT %s) AS top_matches",
+            [*params, against, against, limit],
+            f"SELECT -({self._score(table)}) FROM {table} WHERE {table}.object_id = {self._pk(queryset)}",
+            [against, against],
+        )
+
+
+class LikeSearchBackend(SearchBackend):
+    """
+    Fallback for databases without a supported full-text engine: every
+    word must appear in one of the document fields (icontains). There is
+    no index to maintain; title matches rank first.
+    """
+
+    def install(self):
+        pass
+
+    def uninstall(self):
+        pass
+
+    def upsert(self, kind, documents):
+        pass
+
+    def delete(self, kind, object_ids):
+        pass
+
+    def clear(self, kind):
+        pass
+
+    @staticmethod
+    def _matches(kind, words, title_only=False):
+        document = DOCUMENTS[kind]
+        queryset = document.get_model()._default_manager.filter(deleted_at__isnull=True)
+        fields = (document.title,) if title_only else document.fields
+        for word in words:
+            condition = Q()
+            for field in fields:
+                condition |= Q(**{f'{field}__icontains': word})
+            queryset = queryset.filter(condition)
+        return queryset
+
+    @staticmethod
+    def _title_misses(kind, words):
+        # Words missing from the title: lower is better, like the other backends' ranks
+        title = DOCUMENTS[kind].title
+        return sum(
+            (Case(When(**{f'{title}__icontains': word}, then=Value(0)), default=Value(1)) for word in words),
+            Value(0),
+        )
+
+    def search(self, kind, text, limit):
+        words = terms(text)
+        if not words:
+            return []
+        document = DOCUMENTS[kind]
+        results = []
+        for values in self._matches(kind, words).values_list('pk', document.title)[:limit]:
+            title = (values[1] or '').lower()
+            results.append((values[0], sum(1 for word in words if word in title)))
+        return sorted(results, key=lambda result: (-result[1], result[0]))
+
+    def matching(self, kind, text, title_only=False):
+        return self._matches(kind, terms(text), title_only).values('pk')
+
+    def ranked(self, queryset, kind, text, limit):
+        words = terms(text)
+        misses = self._title_misses(kind, words)
+        top = self._matches(kind, words).annotate(misses=misses).order_by('misses', 'pk').values('pk')[:limit]
+        return queryset.filter(pk__in=top).annotate(search_rank=misses)
+
+
+BACKENDS = {
+    'sqlite': SQLiteFTS5Backend,
+    'mysql': MySQLFullTextBackend,
+}
+
+
+def get_backend(connection=None):
+    if connection is None:
+        from django.db import connection
+    return BACKENDS.get(connection.vendor, LikeSearchBackend)(connection)
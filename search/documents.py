@@ -0,0 +1,37 @@
+class Document:
+    """How rows of one model map onto a searchable (title, body) document."""
+
+    def __init__(self, app_label, model_name, title, body):
+        self.app_label = app_label
+        self.model_name = model_name
+        self.title = title
+        self.body = body
+
+    def get_model(self, apps=None):
+        if apps is None:
+            from django.apps import apps
+        return apps.get_model(self.app_label, self.model_name)
+
+    def from_values(self, values):
+        """(title, body) from a row of values_list('pk', *self.fields)."""
+        title = values[1] or ''
+        body = ' '.join(value for value in values[2:] if value)
+        return title, body
+
+    @property
+    def fields(self):
+        return (self.title, *self.body)
+
+    def rows(self, ids=None, apps=None, chunk_size=2000):
+        """(object_id, title, body) for every live (not soft-deleted) row."""
+        queryset = self.get_model(apps)._default_manager.filter(deleted_at__isnull=True)
+        if ids is not None:
+            queryset = queryset.filter(pk__in=ids)
+        for values in queryset.values_list('pk', *self.fields).iterator(chunk_size=chunk_size):
+            yield (values[0], *self.from_values(values))
+
+
+DOCUMENTS = {
+    'event': Document('events', 'Event', title='name', body=('description',)),
+    'venue': Document('venues', 'Venue', title='name', body=('address', 'city', 'state', 'pincode')),
+}
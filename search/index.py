@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.db import models
+from django.db.models import Value
+
+from search.backends import get_backend, terms
+from search.documents import DOCUMENTS
+
+# List ordering for ranked() querysets: the trailing id breaks ties, so the
+# composite cursor is unique
+SEARCH_ORDERING = ('search_rank', 'id')
+
+
+def max_results():
+    return getattr(settings, 'SEARCH_MAX_RESULTS', 1000)
+
+
+def has_terms(text):
+    return bool(terms(text))
+
+
+def search(kind, text):
+    """[(object_id, score)] for the best SEARCH_MAX_RESULTS matches, best first."""
+    return get_backend().search(kind, text, max_results())
+
+
+def search_ids(kind, text):
+    return [object_id for object_id, _ in search(kind, text)]
+
+
+def matching(kind, text, title_only=False):
+    """
+    Ids of every match, as a subquery for `event_id__in=`-style filters on
+    lists that keep their own ordering. Not capped at SEARCH_MAX_RESULTS.
+    title_only matches the name alone.
+    """
+    return get_backend().matching(kind, text, title_only)
+
+
+def ranked(queryset, kind, text):
+    """
+    Narrow `queryset` to the best SEARCH_MAX_RESULTS matches and annotate search_rank from the match score (lower is
+    better), for ordering by ('search_rank', 'id').
+    """
+    if not has_terms(text):
+        return queryset.none().annotate(search_rank=Value(0.0, output_field=models.FloatField()))
+    return get_backend().ranked(queryset, kind, text, max_results())
+
+
+# ---------------- INDEX UPKEEP ----------------
+def index_instance(kind, instance):
+    """Index one saved Event/Venue, or drop it when it is soft-deleted."""
+    document = DOCUMENTS[kind]
+    if instance.deleted_at is not None:
+        get_backend().delete(kind, [instance.pk])
+        return
+    values = [instance.pk, *(getattr(instance, field) for field in document.fields)]
+    get_backend().upsert(kind, [(instance.pk, *document.from_values(values))])
+
+
+def sync(kind, object_ids):
+    """
+    Re-index the given rows from the database, for writes that bypass
+    model signals (queryset.update() in the admin actions).
+    """
+    object_ids = set(object_ids)
+    documents = list(DOCUMENTS[kind].rows(ids=object_ids))
+    backend = get_backend()
+    backend.delete(kind, object_ids - {document[0] for document in documents})
+    backend.upsert(kind, documents)
+
+
+def rebuild(kinds=None, apps=None, connection=None, chunk_size=2000):
+    """Rebuild the index from scratch. Returns {kind: documents indexed}."""
+    backend = get_backend(connection)
+    counts = {}
+    for kind in kinds or DOCUMENTS:
+        backend.clear(kind)
+        counts[kind] = 0
+        with backend.bulk_load(kind):
+            batch = []
+            for document in DOCUMENTS[kind].rows(apps=apps, chunk_size=chunk_size):
+                batch.append(document)
+                if len(batch) >= chunk_size:
+                    backend.upsert(kind, batch)
+                    counts[kind] += len(batch)
+                    batch = []
+            backend.upsert(kind, batch)
+            counts[kind] += len(batch)
+    return counts
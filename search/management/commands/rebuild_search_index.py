@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from search.backends import get_backend
+from search.documents import DOCUMENTS
+from search.index import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for events and venues from the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--kind',
+            action='append',
+            choices=list(DOCUMENTS),
+            help="Only rebuild this document kind (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        backend.install()  # no-op when the tables exist
+        counts = rebuild(kinds=options['kind'])
+        summary = ', '.join(f"{count} {kind}s" for kind, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Indexed {summary} with {type(backend).__name__}."))
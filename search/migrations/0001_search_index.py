@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def install(apps, schema_editor):
+    from search.backends import get_backend
+    from search.index import rebuild
+
+    get_backend(schema_editor.connection).install()
+    rebuild(apps=apps, connection=schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    from search.backends import get_backend
+
+    get_backend(schema_editor.connection).uninstall()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_event_deleted_start_idx'),
+        ('venues', '0002_venue_deleted_name_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from events.models.event_model import Event
+from search import index
+from venues.models import Venue
+
+SENDERS = {Event: 'event', Venue: 'venue'}
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=Venue)
+def index_saved(sender, instance, raw=False, **kwargs):
+    # Saves include soft deletes and restores (deleted_at changes)
+    if not raw:
+        index.index_instance(SENDERS[sender], instance)
+
+
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=Venue)
+def unindex_deleted(sender, instance, **kwargs):
+    index.get_backend().delete(SENDERS[sender], [instance.pk])
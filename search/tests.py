@@ -0,0 +1,156 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib import admin
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from events.models.event_model import Event
+from search import index
+from search.backends import MySQLFullTextBackend, get_backend
+from slots.models.slot_model import Slot
+from slots.services.slot_search import SlotSearch
+from users.models import RolePermission, User, UserRole
+from venues.models import Venue
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        self.venue = Venue.objects.create(
+            name='Riverside Arena', address='12 Mill Road', city='Pune', state='MH', pincode='411001', capacity=100
+        )
+        self.concert = Event.objects.create(name='Jazz Festival', venue=self.venue, description='Live music')
+        self.talk = Event.objects.create(name='History Talk', venue=self.venue, description='Jazz in the 1920s')
+
+    def test_saves_are_indexed(self):
+        self.assertEqual(index.search_ids('event', 'jazz'), [self.concert.pk, self.talk.pk])
+        self.assertEqual(index.search_ids('venue', 'mill pune'), [self.venue.pk])
+        # prefix match on every word, not a substring anywhere
+        self.assertEqual(index.search_ids('event', 'fest'), [self.concert.pk])
+        self.assertEqual(index.search_ids('event', 'stival'), [])
+        self.assertEqual(index.search_ids('event', 'jazz talk'), [self.talk.pk])
+
+        self.concert.name = 'Blues Festival'
+        self.concert.save()
+        self.assertEqual(index.search_ids('event', 'jazz'), [self.talk.pk])
+        self.assertEqual(index.search_ids('event', 'blues'), [self.concert.pk])
+
+    def test_soft_and_hard_deletes_leave_the_index(self):
+        self.talk.deleted_at = timezone.now()
+        self.talk.save(update_fields=['deleted_at'])
+        self.assertEqual(index.search_ids('event', 'jazz'), [self.concert.pk])
+
+        self.concert.delete()
+        self.assertEqual(index.search_ids('event', 'jazz'), [])
+
+    def test_admin_actions_resync_the_index(self):
+        request = RequestFactory().post('/')
+        request.user = User.objects.create_superuser(username='root', password='pass1234', email='root@example.com')
+        request._messages = type('Messages', (), {'add': lambda *args, **kwargs: None})()
+        event_admin = admin.site._registry[Event]
+
+        event_admin.soft_delete_events(request, Event.objects.filter(pk=self.talk.pk))
+        self.assertEqual(index.search_ids('event', 'jazz'), [self.concert.pk])
+
+        event_admin.restore_events(request, Event.objects.filter(pk=self.talk.pk))
+        self.assertEqual(index.search_ids('event', 'jazz'), [self.concert.pk, self.talk.pk])
+
+    def test_rebuild_restores_a_cleared_index(self):
+        get_backend().clear('event')
+        self.assertEqual(index.search_ids('event', 'jazz'), [])
+
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(index.search_ids('event', 'jazz'), [self.concert.pk, self.talk.pk])
+
+
+class SearchListViewTests(TestCase):
+    def setUp(self):
+        role = UserRole.objects.create(name='Reader')
+        for module in ['Events', 'Venues', 'Bookings']:
+            RolePermission.objects.create(role=role, module_name=module, is_read=True)
+        user = User.objects.create_user(
+            username='reader', password='pass1234', email='reader@example.com', role=role, is_staff=True
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=str(RefreshToken.for_user(user).access_token))
+
+        self.venue = Venue.objects.create(
+            name='Harbour Hall', address='1 Dock Street', city='Mumbai', state='MH', pincode='400001', capacity=100
+        )
+        self.other = Venue.objects.create(
+            name='Harbour View Cafe', address='2 Sea Road', city='Goa', state='GA', pincode='403001', capacity=20
+        )
+        self.by_description = Event.objects.create(
+            name='Open Mic', venue=self.venue, description='Poetry by the harbour'
+        )
+        self.by_name = Event.objects.create(name='Harbour Lights', venue=self.venue, description='Lanterns')
+
+    def test_event_list_is_relevance_ranked(self):
+        response = self.client.get('/api/events/', {'search': 'harbour'})
+        ids = [event['id'] for event in response.data['results']['data']]
+        # a name match outranks a description match
+        self.assertEqual(ids, [self.by_name.pk, self.by_description.pk])
+
+    def test_venue_list_search_and_cursor(self):
+        response = self.client.get('/api/venues/', {'search': 'harbour', 'cursor': '', 'page_size': 1})
+        first = response.data['results']['data']
+        self.assertEqual(len(first), 1)
+
+        second = self.client.get(response.data['next']).data['results']['data']
+        self.assertEqual({first[0]['id'], second[0]['id']}, {self.venue.pk, self.other.pk})
+
+        response = self.client.get('/api/venues/', {'search': 'goa'})
+        self.assertEqual([venue['id'] for venue in response.data['results']['data']], [self.other.pk])
+
+    @override_settings(SEARCH_MAX_RESULTS=1)
+    def test_only_ranked_lists_are_capped(self):
+        response = self.client.get('/api/events/', {'search': 'harbour'})
+        self.assertEqual([event['id'] for event in response.data['results']['data']], [self.by_name.pk])
+
+        start = timezone.now() + timedelta(days=1)
+        slots = [
+            Slot.objects.create(event=event, start_time=start + timedelta(hours=i),
+                                end_time=start + timedelta(hours=i + 1), capacity=5)
+            for i, event in enumerate([self.by_name, self.by_description])
+        ]
+        found = SlotSearch(search='harbour').queryset().filter(event__venue=self.venue)
+        self.assertEqual(sorted(found.values_list('pk', flat=True)), [slot.pk for slot in slots])
+
+    def test_slot_and_booking_lists_match_names_only(self):
+        start = timezone.now() + timedelta(days=1)
+        elsewhere = Venue.objects.create(
+            name='Town Hall', address='3 Harbour Lane', city='Pune', state='MH', pincode='411002', capacity=50
+        )
+        quiet = Event.objects.create(name='Book Club', venue=elsewhere, description='By the harbour')
+        by_name, by_description = [
+            Slot.objects.create(event=event, start_time=start + timedelta(hours=i),
+                                end_time=start + timedelta(hours=i + 1), capacity=5)
+            for i, event in enumerate([self.by_name, quiet])
+        ]
+        # 'harbour' is only in the description of the event and the address of its venue
+        found = SlotSearch(search='harbour').queryset()
+        self.assertIn(by_name, found)
+        self.assertNotIn(by_description, found)
+        self.assertEqual(list(SlotSearch(search='town').queryset()), [by_description])
+
+    def test_no_matches_and_blank_search(self):
+        self.assertEqual(self.client.get('/api/events/', {'search': 'opera'}).data['results']['data'], [])
+        self.assertEqual(len(self.client.get('/api/events/', {'search': ' '}).data['results']['data']), 2)
+
+
+class MySQLFullTextBackendTests(TestCase):
+    def test_words_shorter_than_the_token_size_are_matched_with_like(self):
+        backend = MySQLFullTextBackend(connection=None)
+        where, params = backend._where('search_event', 'DJ night_owl', columns=('title',))
+        self.assertEqual(
+            where,
+            "MATCH(search_event.title) AGAINST (%s IN BOOLEAN MODE) AND CONCAT_WS(' ', search_event.title) LIKE %s",
+        )
+        self.assertEqual(params, ['+night_owl*', '%dj%'])
+
+        where, params = backend._where('search_event', 'a b')
+        self.assertNotIn('MATCH', where)
+        self.assertEqual(params, ['%a%', '%b%'])
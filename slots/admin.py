@@ -1,11 +1,38 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.core.exceptions import ValidationError
 from django.utils import timezone
 from slots.models.slot_model import Slot
-from middleware.admin_administration_helpers import check_role_permission
+from slots.services import venue_schedule
+from eventslotbooking_project.admin_filters import related_list_filter
+from middleware.admin_administration_helpers import check_request_permission
+
+
+class SlotAdminForm(forms.ModelForm):
+    class Meta:
+        model = Slot
+        fields = '__all__'
+
+    def clean(self):
+        cleaned_data = super().clean()
+        event = cleaned_data.get('event')
+        start_time, end_time = cleaned_data.get('start_time'), cleaned_data.get('end_time')
+        if event and start_time and end_time and self.instance.deleted_at is None:
+            if end_time <= start_time:
+                raise forms.ValidationError("Slot end time must be after the start time.")
+            if end_time - start_time > venue_schedule.MAX_SLOT_LENGTH:
+                raise forms.ValidationError("A slot can last at most 24 hours.")
+            overlapping = venue_schedule.overlapping_slot(
+                event.venue_id, start_time, end_time, exclude_slot_id=self.instance.pk
+            )
+            if overlapping:
+                raise forms.ValidationError(f"Slot overlaps slot {overlapping[0]} at this venue.")
+        return cleaned_data
 
 
 @admin.register(Slot)
 class SlotAdmin(admin.ModelAdmin):
+    form = SlotAdminForm
     list_display = [
         'id', 'event', 'start_time', 'end_time',
         'capacity', 'booked_capacity_display', 'remaining_capacity_display',
@@ -13,11 +40,14 @@ class SlotAdmin(admin.ModelAdmin):
     ]
     search_fields = ['event__name', 'event__venue__name']
     list_filter = [
-        'event', 'is_blocked', 'capacity',
+        ('event', related_list_filter('venue')), 'is_blocked', 'capacity',
         ('start_time', admin.DateFieldListFilter)
     ]
     ordering = ['start_time']
     list_per_page = 10
+    list_select_related = ['event__venue']
+    # Skip the second, unfiltered COUNT(*) of the whole table
+    show_full_result_count = False
     readonly_fields = ['created_at', 'updated_at', 'deleted_at']
     actions = ['block_slots', 'unblock_slots', 'soft_delete_slots', 'restore_slots']
 
@@ -33,28 +63,36 @@ class SlotAdmin(admin.ModelAdmin):
     # ✅ CONTROL MODULE VISIBILITY IN ADMIN DASHBOARD
     # ------------------------------------------------
     def has_module_permission(self, request):
-        return check_role_permission(request.user, 'Slots', 'read')
+        return check_request_permission(request, 'Slots', 'read')
 
     def has_view_permission(self, request, obj=None):
-        return check_role_permission(request.user, 'Slots', 'read')
+        return check_request_permission(request, 'Slots', 'read')
 
     def has_add_permission(self, request):
-        return check_role_permission(request.user, 'Slots', 'create')
+        return check_request_permission(request, 'Slots', 'create')
 
     def has_change_permission(self, request, obj=None):
-        return check_role_permission(request.user, 'Slots', 'update')
+        return check_request_permission(request, 'Slots', 'update')
 
     def has_delete_permission(self, request, obj=None):
-        return check_role_permission(request.user, 'Slots', 'delete')
+        return check_request_permission(request, 'Slots', 'delete')
+
+    def save_model(self, request, obj, form, change):
+        # save() repeats the form's overlap check under the venue lock; a
+        # concurrent save that got in first is reported, not a server error
+        try:
+            obj.save()
+        except ValidationError as e:
+            self.message_user(request, f"❌ {' '.join(e.messages)}", level=messages.ERROR)
 
     # ------------------------------------------------
     # ✅ BULK ACTIONS (Visible Only If Allowed)
     # ------------------------------------------------
     def get_actions(self, request):
         actions = super().get_actions(request)
-        if not check_role_permission(request.user, 'Slots', 'delete'):
+        if not check_request_permission(request, 'Slots', 'delete'):
             actions.pop('soft_delete_slots', None)
-        if not check_role_permission(request.user, 'Slots', 'update'):
+        if not check_request_permission(request, 'Slots', 'update'):
             actions.pop('restore_slots', None)
             actions.pop('block_slots', None)
             actions.pop('unblock_slots', None)
@@ -64,21 +102,37 @@ class SlotAdmin(admin.ModelAdmin):
     # ✅ CUSTOM ACTIONS
     # ------------------------------------------------
     def block_slots(self, request, queryset):
-        updated = queryset.update(is_blocked=True)
+        updated = queryset.update_and_sync(is_blocked=True)
         self.message_user(request, f"{updated} slot(s) blocked.")
     block_slots.short_description = "Block selected slots"
 
     def unblock_slots(self, request, queryset):
-        updated = queryset.update(is_blocked=False)
+        updated = queryset.update_and_sync(is_blocked=False)
         self.message_user(request, f"{updated} slot(s) unblocked.")
     unblock_slots.short_description = "Unblock selected slots"
 
     def soft_delete_slots(self, request, queryset):
-        updated = queryset.update(deleted_at=timezone.now())
+        updated = queryset.update_and_sync(deleted_at=timezone.now())
         self.message_user(request, f"{updated} slot(s) soft deleted.")
     soft_delete_slots.short_description = "Soft delete selected slots"
 
     def restore_slots(self, request, queryset):
-        updated = queryset.update(deleted_at=None)
-        self.message_user(request, f"{updated} slot(s) restored.")
+        # One at a time: save() checks each against the venue, under its lock
+        restored, skipped = 0, []
+        for slot in queryset.filter(deleted_at__isnull=False).order_by('start_time'):
+            slot.deleted_at = None
+            try:
+                slot.save(update_fields=['deleted_at', 'updated_at'])
+            except ValidationError:
+                skipped.append(slot.pk)
+                continue
+            restored += 1
+        self.message_user(request, f"{restored} slot(s) restored.")
+        if skipped:
+            self.message_user(
+                request,
+                f"{len(skipped)} slot(s) overlap another slot at their venue and were not restored: "
+                + ', '.join(map(str, skipped)),
+                level=messages.WARNING,
+            )
     restore_slots.short_description = "Restore selected slots"
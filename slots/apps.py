@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SlotsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "slots"
+
+    def ready(self):
+        import slots.signals  # noqa: F401  Response cache invalidation, venue schedule upkeep
@@ -0,0 +1,111 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils.dateparse import parse_date
+
+from bookings.management.commands.explain_hot_queries import RollbackSeed
+from bookings.services.perf_seed import PerfDataSeeder
+from slots.models.slot_model import Slot
+from slots.services.slot_search import SlotSearch
+
+PAGE_SIZE = 10
+
+
+def legacy_queryset(params):
+    """slot_list's filtering before SlotSearch, kept as the benchmark baseline."""
+    search = params.get('search', '')
+    slots = Slot.objects.filter(deleted_at__isnull=True).filter(
+        Q(event__name__icontains=search) |
+        Q(event__venue__name__icontains=search)
+    )
+    if params.get('event'):
+        slots = slots.filter(event_id=params['event'])
+    if params.get('date'):
+        slots = slots.filter(start_time__date=parse_date(params['date']))
+    if params.get('start_date'):
+        slots = slots.filter(start_time__date__gte=parse_date(params['start_date']))
+    if params.get('end_date'):
+        slots = slots.filter(end_time__date__lte=parse_date(params['end_date']))
+    return slots
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the query plan and latency of the old slot_list filtering with SlotSearch "
+        "for common query params, optionally on a throwaway table of --slots rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--slots',
+            type=int,
+            default=0,
+            help="Seed this many slots (e.g. 1000000) in a transaction that is rolled back "
+                 "afterwards; 0 uses the existing data.",
+        )
+        parser.add_argument('--repeat', type=int, default=5, help="Timed runs per query.")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                if options['slots']:
+                    self._seed(options['slots'])
+                self._compare_all(options['repeat'])
+                if options['slots']:
+                    raise RollbackSeed
+        except RollbackSeed:
+            pass
+
+    def cases(self):
+        slot = Slot.objects.filter(deleted_at__isnull=True).select_related('event__venue').order_by('pk').first()
+        if slot is None:
+            return []
+        day = slot.start_time.date()
+        return [
+            ("no filters", {}),
+            ("?date", {'date': str(day)}),
+            ("?start_date&end_date", {'start_date': str(day), 'end_date': str(day + timedelta(days=7))}),
+            ("?event", {'event': str(slot.event_id)}),
+            ("?search", {'search': slot.event.venue.name}),
+        ]
+
+    def _compare_all(self, repeat):
+        cases = self.cases()
+        if not cases:
+            self.stdout.write(self.style.WARNING("No slots; pass --slots N to seed a throwaway table."))
+            return
+        self.stdout.write(f"{Slot.objects.count()} slots on {connection.vendor}\n")
+        for label, params in cases:
+            before = legacy_queryset(params).order_by('start_time', 'id')
+            after = SlotSearch(**params).queryset().order_by('start_time', 'id')
+            self.stdout.write(self.style.MIGRATE_HEADING(f"== {label} {params}"))
+            for name, queryset in (("before", before), ("after", after)):
+                self.stdout.write(f"-- {name}: {self._timed(queryset, repeat):.2f} ms (count + first page)")
+                self.stdout.write(queryset[:PAGE_SIZE].explain())
+            self.stdout.write("")
+
+    @staticmethod
+    def _timed(queryset, repeat):
+        """Median time for what a paginated slot_list runs: COUNT(*) and one page."""
+        timings = []
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            queryset.count()
+            list(queryset[:PAGE_SIZE])
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    def _seed(self, slots):
+        venues = max(slots // 10000, 1)
+        slots_per_event = max(slots // (venues * 100), 1)
+        PerfDataSeeder(
+            venues=venues, events_per_venue=100, slots_per_event=slots_per_event,
+            users=0, bookings=0, tag='slot-search', log=self.stdout.write,
+        ).run()
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q, Sum
+
+from bookings.models.booking_model import Booking
+from middleware.response_cache import bump_versions
+from slots.models.slot_model import Slot
+
+
+class Command(BaseCommand):
+    help = "Rebuild (or verify with --check) the Slot approved/pending/held attendee counters from bookings."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help="Only report slots whose counters drifted; exit non-zero if any did.",
+        )
+        parser.add_argument(
+            '--slot',
+            type=int,
+            action='append',
+            dest='slot_ids',
+            help="Limit to the given slot id (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        slots = Slot.objects.all()
+        if options['slot_ids']:
+            slots = slots.filter(pk__in=options['slot_ids'])
+
+        # One grouped aggregate for the real sums instead of one per slot
+        totals = {
+            row['slot_id']: row
+            for row in Booking.objects.filter(deleted_at__isnull=True, slot__in=slots)
+            .values('slot_id')
+            .annotate(
+                approved_attendees=Sum('attendees_count', filter=Q(booking_status=Booking.Status.APPROVED)),
+                pending_attendees=Sum('attendees_count', filter=Q(booking_status=Booking.Status.PENDING)),
+                held_attendees=Sum('attendees_count', filter=Q(booking_status=Booking.Status.HELD)),
+            )
+        }
+
+        drifted = []
+        for slot_id, *counters in slots.values_list('pk', *Slot.COUNTER_FIELDS).iterator():
+            row = totals.get(slot_id, {})
+            stored = dict(zip(Slot.COUNTER_FIELDS, counters))
+            expected = {field: row.get(field) or 0 for field in Slot.COUNTER_FIELDS}
+            if stored != expected:
+                drifted.append((slot_id, stored, expected))
+
+        def describe(counters):
+            return ' '.join(f"{field.split('_')[0]}={counters[field]}" for field in Slot.COUNTER_FIELDS)
+
+        for slot_id, stored, expected in drifted:
+            self.stdout.write(f"Slot {slot_id}: stored {describe(stored)}, actual {describe(expected)}")
+
+        if options['check']:
+            if drifted:
+                raise CommandError(f"{len(drifted)} slot(s) have drifted counters.")
+            self.stdout.write(self.style.SUCCESS("All slot counters match booking totals."))
+            return
+
+        with transaction.atomic():
+            for slot_id, _, _ in drifted:
+                # Recompute under lock so concurrent bookings are not lost
+                slot = Slot.objects.select_for_update().get(pk=slot_id)
+                Slot.objects.filter(pk=slot_id).update(**slot.counted_attendees())
+            if drifted:
+                bump_versions('slot')  # update() skips the post_save signal
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt counters for {len(drifted)} slot(s)."))
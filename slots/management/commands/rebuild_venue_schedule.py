@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from slots.services import venue_schedule
+
+
+class Command(BaseCommand):
+    help = "Rebuild the venue schedule index from the slots and report slots that share a venue and time."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help="Exit non-zero if any live slots overlap at a venue.",
+        )
+
+    def handle(self, *args, **options):
+        entries = venue_schedule.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {entries} slot(s)."))
+
+        found = venue_schedule.overlaps()
+        for slot_id, other_slot_id in found:
+            self.stdout.write(f"Slot {other_slot_id} overlaps slot {slot_id} at the same venue.")
+        if found and options['check']:
+            raise CommandError(f"{len(found)} overlapping slot pair(s).")
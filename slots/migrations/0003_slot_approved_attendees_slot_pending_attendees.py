@@ -0,0 +1,42 @@
+from django.db import migrations, models
+from django.db.models import Q, Sum
+
+
+def backfill_attendee_counters(apps, schema_editor):
+    Slot = apps.get_model('slots', 'Slot')
+    Booking = apps.get_model('bookings', 'Booking')
+    totals = (
+        Booking.objects.filter(deleted_at__isnull=True)
+        .values('slot_id')
+        .annotate(
+            approved=Sum('attendees_count', filter=Q(booking_status='APPROVED')),
+            pending=Sum('attendees_count', filter=Q(booking_status='PENDING')),
+        )
+    )
+    for row in totals:
+        Slot.objects.filter(pk=row['slot_id']).update(
+            approved_attendees=row['approved'] or 0,
+            pending_attendees=row['pending'] or 0,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_alter_booking_options_alter_booking_booking_status_and_more'),
+        ('slots', '0002_alter_slot_options_alter_slot_end_time_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='slot',
+            name='approved_attendees',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='slot',
+            name='pending_attendees',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_attendee_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_event_deleted_start_idx'),
+        ('slots', '0003_slot_approved_attendees_slot_pending_attendees'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='slot',
+            index=models.Index(fields=['event', 'deleted_at', 'start_time'], name='slot_event_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='slot',
+            index=models.Index(fields=['deleted_at', 'start_time'], name='slot_deleted_start_idx'),
+        ),
+    ]
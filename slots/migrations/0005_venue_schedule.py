@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_venue_schedule(apps, schema_editor):
+    Slot = apps.get_model('slots', 'Slot')
+    VenueScheduleEntry = apps.get_model('slots', 'VenueScheduleEntry')
+    live = Slot.objects.filter(deleted_at__isnull=True, event__deleted_at__isnull=True)
+    VenueScheduleEntry.objects.bulk_create(
+        (
+            VenueScheduleEntry(slot_id=slot_id, venue_id=venue_id, start_time=start_time, end_time=end_time)
+            for slot_id, venue_id, start_time, end_time
+            in live.values_list('pk', 'event__venue_id', 'start_time', 'end_time').iterator()
+        ),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('slots', '0004_slot_indexes'),
+        ('events', '0003_event_deleted_start_idx'),
+        ('venues', '0002_venue_deleted_name_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VenueScheduleEntry',
+            fields=[
+                ('slot', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='schedule_entry', serialize=False, to='slots.slot')),
+                ('start_time', models.DateTimeField()),
+                ('end_time', models.DateTimeField()),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='venues.venue')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['venue', 'start_time'], name='venue_schedule_start_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_venue_schedule, migrations.RunPython.noop),
+    ]
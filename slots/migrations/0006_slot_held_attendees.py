@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('slots', '0005_venue_schedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='slot',
+            name='held_attendees',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('slots', '0006_slot_held_attendees'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='slot',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
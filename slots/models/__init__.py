@@ -1 +1,2 @@
 from .slot_model import Slot
+from .venue_schedule_model import VenueScheduleEntry
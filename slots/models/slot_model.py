@@ -1,30 +1,205 @@
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import Case, F, When
+from django.dispatch import Signal
 from events.models.event_model import Event
+from eventslotbooking_project.versioning import VersionedModel
+from middleware.response_cache import bump_versions
 
+# Sent with slot_ids when approved or held seats are given back (cancellations,
+# hold expiry, deletes); bookings/signals.py starts waitlist promotion
+capacity_released = Signal()
 
-class Slot(models.Model):
+
+class Slot(VersionedModel):
     event = models.ForeignKey('events.Event', on_delete=models.CASCADE)
     start_time = models.DateTimeField()
     end_time = models.DateTimeField()
     capacity = models.PositiveIntegerField()
     is_blocked = models.BooleanField(default=False)
+
+    # Denormalized attendee counters, maintained by Booking writes (see
+    # Booking.save() and BookingQuerySet.update_with_counters()).
+    approved_attendees = models.PositiveIntegerField(default=0, editable=False)
+    pending_attendees = models.PositiveIntegerField(default=0, editable=False)
+    held_attendees = models.PositiveIntegerField(default=0, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
 
-    def approved_attendees(self):
-        from bookings.models.booking_model import Booking  # local import to avoid circular dependency
-        return self.booking_set.filter(
-            booking_status=Booking.Status.APPROVED,
-            deleted_at__isnull=True
-        ).aggregate(models.Sum('attendees_count'))['attendees_count__sum'] or 0
+    COUNTER_FIELDS = ('approved_attendees', 'pending_attendees', 'held_attendees')
+    # Counters that take up capacity: approvals and unexpired holds
+    OCCUPYING_FIELDS = ('approved_attendees', 'held_attendees')
+    SYNC_BY_ID = True
+
+    class Meta:
+        indexes = [
+            # slot_list ?event= and the per-event overlap check
+            models.Index(fields=['event', 'deleted_at', 'start_time'], name='slot_event_start_idx'),
+            # slot_list ordered by start_time
+            models.Index(fields=['deleted_at', 'start_time'], name='slot_deleted_start_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets post_save receivers tell a capacity increase from other edits
+        instance._loaded_capacity = instance.__dict__.get('capacity')
+        instance._loaded_schedule = instance._schedule_key()
+        return instance
+
+    def _schedule_key(self):
+        fields = ('event_id', 'start_time', 'end_time', 'deleted_at')
+        return tuple(self.__dict__.get(field) for field in fields)
+
+    def save(self, *args, **kwargs):
+        # A write that puts the slot somewhere new in its venue's schedule
+        # takes the venue lock and re-checks for overlaps under it: the
+        # serializer and admin form checks run earlier, without the lock,
+        # so two concurrent writes could both pass them.
+        if self.deleted_at is not None or getattr(self, '_loaded_schedule', None) == self._schedule_key():
+            super().save(*args, **kwargs)
+        else:
+            self._save_in_schedule(*args, **kwargs)
+        self._loaded_schedule = self._schedule_key()
+
+    def _save_in_schedule(self, *args, **kwargs):
+        from slots.services import venue_schedule  # local import to avoid circular dependency
+        event = Event.objects.filter(pk=self.event_id).values('venue_id', 'deleted_at').first()
+        if event is None or event['deleted_at'] is not None:
+            return super().save(*args, **kwargs)
+        if self.end_time - self.start_time > venue_schedule.MAX_SLOT_LENGTH:
+            raise ValidationError("A slot can last at most 24 hours.")
+        with transaction.atomic(using=kwargs.get('using')):
+            venue_schedule.lock_venue(event['venue_id'])
+            overlapping = venue_schedule.overlapping_slot(
+                event['venue_id'], self.start_time, self.end_time, exclude_slot_id=self.pk
+            )
+            if overlapping:
+                raise ValidationError(venue_schedule.overlap_message(overlapping, self.event_id))
+            super().save(*args, **kwargs)
+
+    @classmethod
+    def sync_updated(cls, ids):
+        from slots.services import venue_schedule  # local import to avoid circular dependency
+        venue_schedule.sync(cls.objects.filter(pk__in=ids))
+        super().sync_updated(ids)
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        # The counters are only moved by F() updates under the slot row lock
+        # (apply_attendee_deltas); a save() of this instance must not write
+        # back the values it loaded, or it wipes out bookings made since.
+        # Only an explicit update_fields naming them writes them.
+        values = [
+            value for value in values
+            if value[0].name not in self.COUNTER_FIELDS or (update_fields and value[0].name in update_fields)
+        ]
+        return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
 
     def remaining_capacity(self):
-        remaining = self.capacity - self.approved_attendees()
+        # From the counter columns: no per-row query over bookings
+        remaining = self.capacity - self.approved_attendees - self.held_attendees
         return max(remaining, 0)
 
     def booked_capacity(self):
         return self.capacity - self.remaining_capacity()
 
+    def counted_attendees(self):
+        """
+        Real attendee sums from the booking table, keyed like COUNTER_FIELDS.
+        Only for rebuilding/verifying the denormalized counters
+        (rebuild_slot_counters); reads use the counter columns.
+        """
+        from bookings.models.booking_model import Booking  # local import to avoid circular dependency
+        sums = self.booking_set.filter(deleted_at__isnull=True).aggregate(
+            approved_attendees=models.Sum(
+                'attendees_count', filter=models.Q(booking_status=Booking.Status.APPROVED)
+            ),
+            pending_attendees=models.Sum(
+                'attendees_count', filter=models.Q(booking_status=Booking.Status.PENDING)
+            ),
+            held_attendees=models.Sum(
+                'attendees_count', filter=models.Q(booking_status=Booking.Status.HELD)
+            ),
+        )
+        return {field: sums[field] or 0 for field in self.COUNTER_FIELDS}
+
+    @classmethod
+    def apply_attendee_deltas(cls, deltas):
+        """
+        Apply counter changes atomically with F() expressions.
+        deltas: {slot_id: {'approved_attendees': +n, 'pending_attendees': -m}}
+
+        Changes that take up more capacity (approved plus held attendees)
+        are admitted with a conditional UPDATE ... WHERE approved_attendees +
+        held_attendees + n <= capacity, which takes the slot row lock for the
+        rest of the caller's transaction. Raises ValidationError when a slot
+        has no room left. All other changes (releases, and holds turning
+        into approvals) are applied to every slot at once with a single
+        CASE UPDATE; slots that got seats back are sent in capacity_released.
+        Either way the cached slot responses are invalidated.
+        """
+        releases, admitted_any = {}, False
+        for slot_id, changes in sorted(deltas.items()):
+            changes = {field: delta for field, delta in changes.items() if delta}
+            if not changes:
+                continue
+            occupied_delta = sum(changes.get(field, 0) for field in cls.OCCUPYING_FIELDS)
+            if occupied_delta <= 0:
+                releases[slot_id] = changes
+                continue
+            admitted = cls.objects.filter(
+                pk=slot_id, capacity__gte=F('approved_attendees') + F('held_attendees') + occupied_delta
+            ).update(**{field: cls._shifted(field, delta) for field, delta in changes.items()})
+            if not admitted:
+                if changes.get('approved_attendees', 0) > 0:
+                    raise ValidationError({'slot': "Cannot approve booking: slot capacity exceeded."})
+                raise ValidationError({'slot': "Cannot hold seats: slot capacity exceeded."})
+            admitted_any = True
+        if admitted_any:
+            bump_versions('slot')
+
+        if releases:
+            freed = [
+                slot_id for slot_id, changes in releases.items()
+                if sum(changes.get(field, 0) for field in cls.OCCUPYING_FIELDS) < 0
+            ]
+            cls.shift_counters(releases)
+            if freed:
+                capacity_released.send(sender=cls, slot_ids=freed)
+
+    @classmethod
+    def shift_counters(cls, deltas):
+        """
+        Apply counter changes to every slot at once with a single CASE
+        UPDATE and no capacity check: for releases, and for callers that
+        hold the slot row locks and have checked capacity themselves.
+        Invalidates the cached slot responses.
+        """
+        deltas = {slot_id: changes for slot_id, changes in deltas.items() if changes}
+        if not deltas:
+            return
+        fields = {field for changes in deltas.values() for field in changes}
+        cls.objects.filter(pk__in=deltas).update(**{
+            field: Case(
+                *[
+                    When(pk=slot_id, then=cls._shifted(field, changes[field]))
+                    for slot_id, changes in deltas.items()
+                    if field in changes
+                ],
+                default=F(field),
+                output_field=models.PositiveIntegerField(),
+            )
+            for field in fields
+        })
+        bump_versions('slot')
+
+    @staticmethod
+    def _shifted(field, delta):
+        # Subtract positive numbers rather than adding negatives: unsigned
+        # MySQL columns reject negative intermediate values.
+        return F(field) + delta if delta > 0 else F(field) - abs(delta)
+
     def __str__(self):
-        return f"{self.event.name} | {self.start_time.strftime('%b %d %Y, %I:%M %p')} - {self.end_time.strftime('%I:%M %p')}"
\ No newline at end of file
+        return f"{self.event.name} | {self.start_time.strftime('%b %d %Y, %I:%M %p')} - {self.end_time.strftime('%I:%M %p')}"
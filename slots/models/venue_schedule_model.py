@@ -0,0 +1,22 @@
+from django.db import models
+
+
+class VenueScheduleEntry(models.Model):
+    """
+    The time a live slot occupies its venue, denormalized from Slot and
+    Event so overlap checks across all of a venue's events are a single
+    (venue, start_time) index lookup. Kept in sync by slots.services.venue_schedule.
+    """
+    slot = models.OneToOneField('slots.Slot', on_delete=models.CASCADE, primary_key=True,
+                                related_name='schedule_entry')
+    venue = models.ForeignKey('venues.Venue', on_delete=models.CASCADE, related_name='+')
+    start_time = models.DateTimeField()
+    end_time = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['venue', 'start_time'], name='venue_schedule_start_idx'),
+        ]
+
+    def __str__(self):
+        return f"Venue {self.venue_id}: slot {self.slot_id} {self.start_time:%Y-%m-%d %H:%M} - {self.end_time:%H:%M}"
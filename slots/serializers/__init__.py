@@ -1 +1 @@
-from .slot_serializer import SlotSerializer
+from .slot_serializer import SlotSerializer, SlotRecurrenceSerializer
@@ -1,6 +1,11 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 from django.utils import timezone
 from slots.models.slot_model import Slot
+from slots.services import venue_schedule
 
 
 class SlotSerializer(serializers.ModelSerializer):
@@ -45,6 +50,9 @@ class SlotSerializer(serializers.ModelSerializer):
         if end_time and end_time <= start_time:
             raise serializers.ValidationError("Slot end time must be after the start time.")
 
+        if start_time and end_time and end_time - start_time > venue_schedule.MAX_SLOT_LENGTH:
+            raise serializers.ValidationError("A slot can last at most 24 hours.")
+
         if event:
             if start_time and start_time.date() < event.start_date:
                 raise serializers.ValidationError("Slot start time must fall within the event dates.")
@@ -54,17 +62,79 @@ class SlotSerializer(serializers.ModelSerializer):
         if event and capacity and capacity > event.venue.capacity:
             raise serializers.ValidationError("Slot capacity cannot exceed the venue capacity.")
 
-        # Prevent overlapping slots for the same event
+        # Prevent overlapping slots at the venue, across all of its events
         if event and start_time and end_time:
-            overlapping = Slot.objects.filter(
-                event=event,
-                deleted_at__isnull=True,
-                start_time__lt=end_time,
-                end_time__gt=start_time,
+            overlapping = venue_schedule.overlapping_slot(
+                event.venue_id, start_time, end_time, exclude_slot_id=getattr(self.instance, 'pk', None)
             )
-            if self.instance:
-                overlapping = overlapping.exclude(pk=self.instance.pk)
-            if overlapping.exists():
-                raise serializers.ValidationError("Slot overlaps with an existing slot for this event.")
+            if overlapping:
+                raise serializers.ValidationError(venue_schedule.overlap_message(overlapping, event.pk))
 
         return attrs
+
+    # Slot.save() repeats the overlap check under the venue lock
+    def create(self, validated_data):
+        try:
+            return super().create(validated_data)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError({'non_field_errors': e.messages})
+
+    def update(self, instance, validated_data):
+        try:
+            return super().update(instance, validated_data)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError({'non_field_errors': e.messages})
+
+
+class SlotRecurrenceSerializer(serializers.Serializer):
+    """Recurrence rule for POST /api/events/<id>/slots/generate/ (event passed in context)."""
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+    weekdays = serializers.ListField(
+        child=serializers.IntegerField(min_value=0, max_value=6),
+        allow_empty=False,
+        max_length=7,
+        help_text="0 = Monday ... 6 = Sunday",
+    )
+    day_start = serializers.TimeField()
+    day_end = serializers.TimeField()
+    slot_minutes = serializers.IntegerField(min_value=5, max_value=24 * 60)
+    gap_minutes = serializers.IntegerField(min_value=0, max_value=24 * 60, default=0)
+    capacity = serializers.IntegerField(min_value=1)
+    is_blocked = serializers.BooleanField(default=False)
+    exclude_dates = serializers.ListField(child=serializers.DateField(), default=list, max_length=366)
+    dry_run = serializers.BooleanField(default=False)
+    skip_conflicts = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        event = self.context['event']
+        attrs.setdefault('start_date', max(event.start_date, timezone.now().date()))
+        attrs.setdefault('end_date', event.end_date)
+
+        if attrs['start_date'] > attrs['end_date']:
+            raise serializers.ValidationError("Start date cannot be after end date.")
+        if attrs['start_date'] < event.start_date or attrs['end_date'] > event.end_date:
+            raise serializers.ValidationError("Slots must fall within the event dates.")
+        if attrs['day_start'] >= attrs['day_end']:
+            raise serializers.ValidationError("Daily window must end after it starts.")
+        if attrs['capacity'] > event.venue.capacity:
+            raise serializers.ValidationError("Slot capacity cannot exceed the venue capacity.")
+
+        day_minutes = (attrs['day_end'].hour - attrs['day_start'].hour) * 60 + \
+            attrs['day_end'].minute - attrs['day_start'].minute
+        per_day = (day_minutes + attrs['gap_minutes']) // (attrs['slot_minutes'] + attrs['gap_minutes'])
+        limit = settings.SLOT_GENERATION_MAX
+        if per_day * self._matching_days(attrs) > limit:
+            raise serializers.ValidationError(f"The rule would generate more than {limit} slots.")
+        return attrs
+
+    @staticmethod
+    def _matching_days(attrs):
+        weekdays = set(attrs['weekdays'])
+        excluded = set(attrs['exclude_dates'])
+        matching = 0
+        for offset in range((attrs['end_date'] - attrs['start_date']).days + 1):
+            day = attrs['start_date'] + timedelta(days=offset)
+            if day.weekday() in weekdays and day not in excluded:
+                matching += 1
+        return matching
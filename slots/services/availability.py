@@ -0,0 +1,93 @@
+import json
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import Case, Count, F, Q, Sum, When
+from django.db.models.functions import Coalesce, TruncDate, TruncHour
+
+from slots.models.slot_model import Slot
+from slots.services.slot_search import day_start
+
+GRANULARITIES = {
+    'day': TruncDate,
+    'hour': TruncHour,
+}
+
+# Keys of one availability bucket
+BUCKET_FIELDS = ('bucket', 'slots', 'blocked_slots', 'capacity', 'approved_attendees',
+                 'pending_attendees', 'held_attendees', 'remaining_capacity')
+
+# Longest ?from=&to= range, so an hourly request stays bounded
+MAX_RANGE_DAYS = 366
+
+
+def _sum(expression, condition=None):
+    return Coalesce(Sum(expression, filter=condition), 0, output_field=models.IntegerField())
+
+
+def availability_buckets(event_id, start_date, end_date, granularity='day'):
+    """
+    Yield the per-day (or per-hour) capacity of one event's slots that
+    start between start_date and end_date (inclusive), from one grouped
+    aggregate over the (event, deleted_at, start_time) index. Attendee
+    totals come from the slot counters, so no booking rows are read.
+
+    Blocked slots count toward blocked_slots and attendee totals but add
+    no capacity: they cannot be booked. Buckets without slots are omitted.
+    """
+    unblocked = Q(is_blocked=False)
+    rows = (
+        Slot.objects.filter(
+            event_id=event_id,
+            deleted_at__isnull=True,
+            start_time__gte=day_start(start_date),
+            start_time__lt=day_start(end_date + timedelta(days=1)),
+        )
+        .annotate(
+            bucket=GRANULARITIES[granularity]('start_time'),
+            # capacity - approved - held, floored at 0 (capacity may have been lowered
+            # below the approved total); unsigned MySQL columns must not go negative
+            slot_remaining=Case(
+                When(capacity__lte=F('approved_attendees') + F('held_attendees'), then=0),
+                default=F('capacity') - F('approved_attendees') - F('held_attendees'),
+                output_field=models.IntegerField(),
+            ),
+        )
+        .order_by()
+        .values('bucket')
+        .annotate(
+            slot_count=Count('pk'),
+            blocked_count=Count('pk', filter=Q(is_blocked=True)),
+            capacity_total=_sum('capacity', unblocked),
+            approved_total=_sum('approved_attendees'),
+            pending_total=_sum('pending_attendees'),
+            held_total=_sum('held_attendees'),
+            remaining_total=_sum('slot_remaining', unblocked),
+        )
+        .order_by('bucket')
+        .values_list('bucket', 'slot_count', 'blocked_count', 'capacity_total',
+                     'approved_total', 'pending_total', 'held_total', 'remaining_total')
+    )
+    for row in rows.iterator():
+        yield dict(zip(BUCKET_FIELDS, row))
+
+
+def stream_availability(event_id, start_date, end_date, granularity):
+    """
+    The availability response as JSON chunks, one bucket at a time, in the
+    usual {"message", "data"} envelope.
+    """
+    header = {
+        'event': event_id,
+        'from': start_date,
+        'to': end_date,
+        'granularity': granularity,
+    }
+    yield '{"message": "Availability fetched successfully", "data": '
+    yield json.dumps(header, cls=DjangoJSONEncoder)[:-1] + ', "buckets": ['
+    separator = ''
+    for bucket in availability_buckets(event_id, start_date, end_date, granularity):
+        yield separator + json.dumps(bucket, cls=DjangoJSONEncoder)
+        separator = ', '
+    yield ']}}'
@@ -0,0 +1,115 @@
+import heapq
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from middleware.response_cache import bump_versions
+from slots.models.slot_model import Slot
+from slots.services import venue_schedule
+
+BULK_BATCH_SIZE = 500
+
+
+@dataclass
+class SlotRecurrence:
+    """
+    A weekly recurrence: on every `weekdays` date (0 = Monday) between
+    start_date and end_date that is not excluded, back-to-back slots of
+    slot_minutes, separated by gap_minutes, from day_start until day_end.
+    Times are in the current time zone.
+    """
+    start_date: object
+    end_date: object
+    weekdays: list
+    day_start: object
+    day_end: object
+    slot_minutes: int
+    capacity: int
+    gap_minutes: int = 0
+    exclude_dates: list = field(default_factory=list)
+    is_blocked: bool = False
+
+    def windows(self):
+        """(start_time, end_time) of every generated slot, in start order."""
+        length = timedelta(minutes=self.slot_minutes)
+        step = length + timedelta(minutes=self.gap_minutes)
+        weekdays = set(self.weekdays)
+        excluded = set(self.exclude_dates)
+        day = self.start_date
+        while day <= self.end_date:
+            if day.weekday() in weekdays and day not in excluded:
+                start = timezone.make_aware(datetime.combine(day, self.day_start))
+                day_end = timezone.make_aware(datetime.combine(day, self.day_end))
+                while start + length <= day_end:
+                    yield start, start + length
+                    start += step
+            day += timedelta(days=1)
+
+
+def find_conflicts(venue_id, windows, now=None):
+    """
+    Windows that start in the past or overlap a live slot at the venue (of
+    any event). The existing slots come from one venue schedule range
+    lookup; both sides are sorted by start time and swept together,
+    keeping the existing slots that are still open in a heap keyed on
+    their end time.
+
+    Returns {window index: reason}.
+    """
+    conflicts = {}
+    if not windows:
+        return conflicts
+    now = now or timezone.now()
+    existing = venue_schedule.entries_between(venue_id, windows[0][0], windows[-1][1])
+
+    open_slots = []  # (end_time, pk) of existing slots started before the current window ends
+    position = 0
+    for index, (start, end) in enumerate(windows):
+        if start < now:
+            conflicts[index] = "Slot start time cannot be in the past."
+            continue
+        while position < len(existing) and existing[position][0] < end:
+            heapq.heappush(open_slots, (existing[position][1], existing[position][2]))
+            position += 1
+        # Windows are sorted by start, so slots ending before this one never overlap again
+        while open_slots and open_slots[0][0] <= start:
+            heapq.heappop(open_slots)
+        if open_slots:
+            conflicts[index] = f"Overlaps slot {min(pk for _, pk in open_slots)}."
+    return conflicts
+
+
+def generate_slots(event, recurrence, dry_run=False, skip_conflicts=False):
+    """
+    Expand `recurrence` for `event`, check it against the venue's slots and
+    bulk-insert the result in one transaction. The venue row is locked
+    first, so two generations for the same venue cannot interleave.
+
+    Returns (windows, conflicts, created): conflicts maps window indexes to
+    reasons. Nothing is written on a dry run, or when there are conflicts
+    and skip_conflicts is off.
+    """
+    windows = list(recurrence.windows())
+    with transaction.atomic():
+        venue_schedule.lock_venue(event.venue_id)
+        conflicts = find_conflicts(event.venue_id, windows)
+        if dry_run or (conflicts and not skip_conflicts):
+            return windows, conflicts, 0
+
+        slots = [
+            Slot(event=event, start_time=start, end_time=end,
+                 capacity=recurrence.capacity, is_blocked=recurrence.is_blocked)
+            for index, (start, end) in enumerate(windows)
+            if index not in conflicts
+        ]
+        Slot.objects.bulk_create(slots, batch_size=BULK_BATCH_SIZE)
+        # bulk_create skips the post_save signal (and returns no ids on MySQL)
+        if slots:
+            venue_schedule.sync(Slot.objects.filter(
+                event=event, start_time__gte=windows[0][0], start_time__lt=windows[-1][1]
+            ))
+    if slots:
+        bump_versions('slot')
+    return windows, conflicts, len(slots)
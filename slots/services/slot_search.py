@@ -0,0 +1,84 @@
+from datetime import datetime, time, timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from search import index as search_index
+from slots.models.slot_model import Slot
+
+
+def day_start(day):
+    """Aware midnight of `day` in the current time zone."""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class SlotSearch:
+    """
+    Builds the slot_list queryset from its query params in a single query.
+
+    - search text is matched through the full-text index; the event join
+      is only added when there is search text
+    - date filters are half-open start_time/end_time ranges, so they can use
+      the (deleted_at, start_time) index instead of wrapping the column
+      in a DATE() call
+    - select_related('event__venue') is opt-in, for responses that render
+      the event or venue
+    """
+
+    def __init__(self, search='', event=None, date=None, start_date=None, end_date=None, is_blocked=None):
+        self.search = (search or '').strip()
+        self.event = event
+        self.date = parse_date(date) if date else None
+        self.start_date = parse_date(start_date) if start_date else None
+        self.end_date = parse_date(end_date) if end_date else None
+        self.is_blocked = self._parse_bool(is_blocked)
+
+    @classmethod
+    def from_params(cls, params):
+        return cls(
+            search=params.get('search', ''),
+            event=params.get('event'),
+            date=params.get('date'),
+            start_date=params.get('start_date'),
+            end_date=params.get('end_date'),
+            is_blocked=params.get('is_blocked'),
+        )
+
+    @staticmethod
+    def _parse_bool(value):
+        if value is None:
+            return None
+        if value.lower() in ['true', '1']:
+            return True
+        if value.lower() in ['false', '0']:
+            return False
+        return None
+
+    def queryset(self, base=None, with_related=False):
+        slots = (base if base is not None else Slot.objects.all()).filter(deleted_at__isnull=True)
+
+        if search_index.has_terms(self.search):
+            # Name matches on the event or its venue
+            slots = slots.filter(
+                Q(event_id__in=search_index.matching('event', self.search, title_only=True)) |
+                Q(event__venue_id__in=search_index.matching('venue', self.search, title_only=True))
+            )
+        if self.event:
+            slots = slots.filter(event_id=self.event)
+
+        # start_time__date=d  ->  day_start(d) <= start_time < day_start(d + 1)
+        if self.date:
+            slots = slots.filter(start_time__gte=day_start(self.date),
+                                 start_time__lt=day_start(self.date + timedelta(days=1)))
+        if self.start_date:
+            slots = slots.filter(start_time__gte=day_start(self.start_date))
+        if self.end_date:
+            slots = slots.filter(end_time__lt=day_start(self.end_date + timedelta(days=1)))
+
+        if self.is_blocked is not None:
+            slots = slots.filter(is_blocked=self.is_blocked)
+
+        if with_related:
+            slots = slots.select_related('event__venue')
+        return slots
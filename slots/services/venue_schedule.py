@@ -0,0 +1,170 @@
+import heapq
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+
+from slots.models.slot_model import Slot
+from slots.models.venue_schedule_model import VenueScheduleEntry
+from venues.models import Venue
+
+# Slots that hold their venue: not soft-deleted, and neither is their event.
+# Blocked slots still hold it (they are closed to bookings, not to the room).
+LIVE = {'deleted_at__isnull': True, 'event__deleted_at__isnull': True}
+
+# Longest free-window listing, in days
+MAX_RANGE_DAYS = 31
+
+# Longest slot (enforced by Slot.save()). An entry starting earlier than
+# this before a window ends before the window starts, which bounds every
+# lookup to one (venue, start_time) index range.
+MAX_SLOT_LENGTH = timedelta(hours=24)
+
+
+# ---------------- LOOKUPS ----------------
+def lock_venue(venue_id):
+    """
+    Lock the venue row until the transaction ends. Every write that adds to
+    or moves within a venue's schedule takes it before checking for
+    overlaps, so two such writes cannot both pass the check.
+    """
+    Venue.objects.select_for_update().filter(pk=venue_id).values_list('pk').first()
+
+
+def _overlapping(venue_id, start_time, end_time):
+    return VenueScheduleEntry.objects.filter(
+        venue_id=venue_id,
+        start_time__gte=start_time - MAX_SLOT_LENGTH,
+        start_time__lt=end_time,
+        end_time__gt=start_time,
+    )
+
+
+def overlapping_slots(venue_id, start_time, end_time, exclude_slot_id=None):
+    """(slot_id, event_id) of the live slots at the venue overlapping the window, by start."""
+    entries = _overlapping(venue_id, start_time, end_time)
+    if exclude_slot_id is not None:
+        entries = entries.exclude(slot_id=exclude_slot_id)
+    return entries.order_by('start_time').values_list('slot_id', 'slot__event_id')
+
+
+def overlapping_slot(venue_id, start_time, end_time, exclude_slot_id=None):
+    """(slot_id, event_id) of the earliest live slot at the venue overlapping the window, or None."""
+    return overlapping_slots(venue_id, start_time, end_time, exclude_slot_id).first()
+
+
+def overlap_message(overlapping, event_id):
+    if overlapping[1] == event_id:
+        return "Slot overlaps with an existing slot for this event."
+    return "Slot overlaps a slot of another event at this venue."
+
+
+def entries_between(venue_id, start_time, end_time):
+    """[(start_time, end_time, slot_id)] of the entries overlapping the range, by start."""
+    return list(
+        _overlapping(venue_id, start_time, end_time)
+        .order_by('start_time').values_list('start_time', 'end_time', 'slot_id')
+    )
+
+
+def free_windows(venue_id, start_time, end_time):
+    """Yield the (start, end) gaps between the venue's slots within the range."""
+    cursor = start_time
+    for entry_start, entry_end, _ in entries_between(venue_id, start_time, end_time):
+        if entry_start > cursor:
+            yield cursor, entry_start
+        cursor = max(cursor, entry_end)
+    if cursor < end_time:
+        yield cursor, end_time
+
+
+def event_conflicts(event_id, venue_id):
+    """
+    [(slot_id, other_slot_id)] of the event's live slots that overlap a slot
+    of another event at venue_id: what restoring the event, or moving it to
+    that venue, would put into the schedule. One range lookup, then a sweep
+    like recurrence.find_conflicts().
+    """
+    slots = list(
+        Slot.objects.filter(event_id=event_id, deleted_at__isnull=True)
+        .order_by('start_time').values_list('start_time', 'end_time', 'pk')
+    )
+    if not slots:
+        return []
+    own = {pk for _, _, pk in slots}
+    others = [
+        entry for entry in entries_between(venue_id, slots[0][0], max(end for _, end, _ in slots))
+        if entry[2] not in own
+    ]
+
+    found = []
+    open_entries = []  # (end_time, slot_id) of other slots started before the current slot ends
+    position = 0
+    for start, end, pk in slots:
+        while position < len(others) and others[position][0] < end:
+            heapq.heappush(open_entries, (others[position][1], others[position][2]))
+            position += 1
+        while open_entries and open_entries[0][0] <= start:
+            heapq.heappop(open_entries)
+        if open_entries:
+            found.append((pk, min(other for _, other in open_entries)))
+    return found
+
+
+# ---------------- INDEX UPKEEP ----------------
+def index_slot(slot, created=False):
+    """Index one saved slot, or drop it when it is soft-deleted."""
+    if slot.deleted_at is not None or slot.event.deleted_at is not None:
+        VenueScheduleEntry.objects.filter(slot_id=slot.pk).delete()
+        return
+    values = {'venue_id': slot.event.venue_id, 'start_time': slot.start_time, 'end_time': slot.end_time}
+    if created or not VenueScheduleEntry.objects.filter(slot_id=slot.pk).update(**values):
+        VenueScheduleEntry.objects.create(slot_id=slot.pk, **values)
+
+
+def sync(slots):
+    """
+    Re-index the slots of a Slot queryset from the database, for writes
+    that bypass the slot signal (queryset.update(), bulk_create, event
+    soft deletes and venue changes).
+    """
+    live = slots.filter(**LIVE)
+    with transaction.atomic():
+        entries = VenueScheduleEntry.objects.filter(slot__in=slots)
+        # Stale entries: the slot is gone from the schedule, or moved
+        entries.exclude(slot__in=live).delete()
+        entries.filter(slot__in=live).exclude(
+            venue_id=F('slot__event__venue_id'),
+            start_time=F('slot__start_time'),
+            end_time=F('slot__end_time'),
+        ).delete()
+        VenueScheduleEntry.objects.bulk_create(
+            VenueScheduleEntry(slot_id=slot_id, venue_id=venue_id, start_time=start_time, end_time=end_time)
+            for slot_id, venue_id, start_time, end_time in live.filter(schedule_entry__isnull=True)
+            .values_list('pk', 'event__venue_id', 'start_time', 'end_time').iterator()
+        )
+
+
+def rebuild():
+    """Re-index every slot. Returns the number of entries."""
+    sync(Slot.objects.all())
+    return VenueScheduleEntry.objects.count()
+
+
+def overlaps():
+    """
+    [(slot_id, other_slot_id)] of live slots sharing a venue and time, e.g.
+    from before the index existed; write paths never create new ones.
+    """
+    found = []
+    last_end = {}  # venue_id -> (end_time, slot_id) of the latest-ending entry so far
+    for venue_id, start_time, end_time, slot_id in (
+        VenueScheduleEntry.objects.order_by('venue_id', 'start_time')
+        .values_list('venue_id', 'start_time', 'end_time', 'slot_id').iterator()
+    ):
+        previous = last_end.get(venue_id)
+        if previous is not None and previous[0] > start_time:
+            found.append((previous[1], slot_id))
+        if previous is None or end_time > previous[0]:
+            last_end[venue_id] = (end_time, slot_id)
+    return found
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from middleware.response_cache import bump_versions
+from slots.models.slot_model import Slot
+from slots.services import venue_schedule
+
+
+@receiver([post_save, post_delete], sender=Slot)
+def invalidate_cached_responses(sender, **kwargs):
+    # Saves include soft deletes and restores (deleted_at changes)
+    bump_versions('slot')
+
+
+@receiver(post_save, sender=Slot)
+def index_venue_schedule(sender, instance, created, raw=False, **kwargs):
+    # Deleted slots take their entry with them (on_delete=CASCADE)
+    if not raw:
+        venue_schedule.index_slot(instance, created=created)
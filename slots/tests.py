@@ -1,3 +1,262 @@
-from django.test import TestCase
+from datetime import timedelta
+
+from django.contrib import admin
+from django.core.exceptions import ValidationError
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from bookings.models.booking_model import Booking
+from events.models.event_model import Event
+from slots.models.slot_model import Slot
+from slots.models.venue_schedule_model import VenueScheduleEntry
+from slots.serializers.slot_serializer import SlotSerializer
+from slots.services import venue_schedule
+from slots.services.recurrence import SlotRecurrence, generate_slots
+from slots.services.slot_search import SlotSearch, day_start
+from users.models import User
+from venues.models import Venue
+
+
+class SlotCapacityTests(TestCase):
+    def setUp(self):
+        venue = Venue.objects.create(
+            name='Main Hall',
+            address='123 Street',
+            city='Pune',
+            state='MH',
+            pincode='411001',
+            capacity=100
+        )
+        self.event = Event.objects.create(
+            name='Tech Summit',
+            venue=venue,
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date()
+        )
+        start = timezone.now() + timedelta(hours=1)
+        self.slots = [
+            Slot.objects.create(
+                event=self.event,
+                start_time=start + timedelta(hours=i),
+                end_time=start + timedelta(hours=i, minutes=30),
+                capacity=10
+            )
+            for i in range(5)
+        ]
+        user = User.objects.create_user(username='tester', password='pass1234', email='tester@example.com')
+        Booking.objects.create(
+            user=user,
+            event=self.event,
+            slot=self.slots[0],
+            attendees_count=4,
+            booking_status=Booking.Status.APPROVED
+        )
+
+    def test_page_serializes_from_counters_in_one_query(self):
+        with self.assertNumQueries(1):
+            data = SlotSerializer(Slot.objects.order_by('start_time'), many=True).data
+
+        self.assertEqual(data[0]['booked_capacity'], 4)
+        self.assertEqual(data[0]['remaining_capacity'], 6)
+        self.assertEqual(data[1]['remaining_capacity'], 10)
+
+    def test_counters_match_bookings(self):
+        slot = Slot.objects.get(pk=self.slots[0].pk)
+        self.assertEqual(slot.counted_attendees(), {field: getattr(slot, field) for field in Slot.COUNTER_FIELDS})
+
+
+class SlotSearchTests(TestCase):
+    def setUp(self):
+        venue = Venue.objects.create(
+            name='Riverside Arena', address='1 Road', city='Pune', state='MH', pincode='411001', capacity=100
+        )
+        self.event = Event.objects.create(
+            name='Jazz Night', venue=venue, start_date=timezone.now().date(), end_date=timezone.now().date()
+        )
+        day = timezone.now().date() + timedelta(days=3)
+        self.day = day
+        self.late = Slot.objects.create(
+            event=self.event, start_time=day_start(day) + timedelta(hours=23, minutes=30),
+            end_time=day_start(day) + timedelta(hours=23, minutes=59), capacity=10
+        )
+        self.next_day = Slot.objects.create(
+            event=self.event, start_time=day_start(day + timedelta(days=1)),
+            end_time=day_start(day + timedelta(days=1)) + timedelta(minutes=30), capacity=10
+        )
+
+    def test_no_search_text_adds_no_joins(self):
+        sql = str(SlotSearch(search='  ').queryset().query)
+        self.assertNotIn('JOIN', sql)
+        self.assertNotIn('LIKE', sql)
+
+    def test_search_text_matches_event_or_venue(self):
+        self.assertEqual(SlotSearch(search='jazz').queryset().count(), 2)
+        self.assertEqual(SlotSearch(search='riverside').queryset().count(), 2)
+        self.assertEqual(SlotSearch(search='opera').queryset().count(), 0)
+
+    def test_date_filters_are_half_open_ranges(self):
+        queryset = SlotSearch(date=str(self.day)).queryset()
+        self.assertEqual(list(queryset), [self.late])
+        # a plain range on the column, not DATE(start_time)
+        self.assertNotIn('cast_date', str(queryset.query))
+
+        self.assertEqual(list(SlotSearch(end_date=str(self.day)).queryset()), [self.late])
+        self.assertEqual(list(SlotSearch(start_date=str(self.day + timedelta(days=1))).queryset()), [self.next_day])
+
+    def test_select_related_is_opt_in(self):
+        self.assertFalse(SlotSearch().queryset().query.select_related)
+        slots = list(SlotSearch().queryset(with_related=True))
+        with self.assertNumQueries(0):
+            self.assertEqual(slots[0].event.venue.name, 'Riverside Arena')
+
+
+class VenueScheduleTests(TestCase):
+    def setUp(self):
+        self.venue = Venue.objects.create(name='Hall', address='Road', city='Pune', state='MH', pincode='411001',
+                                          capacity=100)
+        self.other_venue = Venue.objects.create(name='Annex', address='Road', city='Pune', state='MH',
+                                                pincode='411001', capacity=100)
+        self.day = timezone.now().date() + timedelta(days=1)
+        self.fair = Event.objects.create(name='Fair', venue=self.venue, start_date=self.day, end_date=self.day)
+        self.expo = Event.objects.create(name='Expo', venue=self.venue, start_date=self.day, end_date=self.day)
+        self.slot = Slot.objects.create(event=self.fair, start_time=self.at(10), end_time=self.at(12), capacity=10)
+
+    def at(self, hour, minute=0):
+        return day_start(self.day) + timedelta(hours=hour, minutes=minute)
+
+    def entry(self):
+        return VenueScheduleEntry.objects.filter(slot=self.slot).values_list('venue_id', 'start_time', 'end_time').first()
+
+    def validate(self, event, start, end, instance=None):
+        serializer = SlotSerializer(instance, data={'event': event.pk, 'start_time': start, 'end_time': end,
+                                                    'capacity': 5}, partial=instance is not None)
+        return serializer.is_valid(), serializer.errors
+
+    def test_index_follows_slot_and_event_writes(self):
+        self.assertEqual(self.entry(), (self.venue.pk, self.at(10), self.at(12)))
+
+        self.slot.end_time = self.at(11)
+        self.slot.save()
+        self.assertEqual(self.entry(), (self.venue.pk, self.at(10), self.at(11)))
+
+        self.fair.venue = self.other_venue
+        self.fair.save()
+        self.assertEqual(self.entry(), (self.other_venue.pk, self.at(10), self.at(11)))
+
+        self.fair.deleted_at = timezone.now()
+        self.fair.save(update_fields=['deleted_at'])
+        self.assertIsNone(self.entry())
+        self.fair.deleted_at = None
+        self.fair.save(update_fields=['deleted_at'])
+        self.assertIsNotNone(self.entry())
+
+        self.slot.deleted_at = timezone.now()
+        self.slot.save(update_fields=['deleted_at'])
+        self.assertIsNone(self.entry())
+
+    def test_overlaps_are_rejected_across_events_at_a_venue(self):
+        valid, errors = self.validate(self.expo, self.at(11), self.at(13))
+        self.assertFalse(valid)
+        self.assertEqual(errors['non_field_errors'], ["Slot overlaps a slot of another event at this venue."])
+        valid, errors = self.validate(self.fair, self.at(9), self.at(10, 30))
+        self.assertEqual(errors['non_field_errors'], ["Slot overlaps with an existing slot for this event."])
+
+        self.assertTrue(self.validate(self.expo, self.at(12), self.at(13))[0])
+        self.assertTrue(self.validate(self.fair, self.at(11), self.at(13), instance=self.slot)[0])
+
+        elsewhere = Event.objects.create(name='Talk', venue=self.other_venue, start_date=self.day, end_date=self.day)
+        self.assertTrue(self.validate(elsewhere, self.at(11), self.at(13))[0])
+
+    def test_lookups(self):
+        Slot.objects.create(event=self.expo, start_time=self.at(14), end_time=self.at(15), capacity=10)
+        with self.assertNumQueries(1):
+            self.assertEqual(venue_schedule.overlapping_slot(self.venue.pk, self.at(11), self.at(11, 30)),
+                             (self.slot.pk, self.fair.pk))
+        self.assertIsNone(venue_schedule.overlapping_slot(self.venue.pk, self.at(12), self.at(14)))
+        self.assertEqual(
+            list(venue_schedule.free_windows(self.venue.pk, self.at(11), self.at(16))),
+            [(self.at(12), self.at(14)), (self.at(15), self.at(16))],
+        )
+
+    def test_lookups_see_a_long_slot_under_later_ones(self):
+        # Slots at 10-14 and 11-12 (legacy data): 13:00 is inside the first,
+        # though the entry starting last before it ends at 12
+        self.slot.end_time = self.at(14)
+        self.slot.save()
+        Slot.objects.bulk_create([Slot(event=self.expo, start_time=self.at(11), end_time=self.at(12), capacity=10)])
+        venue_schedule.sync(Slot.objects.filter(event=self.expo))
+
+        self.assertEqual(venue_schedule.overlapping_slot(self.venue.pk, self.at(13), self.at(13, 30)),
+                         (self.slot.pk, self.fair.pk))
+        self.assertEqual(list(venue_schedule.free_windows(self.venue.pk, self.at(9), self.at(15))),
+                         [(self.at(9), self.at(10)), (self.at(14), self.at(15))])
+        with self.assertRaises(ValidationError):
+            Slot.objects.create(event=self.expo, start_time=self.at(13), end_time=self.at(13, 30), capacity=10)
+
+    def test_event_moves_and_restores_are_checked_against_the_venue(self):
+        talk = Event.objects.create(name='Talk', venue=self.other_venue, start_date=self.day, end_date=self.day)
+        talk_slot = Slot.objects.create(event=talk, start_time=self.at(11), end_time=self.at(13), capacity=10)
+
+        self.fair.venue = self.other_venue
+        with self.assertRaises(ValidationError):
+            self.fair.save()
+        self.fair.refresh_from_db()
+        self.assertEqual(self.entry(), (self.venue.pk, self.at(10), self.at(12)))
+
+        talk.deleted_at = timezone.now()
+        talk.save(update_fields=['deleted_at'])
+        self.fair.venue = self.other_venue
+        self.fair.save()
+        self.assertEqual(self.entry(), (self.other_venue.pk, self.at(10), self.at(12)))
+
+        request = RequestFactory().post('/')
+        request.user = User.objects.create_superuser(username='root', password='pass1234', email='root@example.com')
+        request._messages = type('Messages', (), {'add': lambda *args, **kwargs: None})()
+        admin.site._registry[Event].restore_events(request, Event.objects.filter(pk=talk.pk))
+        talk.refresh_from_db()
+        self.assertIsNotNone(talk.deleted_at)
+        self.assertFalse(VenueScheduleEntry.objects.filter(slot=talk_slot).exists())
+        self.assertEqual(venue_schedule.overlaps(), [])
+
+    def test_admin_reports_overlaps_instead_of_failing(self):
+        root = User.objects.create_superuser(username='root', password='pass1234', email='root@example.com')
+        request = RequestFactory().post('/')
+        request.user = root
+        added = []
+        request._messages = type('Messages', (), {'add': lambda self, level, message, *args: added.append(message)})()
+        # Passed the form check before another save took the time
+        clash = Slot(event=self.expo, start_time=self.at(11), end_time=self.at(13), capacity=5)
+        admin.site._registry[Slot].save_model(request, clash, None, False)
+        self.assertIsNone(clash.pk)
+        self.assertIn("overlaps", added[0])
+
+        # Two new inline rows overlapping each other
+        def split(value):
+            value = timezone.localtime(value)
+            return {'0': value.date().isoformat(), '1': value.time().isoformat()}
+        data = {
+            'name': 'Expo', 'venue': self.venue.pk, 'description': '',
+            'start_date': self.day.isoformat(), 'end_date': self.day.isoformat(),
+            'slot_set-TOTAL_FORMS': '2', 'slot_set-INITIAL_FORMS': '0',
+            'slot_set-MIN_NUM_FORMS': '0', 'slot_set-MAX_NUM_FORMS': '1000',
+        }
+        for index, (start, end) in enumerate([(self.at(13), self.at(14)), (self.at(13, 30), self.at(15))]):
+            data.update({f'slot_set-{index}-start_time_{part}': value for part, value in split(start).items()})
+            data.update({f'slot_set-{index}-end_time_{part}': value for part, value in split(end).items()})
+            data[f'slot_set-{index}-capacity'] = '5'
+        self.client.force_login(root)
+        response = self.client.post(f'/admin/events/event/{self.expo.pk}/change/', data)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Slots on this page overlap each other.")
+        self.assertFalse(Slot.objects.filter(event=self.expo).exists())
+
+    def test_generator_checks_other_events_at_the_venue(self):
+        recurrence = SlotRecurrence(start_date=self.day, end_date=self.day, weekdays=list(range(7)),
+                                    day_start=self.at(9).time(), day_end=self.at(13).time(), slot_minutes=60,
+                                    capacity=10)
+        windows, conflicts, created = generate_slots(self.expo, recurrence, skip_conflicts=True)
+        self.assertEqual(sorted(conflicts), [1, 2])
+        self.assertEqual(created, 2)
+        self.assertEqual(VenueScheduleEntry.objects.filter(slot__event=self.expo).count(), 2)
+        self.assertEqual(venue_schedule.overlaps(), [])
 
-# Create your tests here.
@@ -2,9 +2,11 @@ from django.urls import path
 from slots.views.slot_views import (
     slot_list,
     slot_detail,
+    slot_waitlist,
 )
 
 urlpatterns = [
     path('', slot_list, name='slot_list'),
     path('<int:pk>/', slot_detail, name='slot_detail'),
+    path('<int:pk>/waitlist/', slot_waitlist, name='slot_waitlist'),
 ]
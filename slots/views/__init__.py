@@ -1,4 +1,5 @@
 from .slot_views import (
     slot_list,
     slot_detail,
+    slot_waitlist,
 )
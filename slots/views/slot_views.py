@@ -1,16 +1,26 @@
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.utils.dateparse import parse_date
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework import status
+from bookings.serializers.waitlist_serializer import WaitlistEntrySerializer
+from bookings.services import waitlist
 from slots.models.slot_model import Slot
 from slots.serializers.slot_serializer import SlotSerializer
+from slots.services.slot_search import SlotSearch
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from rest_framework.pagination import PageNumberPagination
-from django.db.models import Q
+from eventslotbooking_project.pagination import get_paginator
+from eventslotbooking_project.versioning import (
+    VersionConflict, etag, expected_versions, if_match_header, version_conflict_response,
+)
+from middleware.response_cache import cached_response
+
+# Keyset columns for list pagination: the trailing id breaks ties, so the
+# composite cursor is unique
+SLOT_LIST_ORDERING = ('start_time', 'id')
 
 # Swagger Example Body
 slot_example = openapi.Schema(
@@ -24,54 +34,26 @@ slot_example = openapi.Schema(
     }
 )
 
+waitlist_example = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        'attendees_count': openapi.Schema(type=openapi.TYPE_INTEGER, example=2),
+    }
+)
+
 
 @swagger_auto_schema(method='get', responses={200: SlotSerializer(many=True)})
 @swagger_auto_schema(method='post', request_body=slot_example)
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticatedOrReadOnly])
+@cached_response('slot', 'event', 'venue', coalesce_reads=True)
 def slot_list(request):
     if request.method == 'GET':
-        search = request.GET.get('search', '')
-        event_id = request.GET.get('event')
-        date_str = request.GET.get('date')
-        start_date = request.GET.get('start_date')
-        end_date = request.GET.get('end_date')
-        is_blocked = request.GET.get('is_blocked')
-
-        slots = Slot.objects.filter(deleted_at__isnull=True).filter(
-            Q(event__name__icontains=search) |
-            Q(event__venue__name__icontains=search)
-        )
-        if event_id:
-            slots = slots.filter(event_id=event_id)
+        # SlotSerializer renders the event as an id, so no select_related
+        slots = SlotSearch.from_params(request.GET).queryset()
 
-        def add_date_filter(queryset, key, value):
-            parsed = parse_date(value)
-            if parsed:
-                if key == 'start':
-                    return queryset.filter(start_time__date__gte=parsed)
-                if key == 'end':
-                    return queryset.filter(end_time__date__lte=parsed)
-                if key == 'exact':
-                    return queryset.filter(start_time__date=parsed)
-            return queryset
-
-        if date_str:
-            slots = add_date_filter(slots, 'exact', date_str)
-        if start_date:
-            slots = add_date_filter(slots, 'start', start_date)
-        if end_date:
-            slots = add_date_filter(slots, 'end', end_date)
-
-        if is_blocked is not None:
-            if is_blocked.lower() in ['true', '1']:
-                slots = slots.filter(is_blocked=True)
-            elif is_blocked.lower() in ['false', '0']:
-                slots = slots.filter(is_blocked=False)
-
-        paginator = PageNumberPagination()
-        paginator.page_size = int(request.GET.get('page_size', 10))
-        result_page = paginator.paginate_queryset(slots.order_by('start_time'), request)
+        paginator = get_paginator(request, ordering=SLOT_LIST_ORDERING)
+        result_page = paginator.paginate_queryset(slots.order_by(*SLOT_LIST_ORDERING), request)
         serializer = SlotSerializer(result_page, many=True)
         return paginator.get_paginated_response({
             "message": "Slots fetched successfully",
@@ -80,7 +62,11 @@ def slot_list(request):
 
     serializer = SlotSerializer(data=request.data)
     if serializer.is_valid():
-        slot = serializer.save()
+        try:
+            slot = serializer.save()
+        except ValidationError as e:
+            # The overlap re-check under the venue lock (Slot.save())
+            return Response({"message": "Slot creation failed", "errors": e.detail}, status=status.HTTP_400_BAD_REQUEST)
         return Response({
             "message": "Slot created successfully",
             "data": SlotSerializer(slot).data
@@ -89,24 +75,60 @@ def slot_list(request):
 
 
 @swagger_auto_schema(method='get', responses={200: SlotSerializer()})
-@swagger_auto_schema(method='patch', request_body=slot_example)
+@swagger_auto_schema(method='patch', request_body=slot_example, manual_parameters=[if_match_header])
 @swagger_auto_schema(method='delete', responses={200: "Slot deleted successfully"})
 @api_view(['GET', 'PATCH', 'DELETE'])
 @permission_classes([IsAuthenticatedOrReadOnly])
+@cached_response('slot', coalesce_reads=True)
 def slot_detail(request, pk):
     slot = get_object_or_404(Slot, pk=pk, deleted_at__isnull=True)
 
     if request.method == 'GET':
         serializer = SlotSerializer(slot)
-        return Response({"message": "Slot fetched successfully", "data": serializer.data}, status=status.HTTP_200_OK)
+        return Response({"message": "Slot fetched successfully", "data": serializer.data}, status=status.HTTP_200_OK,
+                        headers={'ETag': etag(slot)})
 
     if request.method == 'PATCH':
         serializer = SlotSerializer(slot, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
-            return Response({"message": "Slot updated successfully", "data": serializer.data}, status=status.HTTP_200_OK)
+            # If-Match turns the save into UPDATE ... WHERE version = n
+            slot.expect_versions(expected_versions(request))
+            try:
+                serializer.save()
+            except VersionConflict:
+                return version_conflict_response()
+            except ValidationError as e:
+                return Response({"message": "Slot update failed", "errors": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({"message": "Slot updated successfully", "data": serializer.data}, status=status.HTTP_200_OK,
+                            headers={'ETag': etag(slot)})
         return Response({"message": "Slot update failed", "errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
 
     slot.deleted_at = timezone.now()
     slot.save(update_fields=['deleted_at'])
-    return Response({"message": "Slot deleted successfully"}, status=status.HTTP_200_OK)
\ No newline at end of file
+    return Response({"message": "Slot deleted successfully"}, status=status.HTTP_200_OK)
+
+@swagger_auto_schema(method='post', request_body=waitlist_example, responses={201: WaitlistEntrySerializer()})
+@swagger_auto_schema(method='delete', responses={200: "Left the waitlist"})
+@api_view(['POST', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def slot_waitlist(request, pk):
+    """
+    Join (POST) or leave (DELETE) a full slot's waitlist. Waiting users are
+    promoted into approved bookings, first come first served, as seats are
+    released.
+    """
+    slot = get_object_or_404(Slot, pk=pk, deleted_at__isnull=True)
+
+    if request.method == 'DELETE':
+        if not waitlist.leave(request.user, slot):
+            return Response({"message": "You are not on this slot's waitlist."}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"message": "Left the waitlist"}, status=status.HTTP_200_OK)
+
+    serializer = WaitlistEntrySerializer(data=request.data)
+    try:
+        serializer.is_valid(raise_exception=True)
+        serializer.save(user=request.user, slot=slot)
+    except ValidationError as e:
+        return Response({"message": "Could not join the waitlist", "errors": e.detail},
+                        status=status.HTTP_400_BAD_REQUEST)
+    return Response({"message": "Joined the waitlist", "data": serializer.data}, status=status.HTTP_201_CREATED)
@@ -0,0 +1,12 @@
+# users/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from middleware.permission_cache import invalidate_permission_matrix
+from users.models import RolePermission, UserRole
+
+
+@receiver([post_save, post_delete], sender=RolePermission)
+@receiver([post_save, post_delete], sender=UserRole)
+def reset_permission_matrix(sender, **kwargs):
+    invalidate_permission_matrix()
@@ -1,3 +1,83 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from middleware import permission_cache
+from middleware.permission_cache import VERSION_KEY, get_permission_matrix
+from users.models import User, UserRole, RolePermission
+
+
+class RoleAccessMiddlewareCacheTests(TestCase):
+    def setUp(self):
+        role = UserRole.objects.create(name='Viewer')
+        self.permission = RolePermission.objects.create(role=role, module_name='Venues', is_read=True)
+        user = User.objects.create_user(username='viewer', password='pass1234', email='viewer@example.com', role=role)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=str(RefreshToken.for_user(user).access_token))
+
+    def test_steady_state_requests_run_no_permission_queries(self):
+        self.client.get('/api/venues/')  # warm the permission matrix
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/venues/')
+
+        self.assertEqual(response.status_code, 200)
+        statements = [query['sql'] for query in queries.captured_queries]
+        self.assertFalse([sql for sql in statements if 'role_permission' in sql or 'user_role' in sql])
+        # the user is loaded once and shared with DRF
+        self.assertEqual(len([sql for sql in statements if 'FROM "user"' in sql]), 1)
+
+    def test_permission_changes_are_picked_up(self):
+        self.assertEqual(self.client.get('/api/venues/').status_code, 200)
+
+        self.permission.is_read = False
+        self.permission.save()
+        self.assertEqual(self.client.get('/api/venues/').status_code, 403)
+
+    def test_matrix_loaded_before_commit_is_dropped_at_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.permission.is_read = False
+            self.permission.save()
+            # Another worker reloading now would read the old rows
+            get_permission_matrix()
+            stamp = cache.get(VERSION_KEY)
+        self.assertNotEqual(cache.get(VERSION_KEY), stamp)
+
+
+    def test_revocation_by_another_process_reaches_this_one(self):
+        self.assertEqual(self.client.get('/api/venues/').status_code, 200)
+
+        # Another worker with its own local cache: the row changes, this
+        # worker's version stamp does not
+        RolePermission.objects.filter(pk=self.permission.pk).update(is_read=False)
+        later = permission_cache.time.monotonic() + permission_cache._ttl()
+        with mock.patch.object(permission_cache.time, 'monotonic', return_value=later):
+            self.assertEqual(self.client.get('/api/venues/').status_code, 403)
+
+
+class AdminPermissionResolverTests(TestCase):
+    def setUp(self):
+        role = UserRole.objects.create(name='Manager')
+        for module in ['Bookings', 'Slots', 'Events', 'Venues']:
+            RolePermission.objects.create(role=role, module_name=module, is_read=True, is_update=True)
+        self.user = User.objects.create_user(
+            username='manager', password='pass1234', email='manager@example.com', role=role, is_staff=True
+        )
+        self.client.force_login(self.user)
+
+    def _permission_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [query['sql'] for query in queries.captured_queries if 'role_permission' in query['sql']]
 
-# Create your tests here.
+    def test_admin_pages_share_the_permission_matrix(self):
+        # At most the one query that loads the whole matrix, then none
+        self.assertLessEqual(len(self._permission_queries('/admin/')), 1)
+        self.assertEqual(self._permission_queries('/admin/'), [])
+        self.assertEqual(self._permission_queries('/admin/venues/venue/'), [])
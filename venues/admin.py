@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils import timezone
 from venues.models import Venue
-from middleware.admin_administration_helpers import check_role_permission
+from middleware.admin_administration_helpers import check_request_permission
 
 
 @admin.register(Venue)
@@ -19,28 +19,28 @@ class VenueAdmin(admin.ModelAdmin):
     # ------------------------------------------------
     def has_module_permission(self, request):
         # Only show 'Venues' if user has READ permission
-        return check_role_permission(request.user, 'Venues', 'read')
+        return check_request_permission(request, 'Venues', 'read')
 
     def has_view_permission(self, request, obj=None):
-        return check_role_permission(request.user, 'Venues', 'read')
+        return check_request_permission(request, 'Venues', 'read')
 
     def has_add_permission(self, request):
-        return check_role_permission(request.user, 'Venues', 'create')
+        return check_request_permission(request, 'Venues', 'create')
 
     def has_change_permission(self, request, obj=None):
-        return check_role_permission(request.user, 'Venues', 'update')
+        return check_request_permission(request, 'Venues', 'update')
 
     def has_delete_permission(self, request, obj=None):
-        return check_role_permission(request.user, 'Venues', 'delete')
+        return check_request_permission(request, 'Venues', 'delete')
 
     # ------------------------------------------------
     # ✅ BULK ACTIONS (Visible Only If Allowed)
     # ------------------------------------------------
     def get_actions(self, request):
         actions = super().get_actions(request)
-        if not check_role_permission(request.user, 'Venues', 'delete'):
+        if not check_request_permission(request, 'Venues', 'delete'):
             actions.pop('soft_delete_venues', None)
-        if not check_role_permission(request.user, 'Venues', 'update'):
+        if not check_request_permission(request, 'Venues', 'update'):
             actions.pop('restore_venues', None)
         return actions
 
@@ -48,11 +48,11 @@ class VenueAdmin(admin.ModelAdmin):
     # ✅ SOFT DELETE / RESTORE
     # ------------------------------------------------
     def soft_delete_venues(self, request, queryset):
-        updated = queryset.update(deleted_at=timezone.now())
+        updated = queryset.update_and_sync(deleted_at=timezone.now())
         self.message_user(request, f"{updated} venue(s) soft deleted.")
     soft_delete_venues.short_description = "Soft delete selected venues"
 
     def restore_venues(self, request, queryset):
-        updated = queryset.update(deleted_at=None)
+        updated = queryset.update_and_sync(deleted_at=None)
         self.message_user(request, f"{updated} venue(s) restored.")
     restore_venues.short_description = "Restore selected venues"
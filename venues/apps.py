@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class VenuesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "venues"
+
+    def ready(self):
+        import venues.signals  # noqa: F401  Response cache invalidation
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venues', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['deleted_at', 'name'], name='venue_deleted_name_idx'),
+        ),
+    ]
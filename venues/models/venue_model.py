@@ -1,6 +1,7 @@
 from django.db import models
+from eventslotbooking_project.versioning import VersionedModel
 
-class Venue(models.Model):
+class Venue(VersionedModel):
     name = models.CharField(max_length=255)
     address = models.TextField()
     city = models.CharField(max_length=100)
@@ -11,8 +12,20 @@ class Venue(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True)  # soft delete
 
+    SYNC_BY_ID = True
+
     def __str__(self):
         return f"{self.name} - {self.city}"
 
+    @classmethod
+    def sync_updated(cls, ids):
+        from search import index as search_index  # local import to avoid circular dependency
+        search_index.sync('venue', ids)
+        super().sync_updated(ids)
+
     class Meta:
         db_table = 'venue'
+        indexes = [
+            # venue_list ordered by name
+            models.Index(fields=['deleted_at', 'name'], name='venue_deleted_name_idx'),
+        ]
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from middleware.response_cache import bump_versions
+from venues.models import Venue
+
+
+@receiver([post_save, post_delete], sender=Venue)
+def invalidate_cached_responses(sender, **kwargs):
+    # Saves include soft deletes and restores (deleted_at changes)
+    bump_versions('venue')
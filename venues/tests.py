@@ -1,3 +1,113 @@
+from datetime import timedelta
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from events.models.event_model import Event
+from slots.models.slot_model import Slot
+from slots.services.slot_search import day_start
+from users.models import User, UserRole, RolePermission
+from venues.models import Venue
+
+
+class VenueListPaginationTests(TestCase):
+    def setUp(self):
+        role = UserRole.objects.create(name='Viewer')
+        RolePermission.objects.create(role=role, module_name='Venues', is_read=True)
+        user = User.objects.create_user(username='viewer', password='pass1234', email='viewer@example.com', role=role)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=str(RefreshToken.for_user(user).access_token))
+        Venue.objects.bulk_create([
+            Venue(
+                name=f'Hall {i:03d}',
+                address='123 Street',
+                city='Pune',
+                state='MH',
+                pincode='411001',
+                capacity=100
+            )
+            for i in range(25)
+        ])
+
+    def test_cursor_pagination_walks_every_row_once(self):
+        names = []
+        url = '/api/venues/?cursor=&page_size=10'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            names.extend(venue['name'] for venue in response.data['results']['data'])
+            url = response.data['next']
+
+        self.assertEqual(names, [f'Hall {i:03d}' for i in range(25)])
+
+    def test_cursor_seeks_past_ties_without_offset(self):
+        # Every name the same: only the trailing id orders the rows
+        Venue.objects.all().delete()
+        Venue.objects.bulk_create([
+            Venue(name='Hall', address='1 Road', city='Pune', state='MH', pincode='411001', capacity=10)
+            for _ in range(25)
+        ])
+        ids = list(Venue.objects.order_by('pk').values_list('pk', flat=True))
+
+        seen, pages = [], []
+        url = '/api/venues/?cursor=&page_size=10'
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertFalse(any('OFFSET' in query['sql'] for query in queries))
+            pages.append(response.data)
+            seen.extend(venue['id'] for venue in response.data['results']['data'])
+            url = response.data['next']
+        self.assertEqual(seen, ids)
+
+        response = self.client.get(pages[-1]['previous'])
+        self.assertEqual([venue['id'] for venue in response.data['results']['data']], ids[10:20])
+
+    def test_page_size_is_capped(self):
+        Venue.objects.bulk_create([
+            Venue(name=f'Annex {i:03d}', address='1 Road', city='Pune', state='MH', pincode='411001', capacity=10)
+            for i in range(100)
+        ])
+        response = self.client.get('/api/venues/?page_size=100000')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']['data']), 100)
+
+
+class VenueFreeWindowsTests(TestCase):
+    def setUp(self):
+        role = UserRole.objects.create(name='Viewer')
+        RolePermission.objects.create(role=role, module_name='Venues', is_read=True)
+        user = User.objects.create_user(username='viewer', password='pass1234', email='viewer@example.com', role=role)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=str(RefreshToken.for_user(user).access_token))
+        self.venue = Venue.objects.create(name='Hall', address='Road', city='Pune', state='MH', pincode='411001',
+                                          capacity=100)
+        self.day = timezone.localdate() + timedelta(days=1)
+        for name, hour in (('Fair', 9), ('Expo', 13)):
+            event = Event.objects.create(name=name, venue=self.venue, start_date=self.day, end_date=self.day)
+            Slot.objects.create(event=event, start_time=day_start(self.day) + timedelta(hours=hour),
+                                end_time=day_start(self.day) + timedelta(hours=hour + 2), capacity=10)
+
+    def test_gaps_between_all_events(self):
+        response = self.client.get(f'/api/venues/{self.venue.pk}/free-windows/', {'from': str(self.day)})
+        self.assertEqual(response.status_code, 200)
+        midnight = day_start(self.day)
+        self.assertEqual(
+            [(window['start_time'], window['end_time']) for window in response.data['data']['windows']],
+            [(midnight, midnight + timedelta(hours=9)),
+             (midnight + timedelta(hours=11), midnight + timedelta(hours=13)),
+             (midnight + timedelta(hours=15), midnight + timedelta(days=1))],
+        )
+
+    def test_invalid_range(self):
+        path = f'/api/venues/{self.venue.pk}/free-windows/'
+        response = self.client.get(path, {'from': str(self.day), 'to': str(self.day + timedelta(days=40))})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('to', response.data['errors'])
+        self.assertEqual(self.client.get(path, {'from': 'tomorrow'}).status_code, 400)
 
-# Create your tests here.
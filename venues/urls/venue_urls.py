@@ -2,9 +2,11 @@ from django.urls import path
 from venues.views.venue_views import (
     venue_list,
     venue_detail,
+    venue_free_windows,
 )
 
 urlpatterns = [
     path('', venue_list, name='venue_list'),
     path('<int:pk>/', venue_detail, name='venue_detail'),
+    path('<int:pk>/free-windows/', venue_free_windows, name='venue_free_windows'),
 ]
@@ -3,4 +3,5 @@
 from .venue_views import (
     venue_list,
     venue_detail,
+    venue_free_windows,
 )
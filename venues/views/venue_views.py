@@ -1,4 +1,6 @@
 # venues/views/venue_views.py
+from datetime import timedelta
+
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
@@ -9,8 +11,18 @@ from venues.models import Venue
 from venues.serializers.venue_serializer import VenueSerializer
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from rest_framework.pagination import PageNumberPagination
-from django.db.models import Q
+from eventslotbooking_project.pagination import get_paginator, query_date
+from eventslotbooking_project.versioning import (
+    VersionConflict, etag, expected_versions, if_match_header, version_conflict_response,
+)
+from middleware.response_cache import cached_response
+from search import index as search_index
+from slots.services import venue_schedule
+from slots.services.slot_search import day_start
+
+# Keyset columns for list pagination: the trailing id breaks ties, so the
+# composite cursor is unique
+VENUE_LIST_ORDERING = ('name', 'id')
 
 # Swagger Example Body
 venue_example = openapi.Schema(
@@ -30,23 +42,22 @@ venue_example = openapi.Schema(
 @swagger_auto_schema(method='post', request_body=venue_example)
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticatedOrReadOnly])
+@cached_response('venue')
 def venue_list(request):
     if request.method == 'GET':
         search_query = request.GET.get('search', '')
         city = request.GET.get('city')
-        venues = Venue.objects.filter(deleted_at__isnull=True).filter(
-            Q(name__icontains=search_query) |
-            Q(address__icontains=search_query) |
-            Q(city__icontains=search_query) |
-            Q(state__icontains=search_query) |
-            Q(pincode__icontains=search_query)
-        )
+        venues = Venue.objects.filter(deleted_at__isnull=True)
+        ordering = VENUE_LIST_ORDERING
+        if search_index.has_terms(search_query):
+            # Full-text matches on name/address/city/state/pincode, best match first
+            venues = search_index.ranked(venues, 'venue', search_query)
+            ordering = search_index.SEARCH_ORDERING
         if city:
             venues = venues.filter(city__iexact=city)
 
-        paginator = PageNumberPagination()
-        paginator.page_size = int(request.GET.get('page_size', 10))
-        result_page = paginator.paginate_queryset(venues.order_by('name'), request)
+        paginator = get_paginator(request, ordering=ordering)
+        result_page = paginator.paginate_queryset(venues.order_by(*ordering), request)
         serializer = VenueSerializer(result_page, many=True)
         return paginator.get_paginated_response({
             "message": "Venues fetched successfully",
@@ -64,24 +75,80 @@ def venue_list(request):
 
 
 @swagger_auto_schema(method='get', responses={200: VenueSerializer()})
-@swagger_auto_schema(method='patch', request_body=venue_example)
+@swagger_auto_schema(method='patch', request_body=venue_example, manual_parameters=[if_match_header])
 @swagger_auto_schema(method='delete', responses={200: "Venue deleted successfully"})
 @api_view(['GET', 'PATCH', 'DELETE'])
 @permission_classes([IsAuthenticatedOrReadOnly])
+@cached_response('venue')
 def venue_detail(request, pk):
     venue = get_object_or_404(Venue, pk=pk, deleted_at__isnull=True)
 
     if request.method == 'GET':
         serializer = VenueSerializer(venue)
-        return Response({"message": "Venue fetched successfully", "data": serializer.data}, status=status.HTTP_200_OK)
+        return Response({"message": "Venue fetched successfully", "data": serializer.data}, status=status.HTTP_200_OK,
+                        headers={'ETag': etag(venue)})
 
     if request.method == 'PATCH':
         serializer = VenueSerializer(venue, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
-            return Response({"message": "Venue updated successfully", "data": serializer.data}, status=status.HTTP_200_OK)
+            # If-Match turns the save into UPDATE ... WHERE version = n
+            venue.expect_versions(expected_versions(request))
+            try:
+                serializer.save()
+            except VersionConflict:
+                return version_conflict_response()
+            return Response({"message": "Venue updated successfully", "data": serializer.data}, status=status.HTTP_200_OK,
+                            headers={'ETag': etag(venue)})
         return Response({"message": "Venue update failed", "errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
 
     venue.deleted_at = timezone.now()
     venue.save(update_fields=['deleted_at'])
     return Response({"message": "Venue deleted successfully"}, status=status.HTTP_200_OK)
+
+
+@swagger_auto_schema(
+    method='get',
+    manual_parameters=[
+        openapi.Parameter('from', openapi.IN_QUERY, type=openapi.TYPE_STRING, format='date',
+                          description="First day (default: today)"),
+        openapi.Parameter('to', openapi.IN_QUERY, type=openapi.TYPE_STRING, format='date',
+                          description="Last day, inclusive (default: 'from')"),
+    ],
+    responses={200: "Free windows between the venue's slots"}
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def venue_free_windows(request, pk):
+    """
+    The gaps between the slots of all events at a venue, from the venue
+    schedule index: one index probe before the range and one range read.
+    """
+    venue = get_object_or_404(Venue, pk=pk, deleted_at__isnull=True)
+
+    start_date = query_date(request, 'from', timezone.localdate())
+    end_date = query_date(request, 'to', start_date)
+
+    errors = {}
+    if start_date is None:
+        errors['from'] = ["Enter a date as YYYY-MM-DD."]
+    if end_date is None:
+        errors['to'] = ["Enter a date as YYYY-MM-DD."]
+    if start_date and end_date:
+        if start_date > end_date:
+            errors['to'] = ["Must not be before 'from'."]
+        elif (end_date - start_date).days >= venue_schedule.MAX_RANGE_DAYS:
+            errors['to'] = [f"The range can span at most {venue_schedule.MAX_RANGE_DAYS} days."]
+    if errors:
+        return Response({"message": "Free windows request failed", "errors": errors},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    windows = venue_schedule.free_windows(venue.pk, day_start(start_date), day_start(end_date + timedelta(days=1)))
+    return Response({
+        "message": "Free windows fetched successfully",
+        "data": {
+            "venue": venue.pk,
+            "from": start_date,
+            "to": end_date,
+            "windows": [{"start_time": start, "end_time": end} for start, end in windows],
+        }
+    }, status=status.HTTP_200_OK)